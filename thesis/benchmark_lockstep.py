@@ -0,0 +1,103 @@
+"""Compare the time taken by CALICOBA runs executed one after the other and in lockstep.
+
+Both modes run the same campaign, i.e. the same Sobol starting points of the same models, with objectives
+evaluated as in experiments.py. A latency may be added to each call to a model to emulate a simulator.
+"""
+import argparse
+import logging
+import time
+import typing as typ
+
+import experiments
+import models
+import test_utils
+
+
+class SimulatedModel(models.Model):
+    def __init__(self, model: models.Model, latency: float):
+        """Wrap a model so that each call to it, for one point or several at once, takes some additional time.
+
+        :param model: The wrapped model.
+        :param latency: The time added to each call, in seconds.
+        """
+        super().__init__(
+            model.id,
+            {name: model.get_parameter_domain(name) for name in model.parameters_names},
+            {name: model.get_output_domain(name) for name in model.outputs_names},
+        )
+        self._model = model
+        self._latency = latency
+
+    def _evaluate(self, **kwargs):
+        time.sleep(self._latency)
+        return self._model.evaluate(**kwargs)
+
+    def _evaluate_many(self, **kwargs):
+        time.sleep(self._latency)
+        return self._model.evaluate_many(**kwargs)
+
+
+def benchmark(model: models.Model, runs_number: int, max_steps: int, repeats: int) \
+        -> typ.Tuple[float, float, int, int]:
+    """Run a campaign on a model sequentially then in lockstep.
+
+    :return: The best time of each mode in seconds, then the number of solutions found by each mode.
+    """
+    logger = logging.getLogger(__name__)
+    solutions = test_utils.MODEL_SOLUTIONS[model.id]
+    param_names = list(model.parameters_names)
+    params_iterator = (tuple(
+        test_utils.sobol_to_param(v, *model.get_parameter_domain(param_names[i])) for i, v in enumerate(point))
+        for point in test_utils.SobolSequence(len(param_names), runs_number)
+    )
+    p_inits = [dict(zip(param_names, p)) for p in dict.fromkeys(params_iterator)]
+
+    sequential_time = lockstep_time = float('inf')
+    sequential_solutions = lockstep_solutions = 0
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        results = [experiments.evaluate_model_calicoba(model, dict(p_init), solutions, max_steps=max_steps,
+                                                       logger=logger, logging_level=logging.WARNING)
+                   for p_init in p_inits]
+        sequential_time = min(sequential_time, time.perf_counter() - start_time)
+        sequential_solutions = sum(result.solution_found for result in results)
+
+        start_time = time.perf_counter()
+        results = experiments.evaluate_model_calicoba_lockstep(model, p_inits, solutions, max_steps=max_steps,
+                                                               logging_level=logging.WARNING)
+        lockstep_time = min(lockstep_time, time.perf_counter() - start_time)
+        lockstep_solutions = sum(result.solution_found for result in results)
+
+    return sequential_time, lockstep_time, sequential_solutions, lockstep_solutions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare sequential and lockstep CALICOBA runs.')
+    arg_parser.add_argument('-m', '--model', metavar='ID', dest='models_ids', nargs='+',
+                            default=['gramacy_and_lee_2012', 'ackley_function', 'rastrigin_function', 'multi_obj'],
+                            help='IDs of the models to run')
+    arg_parser.add_argument('-r', '--runs', metavar='NB', dest='runs_number', type=int, default=100,
+                            help='number of runs of each model')
+    arg_parser.add_argument('-s', '--max-steps', metavar='NB', dest='max_steps', type=int,
+                            default=experiments.DEFAULT_MAX_STEPS_NB, help='maximum number of cycles of each run')
+    arg_parser.add_argument('-l', '--latency', metavar='SECONDS', dest='latency', type=float, default=0,
+                            help='time added to each call to a model')
+    arg_parser.add_argument('--repeats', metavar='NB', dest='repeats', type=int, default=3,
+                            help='number of times each campaign is run, the best time is kept')
+
+    args = arg_parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    model_factory = models.get_model_factory(models.FACTORY_SIMPLE)
+    print('model,sequential time,lockstep time,speedup,sequential solutions,lockstep solutions')
+    for model_id in args.models_ids:
+        model = model_factory.generate_model(model_id)
+        if args.latency:
+            model = SimulatedModel(model, args.latency)
+        sequential_time, lockstep_time, sequential_solutions, lockstep_solutions = benchmark(
+            model, args.runs_number, args.max_steps, args.repeats)
+        print(f'{model_id},{sequential_time:.3f},{lockstep_time:.3f},{sequential_time / lockstep_time:.2f},'
+              f'{sequential_solutions},{lockstep_solutions}')
+
+
+if __name__ == '__main__':
+    main()
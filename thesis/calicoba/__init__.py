@@ -1,10 +1,17 @@
+from __future__ import annotations
+
+import asyncio
+import collections
 import dataclasses
+import itertools
 import logging
 import pathlib
 import random
 import typing as typ
 
-from . import agents, data_sources
+import numpy as np
+
+from . import _checkpoint, _revisits, agents, data_sources, dumping, profiling, tracing
 
 _T = typ.TypeVar('_T', bound=agents.Agent)
 
@@ -14,21 +21,102 @@ class CalicobaConfig:
     dump_directory: pathlib.Path = None
     seed: typ.Optional[int] = None
     logging_level: int = logging.INFO
+    # Number of live point agents above which finished chains get compacted, None to keep all points.
+    # All points are recorded in a PointStore of each parameter only if set
+    points_budget: typ.Optional[int] = None
+    # Number of consecutive local minima found at the same value after which a parameter gets frozen,
+    # None to never freeze parameters
+    freeze_after_minima: typ.Optional[int] = None
+    # Shift of any objective criticality that wakes a frozen parameter up
+    wake_threshold: float = 0.1
+    # Whether objectives always give the same values for the same parameters, known points are then not re-evaluated
+    deterministic: bool = False
+    # Maximum difference between two values of a parameter for them to be considered the same point
+    revisit_tolerance: float = 0
+    # Name of the surrogate points use to jump to the predicted minimum during local search (see agents.get_surrogate),
+    # None to only use the linear extrapolation and middle point rules
+    surrogate: typ.Optional[str] = None
+    # Name of the controller of the jump lengths of points (see agents.get_step_controller)
+    step_controller: str = agents.STEP_CONTROLLER_FIXED
+    # Factor applied by the adaptive step controller to the maximum number of steps of a chain
+    # after enough consecutive decreases of the criticality (see agents.AdaptiveStepController)
+    step_growth: float = 1.5
+    # Factor applied by the adaptive step controller to the maximum number of steps of a chain
+    # after an increase of the criticality
+    step_shrink: float = 0.5
+    # Number of consecutive decreases of the criticality after which the adaptive step controller grows the limit
+    step_patience: int = 3
+    # Bounds of the maximum number of steps of a chain with the adaptive step controller
+    min_steps_number: float = 2
+    max_steps_number: float = 8
+    # Name of the function that reduces the criticalities of all objectives to that of a point
+    # (see agents.get_aggregator)
+    aggregator: str = agents.AGGREGATOR_MAX
+    # Weight of each objective for the weighted aggregators, missing objectives weighing 1,
+    # None for all objectives to weigh the same
+    objective_weights: typ.Optional[typ.Dict[str, float]] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class Candidate:
+    """A parameter vector handed out by Calicoba.ask() that waits for its evaluation."""
+    id: int
+    parameters: typ.Dict[str, float]
+    # Index of the point each parameter was at when this candidate was suggested (see PointAgent.index).
+    # A parameter continues the chain of this point if it is still the last one, it starts a new chain otherwise,
+    # or if it is missing as for exploration candidates
+    sources: typ.Dict[str, int] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass(frozen=True)
+class OptimizationResult:
+    solution_found: bool
+    evaluations_number: int
+    best_parameters: typ.Dict[str, float]
+    best_criticality: float
 
 
 class Calicoba:
-    def __init__(self, config: CalicobaConfig):
+    MAX_QUEUED_CANDIDATES = 1000
+    MAX_RESOLVED_REVISITS = 1000
+
+    def __init__(self, config: CalicobaConfig, *, dump_writer: dumping.DumpWriter = None):
+        """Create a system.
+
+        :param config: The system’s config.
+        :param dump_writer: The writer of the dumped files if the config sets a dump directory,
+            to share one between several systems. If None, the system creates its own and closes it in close().
+            The dump directory is created by the writer along with the first dumped file.
+        """
         self._config = config
         self._logger = logging.getLogger('CALICOBA')
         self._logger.setLevel(self._config.logging_level)
         self._rng = random.Random(self._config.seed)
-        if self._config.dump_directory and not self._config.dump_directory.exists():
-            self._config.dump_directory.mkdir(parents=True)
+        self._dump_writer: typ.Optional[dumping.DumpWriter] = None
+        self._owns_dump_writer = False
+        if self._config.dump_directory:
+            self._owns_dump_writer = dump_writer is None
+            self._dump_writer = dump_writer or dumping.DumpWriter()
         self._cycle = 0
-        self._agents_registry: typ.List[agents.Agent] = []
+        self._agents_registry = agents.AgentsRegistry()
         self._parameter_agents: typ.List[agents.ParameterAgent] = []
         self._objective_agents: typ.List[agents.ObjectiveAgent] = []
+        self._objectives_names: typ.List[str] = []
+        # Criticality of each objective, in the order of objective agents, that they are bound to
+        self._objectives_criticalities = np.zeros(0)
+        self._objectives_normalizer: typ.Optional[agents.BoundNormalizer] = None
+        self._aggregator: typ.Optional[agents.Aggregator] = None
         self._create_new_chain_for_params = set()
+        # Last point of the chain each parameter continues during the next cycle, if not the most recent chain
+        self._chain_ends: typ.Dict[str, agents.PointAgent] = {}
+        self._candidates: typ.Deque[Candidate] = collections.deque(maxlen=self.MAX_QUEUED_CANDIDATES)
+        self._pending_candidates: typ.Dict[int, Candidate] = {}
+        self._next_candidate_id = 0
+        self._told_points_number = 0
+        self._solution: typ.Optional[typ.Dict[str, float]] = None
+        self._revisits = _revisits.RevisitCache(config.revisit_tolerance) if config.deterministic else None
+        self._profiler: typ.Optional[profiling.Profiler] = None
+        self._tracer: typ.Optional[tracing.Tracer] = None
 
     @property
     def config(self) -> CalicobaConfig:
@@ -42,43 +130,164 @@ class Calicoba:
     def cycle(self) -> int:
         return self._cycle
 
+    @property
+    def criticality(self) -> float:
+        """Aggregated criticality of the last perceived point."""
+        return self._get_criticality()
+
+    @property
+    def objectives_names(self) -> typ.Sequence[str]:
+        """Names of objectives in the order expected for objective values arrays. Available after setup()."""
+        return self._objectives_names
+
+    @property
+    def dump_writer(self) -> typ.Optional[dumping.DumpWriter]:
+        """The writer of the dumped files, None if the config sets no dump directory."""
+        return self._dump_writer
+
+    @property
+    def profiler(self) -> typ.Optional[profiling.Profiler]:
+        """The profiler that records the time spent in each phase of the next cycles, None if detached.
+        May be set to attach or detach a profiler."""
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler: typ.Optional[profiling.Profiler]):
+        self._profiler = profiler
+
+    @property
+    def tracer(self) -> typ.Optional[tracing.Tracer]:
+        """The tracer that receives the decisions of the next cycles, None if detached.
+        May be set to attach or detach a tracer."""
+        return self._tracer
+
+    @tracer.setter
+    def tracer(self, tracer: typ.Optional[tracing.Tracer]):
+        self._tracer = tracer
+
+    @property
+    def solution(self) -> typ.Optional[typ.Dict[str, float]]:
+        """The parameter values of the first global minimum found through tell() since the last call
+        to optimize_async(), None if none was found."""
+        return self._solution
+
+    @property
+    def pending_candidates(self) -> typ.Sequence[Candidate]:
+        """The candidates that have been handed out by ask() but not told back yet."""
+        return list(self._pending_candidates.values())
+
     def get_agents_for_type(self, type_: typ.Type[_T]) -> typ.Sequence[_T]:
-        return list(filter(lambda a: isinstance(a, type_), self._agents_registry))
+        return self._agents_registry.get_for_type(type_)
 
     def get_agent(self, predicate: typ.Callable[[agents.Agent], bool]) -> typ.Optional[agents.Agent]:
         return next(filter(predicate, self._agents_registry), None)
 
     def add_parameter(self, name: str, inf: float, sup: float):
         self._logger.info(f'Creating parameter "{name}".')
-        self.add_agent(agents.ParameterAgent(name, inf, sup, logger=self._logger))
+        self.add_agent(self._create_parameter(name, inf, sup))
+
+    def _create_parameter(self, name: str, inf: float, sup: float) -> agents.ParameterAgent:
+        surrogate = agents.get_surrogate(self._config.surrogate) if self._config.surrogate else None
+        step_controller = agents.get_step_controller(
+            self._config.step_controller, inf, sup, growth=self._config.step_growth, shrink=self._config.step_shrink,
+            patience=self._config.step_patience, min_steps_number=self._config.min_steps_number,
+            max_steps_number=self._config.max_steps_number)
+        return agents.ParameterAgent(name, inf, sup, surrogate=surrogate, step_controller=step_controller,
+                                     record_points=self._config.points_budget is not None, logger=self._logger)
 
     def add_objective(self, name: str, inf: float, sup: float):
         self._logger.info(f'Creating objective "{name}".')
         self.add_agent(agents.ObjectiveAgent(name, inf, sup))
 
     def add_agent(self, agent: agents.Agent):
-        self._agents_registry.append(agent)
+        self._agents_registry.add(agent)
 
     def remove_agent(self, agent: agents.Agent):
         self._agents_registry.remove(agent)
 
     def setup(self):
+        self._setup(resume=False)
+
+    def _setup(self, resume: bool):
+        """Set up the system once all its agents have been added.
+
+        :param resume: Whether the agents were restored from a checkpoint, in which case dumped files
+            are appended to instead of being overwritten.
+        """
         self._logger.info('Setting up CALICOBA…')
         self._parameter_agents = self.get_agents_for_type(agents.ParameterAgent)
         self._objective_agents = self.get_agents_for_type(agents.ObjectiveAgent)
+        self._objectives_names = [objective.name for objective in self._objective_agents]
+        self._objectives_criticalities = np.zeros(len(self._objective_agents))
+        for i, objective in enumerate(self._objective_agents):
+            objective.bind(self._objectives_criticalities[i:i + 1])
+        self._objectives_normalizer = agents.BoundNormalizer(
+            np.array([objective.inf for objective in self._objective_agents], dtype=np.float64),
+            np.array([objective.sup for objective in self._objective_agents], dtype=np.float64),
+        )
+        weights = self._config.objective_weights
+        if weights is not None:
+            weights = [weights.get(name, 1) for name in self._objectives_names]
+        self._aggregator = agents.get_aggregator(self._config.aggregator, weights)
+        if self._dump_writer:
+            for objective in self._objective_agents:
+                objective.open_dump(self._dump_writer, self._config.dump_directory, append=resume)
         self._cycle = 0
         self._logger.info('CALICOBA setup finished.')
 
-    def suggest_new_point(self, parameter_values: typ.Dict[str, float], objective_values: typ.Dict[str, float]) \
+    def lookup(self, parameter_values: typ.Dict[str, float]) -> typ.Optional[typ.Dict[str, float]]:
+        """Return the objective values of an already perceived point, within the config’s revisit tolerance.
+
+        :param parameter_values: The values of all parameters.
+        :return: The objective values the first time the point was perceived,
+            None if it was never perceived or objectives are not deterministic.
+        """
+        return self._revisits.get(parameter_values) if self._revisits is not None else None
+
+    def suggest_new_point(self, parameter_values: typ.Dict[str, float],
+                          objective_values: typ.Union[typ.Dict[str, float], np.ndarray], *,
+                          objective_criticalities: np.ndarray = None, criticality: float = None) \
             -> typ.Dict[str, typ.List[agents.Suggestion]]:
-        self._logger.debug(f'Cycle {self._cycle}')
+        """Perceive the given point and let agents suggest where to go next.
 
-        # Update criticalities
-        crits = {}
-        for objective in self._objective_agents:
-            objective.perceive(self._cycle, objective_values[objective.name], dump_dir=self.config.dump_directory)
-            crits[objective.name] = objective.criticality
-            self._logger.debug(f'Obj {objective.name}: {objective.criticality}')
+        :param parameter_values: The value of each parameter.
+        :param objective_values: The value of each objective, either by name or as an array following the order
+            of objectives_names.
+        :param objective_criticalities: The criticality of each objective, following the order of objectives_names,
+            if already computed from the objective values with the same bounds, e.g. for several systems at once.
+            Computed from the objective values if None.
+        :param criticality: The aggregated criticality of the objective criticalities, if already computed.
+            Computed from them if None.
+        :return: The suggestions for each parameter.
+        """
+        self._logger.debug('Cycle %d', self._cycle)
+        if isinstance(objective_values, np.ndarray):
+            objective_values = objective_values.astype(np.float64, copy=False)
+        else:
+            objective_values = np.fromiter((objective_values[name] for name in self._objectives_names),
+                                           dtype=np.float64, count=len(self._objectives_names))
+        if self._revisits is not None:
+            self._revisits.add(parameter_values, dict(zip(self._objectives_names, objective_values.tolist())))
+        profiler = self._profiler
+        tracer = self._tracer
+        if profiler:
+            t = profiler.start_cycle(self._cycle)
+
+        # Update criticalities, shared by all points created during this cycle
+        if objective_criticalities is None:
+            crits = self._objectives_normalizer(objective_values)
+        else:
+            crits = objective_criticalities.copy()
+        crits.flags.writeable = False
+        if criticality is None:
+            criticality = self._aggregator(crits)
+        self._objectives_criticalities[:] = crits
+        self._logger.debug('Criticalities: %s', crits)
+        if self._dump_writer:
+            for objective, value in zip(self._objective_agents, objective_values.tolist()):
+                objective.dump(self._cycle, value)
+        if profiler:
+            t = profiler.record(profiling.PHASE_OBJECTIVES, t, len(self._objective_agents))
 
         # Update parameters, current points, and directions
         current_points = {}
@@ -87,6 +296,15 @@ class Calicoba:
         for parameter in self._parameter_agents:
             p_name = parameter.name
             suggestions[p_name] = []
+            if parameter.frozen:
+                if not parameter.should_wake(crits, self._config.wake_threshold):
+                    suggestion = parameter.get_frozen_suggestion(criticality)
+                    suggestions[p_name].append(suggestion)
+                    if tracer:
+                        self._trace_decision(tracer, suggestion.agent, suggestion)
+                    continue
+                parameter.wake(parameter_values[p_name])
+                self._create_new_chain_for_params.add(p_name)
             diff = parameter_values[p_name] - parameter.value
             if diff > 0:
                 last_directions[p_name] = agents.DIR_INCREASE
@@ -95,16 +313,23 @@ class Calicoba:
             else:
                 last_directions[p_name] = agents.DIR_NONE
             new_chain = p_name in self._create_new_chain_for_params
-            new_point = parameter.perceive(parameter_values[p_name], new_chain, crits)
+            new_point = parameter.perceive(parameter_values[p_name], new_chain, crits, criticality,
+                                           chain_end=self._chain_ends.get(p_name))
             current_points[p_name] = new_point
             if new_point not in self._agents_registry:
                 self.add_agent(new_point)
         self._create_new_chain_for_params.clear()
+        self._chain_ends.clear()
+        if profiler:
+            t = profiler.record(profiling.PHASE_PARAMETERS, t, len(self._parameter_agents))
 
-        # Update point agents
-        point_agents = self.get_agents_for_type(agents.PointAgent)
+        # Update point agents, only those that may act during this cycle are scheduled
+        point_agents = [point for parameter in self._parameter_agents if not parameter.frozen
+                        for point in parameter.get_points_to_update()]
         for point in point_agents:
             point.perceive(current_points[point.parameter_name], last_directions[point.parameter_name])
+        if profiler:
+            t = profiler.record(profiling.PHASE_POINTS_PERCEIVE, t, len(point_agents))
 
         # Let point agents decide where to go next
         for point in point_agents:
@@ -115,16 +340,304 @@ class Calicoba:
                 if isinstance(suggestion, agents.Suggestion) and suggestion.new_chain_next:
                     self._create_new_chain_for_params.add(point.parameter_name)
                 suggestions[point.parameter_name].append(suggestion)
+                if tracer:
+                    self._trace_decision(tracer, point, suggestion)
+        if profiler:
+            t = profiler.record(profiling.PHASE_POINTS_DECIDE, t, len(point_agents))
 
+        freeze_after_minima = self._config.freeze_after_minima
         for parameter in self._parameter_agents:
+            if (freeze_after_minima is not None and parameter.local_min_found
+                    and parameter.similar_minima_number >= freeze_after_minima
+                    and self._can_freeze(parameter, suggestions[parameter.name])):
+                parameter.freeze(crits)
+                # Replace the suggestions made during this cycle by the pinned value
+                suggestions[parameter.name] = [parameter.get_frozen_suggestion(criticality)]
+                self._create_new_chain_for_params.discard(parameter.name)
+            if tracer and parameter.local_min_found:
+                minimum = parameter.minima[-1]
+                tracer.emit(tracing.TraceEvent(
+                    cycle=self._cycle,
+                    type=tracing.EVENT_LOCAL_MINIMUM,
+                    parameter=parameter.name,
+                    point=minimum.name,
+                    value=minimum.parameter_value,
+                    criticality=minimum.criticality,
+                ))
             parameter.local_min_found = False
 
+        if (self._config.points_budget is not None
+                and self._agents_registry.count_for_type(agents.PointAgent) > self._config.points_budget):
+            # Chains of current points, whose suggestions are about to be queued, and chains that queued
+            # or pending candidates continue are not finished yet
+            open_chain_ends = {p.name: {p.current_point.index} if p.current_point is not None else set()
+                               for p in self._parameter_agents}
+            for candidate in itertools.chain(self._candidates, self._pending_candidates.values()):
+                for p_name, index in candidate.sources.items():
+                    open_chain_ends[p_name].add(index)
+            for parameter in self._parameter_agents:
+                for point in parameter.compact_chains(open_chain_ends[parameter.name]):
+                    self.remove_agent(point)
+
+        if profiler:
+            profiler.record(profiling.PHASE_MAINTENANCE, t, len(self._parameter_agents))
+            profiler.end_cycle()
+
         self._cycle += 1
 
         return suggestions
 
+    def _can_freeze(self, parameter: agents.ParameterAgent,
+                    suggestions: typ.List[typ.Union[agents.Suggestion, agents.GlobalMinimumFound]]) -> bool:
+        """Tell whether the given parameter may be frozen. At least one other parameter must still be free
+        and a global minimum must not have been found."""
+        return (any(not p.frozen for p in self._parameter_agents if p is not parameter)
+                and not any(isinstance(s, agents.GlobalMinimumFound) for s in suggestions))
+
+    def _trace_decision(self, tracer: tracing.Tracer, point: agents.PointAgent,
+                        suggestion: typ.Union[agents.Suggestion, agents.GlobalMinimumFound]):
+        if isinstance(suggestion, agents.GlobalMinimumFound):
+            event = tracing.TraceEvent(
+                cycle=self._cycle,
+                type=tracing.EVENT_GLOBAL_MINIMUM,
+                parameter=point.parameter_name,
+                point=point.name,
+                value=point.parameter_value,
+                criticality=point.criticality,
+            )
+        else:
+            event = tracing.TraceEvent(
+                cycle=self._cycle,
+                type=tracing.EVENT_DECISION,
+                parameter=point.parameter_name,
+                point=point.name,
+                value=point.parameter_value,
+                criticality=suggestion.criticality,
+                next_value=suggestion.next_point,
+                step=suggestion.step,
+                steps_number=suggestion.steps_number,
+                direction=suggestion.direction,
+                decision=suggestion.decision,
+            )
+        tracer.emit(event)
+
+    def flush(self):
+        """Write all buffered dumped data to disk."""
+        if self._dump_writer:
+            self._dump_writer.flush()
+
+    def close(self):
+        """Write all buffered dumped data to disk and close the dump writer if it was created by this system.
+        Data perceived after a system has been closed is no longer dumped.
+        """
+        if self._dump_writer:
+            if self._owns_dump_writer:
+                self._dump_writer.close()
+            elif not self._dump_writer.closed:
+                self._dump_writer.flush()
+            for objective in self._objective_agents:
+                objective.close_dump()
+            self._dump_writer = None
+
+    def save_checkpoint(self, path: pathlib.Path):
+        """Save the whole state of this system, agent graph included, into the given file."""
+        _checkpoint.save(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path: pathlib.Path, config: CalicobaConfig = None) -> Calicoba:
+        """Restore a system from a file created by save_checkpoint().
+
+        :param path: Path of the checkpoint file.
+        :param config: The config of the restored system. If None, the one saved in the checkpoint is used.
+            Existing dumped files are appended to.
+        :return: The restored system, ready to continue from where it was saved.
+        """
+        return _checkpoint.load(path, cls, config)
+
+    def ask(self, n: int = 1) -> typ.List[Candidate]:
+        """Hand out up to n candidate points to evaluate.
+
+        Candidates are built from the suggestions of the different point agents and chains, the most recent
+        ones first. If not enough suggestions are available, the batch is filled with exploration candidates
+        drawn uniformly within the bounds of parameters, each starting new chains once told.
+        If objectives are deterministic, candidates that were already evaluated are told back directly
+        from memory instead of being handed out. Resolving stops as soon as a global minimum is found,
+        less than n candidates are then returned.
+
+        :param n: The maximum number of candidates to return.
+        :return: The list of candidates, each to be told back through tell() once evaluated.
+        :raise RuntimeError: If no point has been told yet.
+        """
+        if not self._told_points_number:
+            raise RuntimeError('the initial point must be told before asking for candidates')
+        candidates = []
+        resolved_number = 0
+        solution_found = False
+        while len(candidates) < n and not solution_found:
+            candidate = self._candidates.popleft() if self._candidates else self._new_exploration_candidate()
+            self._pending_candidates[candidate.id] = candidate
+            known = self.lookup(candidate.parameters) if resolved_number < self.MAX_RESOLVED_REVISITS else None
+            if known is not None:
+                solution_found = self.tell([(candidate, known)])
+                resolved_number += 1
+            else:
+                candidates.append(candidate)
+        return candidates
+
+    def tell(self, results: typ.Iterable[typ.Tuple[typ.Union[Candidate, typ.Dict[str, float]], typ.Dict[str, float]]]
+             ) -> bool:
+        """Feed evaluated points back into the system, in any order.
+
+        Each result is perceived as one cycle and its suggestions are queued as new candidates.
+        Each parameter continues the chain of the point a candidate was suggested from, unless another point
+        was added to this chain in the meantime or the suggestion asked for a new chain.
+        It starts a new chain otherwise, as for exploration candidates, so that results told out of order
+        are not perceived as consecutive points of the same chain.
+        The initial point, which has not been asked, may be told as a plain parameter values dict.
+
+        :param results: Pairs of (candidate or parameter values, objective values).
+        :return: True if a new global minimum has been found, False otherwise. Global minima found
+            by previous calls keep being reported as suggestions but are not taken into account.
+        """
+        global_minimum_found = False
+        for point, objective_values in results:
+            if isinstance(point, Candidate):
+                self._pending_candidates.pop(point.id, None)
+                parameter_values = point.parameters
+                self._set_chain_ends(point)
+            else:
+                parameter_values = point
+            global_minima_number = self._get_global_minima_number()
+            suggestions = self.suggest_new_point(parameter_values, objective_values)
+            self._told_points_number += 1
+            if self._get_global_minima_number() > global_minima_number:
+                global_minimum_found = True
+                if self._solution is None:
+                    self._solution = dict(parameter_values)
+            self._queue_candidates(parameter_values, suggestions)
+        return global_minimum_found
+
+    async def optimize_async(self, evaluate: typ.Callable[[typ.Dict[str, float]], typ.Awaitable[typ.Dict[str, float]]],
+                             initial_parameters: typ.Dict[str, float], *, max_evaluations: int = 1000,
+                             concurrency: int = 1) -> OptimizationResult:
+        """Run an optimization against a coroutine-based model.
+
+        Up to concurrency evaluations are kept in flight at any time, their results being told as soon as they
+        complete, in the order they were started if several complete at once. As soon as a global minimum
+        is found, all evaluations still in flight are cancelled. Any solution found by a previous run is forgotten.
+
+        :param evaluate: A coroutine function that returns the objective values for the given parameter values.
+        :param initial_parameters: The values of the parameters to start from.
+        :param max_evaluations: The maximum number of calls to evaluate, including the initial point.
+            Evaluations that complete along with the one that finds the solution are counted but not told.
+        :param concurrency: The maximum number of evaluations in flight.
+        :return: The result of the optimization.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency should be at least 1')
+
+        self._solution = None
+        best_parameters = dict(initial_parameters)
+        solution_found = self.tell([(best_parameters, await evaluate(dict(initial_parameters)))])
+        best_criticality = self._get_criticality()
+        evaluations_number = 1
+        in_flight: typ.Dict[asyncio.Future, Candidate] = {}
+        try:
+            while not solution_found and evaluations_number < max_evaluations:
+                room = min(concurrency, max_evaluations - evaluations_number) - len(in_flight)
+                if room > 0:
+                    for candidate in self.ask(room):
+                        in_flight[asyncio.ensure_future(evaluate(dict(candidate.parameters)))] = candidate
+                    if self._solution is not None:
+                        # Found while resolving known candidates
+                        solution_found = True
+                        best_parameters = dict(self._solution)
+                        best_criticality = self._get_criticality()
+                        break
+                if not in_flight:
+                    self._logger.warning('No more candidates to evaluate, stopping.')
+                    break
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                # Iterate in submission order, done is a set
+                for future in [future for future in in_flight if future in done]:
+                    candidate = in_flight.pop(future)
+                    evaluations_number += 1
+                    if solution_found:
+                        # Already evaluated along with the solution
+                        continue
+                    solution_found = self.tell([(candidate, future.result())])
+                    criticality = self._get_criticality()
+                    if criticality < best_criticality:
+                        best_criticality = criticality
+                        best_parameters = dict(candidate.parameters)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        return OptimizationResult(
+            solution_found=solution_found,
+            evaluations_number=evaluations_number,
+            best_parameters=best_parameters,
+            best_criticality=best_criticality,
+        )
+
+    def _get_criticality(self) -> float:
+        """Return the criticality of the last perceived point."""
+        return self._aggregator(self._objectives_criticalities)
+
+    def _get_global_minima_number(self) -> int:
+        return sum(parameter.global_minima_number for parameter in self._parameter_agents)
+
+    def _set_chain_ends(self, candidate: Candidate):
+        """Set the chains parameters continue when perceiving the given candidate, replacing those set
+        by the last cycle."""
+        self._create_new_chain_for_params.clear()
+        self._chain_ends.clear()
+        for parameter in self._parameter_agents:
+            source = candidate.sources.get(parameter.name)
+            chain_end = parameter.get_chain_end(source) if source is not None else None
+            if chain_end is not None:
+                self._chain_ends[parameter.name] = chain_end
+            else:
+                self._create_new_chain_for_params.add(parameter.name)
+
+    def _new_exploration_candidate(self) -> Candidate:
+        """Create a candidate with a value drawn uniformly within the bounds of each parameter."""
+        candidate = Candidate(self._next_candidate_id,
+                              {p.name: self._rng.uniform(p.inf, p.sup) for p in self._parameter_agents})
+        self._next_candidate_id += 1
+        return candidate
+
+    def _queue_candidates(self, parameter_values: typ.Dict[str, float],
+                          suggestions: typ.Dict[str, typ.List[agents.Suggestion]]):
+        """Build candidates from the given suggestions and put them at the front of the queue.
+        The k-th candidate combines the k-th suggestion of each parameter, parameters with fewer suggestions
+        reuse their first one and parameters without any keep their current value.
+        """
+        # Parameters asked to start a new chain by their suggestions have no source
+        sources = {p.name: p.current_point.index for p in self._parameter_agents
+                   if p.current_point is not None and p.name not in self._create_new_chain_for_params}
+        values = {}
+        for p_name, value in parameter_values.items():
+            suggested = list(dict.fromkeys(
+                s.next_point for s in suggestions.get(p_name, ()) if isinstance(s, agents.Suggestion)))
+            values[p_name] = suggested or [value]
+        candidates = []
+        vectors = [parameter_values]
+        for k in range(max(map(len, values.values()), default=0)):
+            vector = {p_name: vs[k] if k < len(vs) else vs[0] for p_name, vs in values.items()}
+            if vector not in vectors:
+                vectors.append(vector)
+                candidates.append(Candidate(self._next_candidate_id, vector, sources))
+                self._next_candidate_id += 1
+        self._candidates.extendleft(reversed(candidates))
+
 
 __all__ = [
     'Calicoba',
     'CalicobaConfig',
+    'Candidate',
+    'OptimizationResult',
 ]
@@ -0,0 +1,336 @@
+"""Compact, versioned checkpoints of a whole Calicoba agent graph.
+
+Point agents are flattened into columns of a NumPy archive, links between them being stored as row indices,
+while the rest of the state goes into a small JSON header. The points stores of parameters are saved as is.
+No pickling is involved.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+import pathlib
+import typing as typ
+
+import numpy as np
+
+from . import agents
+
+if typ.TYPE_CHECKING:
+    from . import Calicoba, CalicobaConfig
+
+FORMAT_NAME = 'calicoba-checkpoint'
+FORMAT_VERSION = 2
+
+_NONE = -1
+# Order of boolean point attributes in the flags column, one bit each
+_POINT_FLAGS = (
+    'local_min_already_visited',
+    'prev_suggestion_out_of_bounds',
+    '_is_current',
+    '_is_current_in_chain',
+    '_is_current_min_of_chain',
+    'is_local_minimum',
+    'is_global_minimum',
+    'is_extremum',
+    'go_up_mode',
+    'already_went_up',
+    'first_point',
+    'best_local_minimum',
+    'create_new_chain_from_me',
+)
+_FLAG_DEAD = 1 << len(_POINT_FLAGS)
+_FLAG_REGISTERED = 1 << (len(_POINT_FLAGS) + 1)
+
+
+def save(system: Calicoba, path: pathlib.Path):
+    """Save the state of the given system into a checkpoint file.
+
+    :param system: The system to save.
+    :param path: Path of the checkpoint file.
+    """
+    parameters = list(system._parameter_agents)
+    objectives = list(system._objective_agents)
+    objective_names = [objective.name for objective in objectives]
+    parameters_indices = {parameter: i for i, parameter in enumerate(parameters)}
+    objectives_indices = {objective: i for i, objective in enumerate(objectives)}
+
+    points: typ.List[agents.PointAgent] = []
+    points_indices: typ.Dict[agents.PointAgent, int] = {}
+    registry_order = []
+
+    def index_of(point: typ.Optional[agents.PointAgent]) -> int:
+        if point is None:
+            return _NONE
+        if point not in points_indices:
+            points_indices[point] = len(points)
+            points.append(point)
+        return points_indices[point]
+
+    for agent in system._agents_registry:
+        if isinstance(agent, agents.PointAgent):
+            registry_order.append(['point', index_of(agent)])
+        elif isinstance(agent, agents.ParameterAgent):
+            registry_order.append(['parameter', parameters_indices[agent]])
+        elif isinstance(agent, agents.ObjectiveAgent):
+            registry_order.append(['objective', objectives_indices[agent]])
+        else:
+            raise TypeError(f'cannot checkpoint agent of type {type(agent).__name__}')
+
+    parameters_states = []
+    for parameter in parameters:
+        parameters_states.append({
+            'name': parameter.name,
+            'inf': parameter.inf,
+            'sup': parameter.sup,
+            'value': parameter.value,
+            'last_point_id': parameter._last_point_id,
+            'compacted_chains_number': parameter._compacted_chains_number,
+            'compacted_chains': [j for j, chain in enumerate(parameter._chains) if chain.compacted
+                                 and j >= parameter._compacted_chains_number],
+            'similar_minima_number': parameter._similar_minima_number,
+            'frozen_criticalities': (parameter._frozen_criticalities.tolist()
+                                     if parameter._frozen_criticalities is not None else None),
+            'local_min_found': parameter.local_min_found,
+            'chains': [index_of(chain.last) for chain in parameter._chains],
+            'step_states': [dataclasses.asdict(chain.step_state) for chain in parameter._chains],
+            'minima': [index_of(point) for point in parameter.minima],
+        })
+
+    # Walk links until all reachable points have a row
+    i = 0
+    while i < len(points):
+        index_of(points[i].previous_point)
+        index_of(points[i].next_point)
+        i += 1
+
+    registered = set(system._agents_registry.get_for_type(agents.PointAgent))
+    flags = np.zeros(len(points), dtype=np.uint16)
+    for i, point in enumerate(points):
+        f = 0
+        for bit, attribute in enumerate(_POINT_FLAGS):
+            if getattr(point, attribute):
+                f |= 1 << bit
+        if point.dead:
+            f |= _FLAG_DEAD
+        if point in registered:
+            f |= _FLAG_REGISTERED
+        flags[i] = f
+
+    metadata = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'config': {
+            'dump_directory': str(system.config.dump_directory) if system.config.dump_directory else None,
+            'seed': system.config.seed,
+            'logging_level': system.config.logging_level,
+            'points_budget': system.config.points_budget,
+            'freeze_after_minima': system.config.freeze_after_minima,
+            'wake_threshold': system.config.wake_threshold,
+            'deterministic': system.config.deterministic,
+            'revisit_tolerance': system.config.revisit_tolerance,
+            'surrogate': system.config.surrogate,
+            'step_controller': system.config.step_controller,
+            'step_growth': system.config.step_growth,
+            'step_shrink': system.config.step_shrink,
+            'step_patience': system.config.step_patience,
+            'min_steps_number': system.config.min_steps_number,
+            'max_steps_number': system.config.max_steps_number,
+            'aggregator': system.config.aggregator,
+            'objective_weights': system.config.objective_weights,
+        },
+        'cycle': system.cycle,
+        'rng_state': _to_json(system.rng.getstate()),
+        'create_new_chain_for_params': sorted(system._create_new_chain_for_params),
+        'registry': registry_order,
+        'parameters': parameters_states,
+        'objectives': [{'name': o.name, 'inf': o.inf, 'sup': o.sup, 'criticality': o.criticality}
+                       for o in objectives],
+        'candidates': [[c.id, c.parameters, c.sources] for c in system._candidates],
+        'pending_candidates': [[c.id, c.parameters, c.sources] for c in system._pending_candidates.values()],
+        'next_candidate_id': system._next_candidate_id,
+        'told_points_number': system._told_points_number,
+        'solution': system._solution,
+    }
+
+    revisits = list(system._revisits.items()) if system._revisits is not None else []
+    parameter_names = [parameter.name for parameter in parameters]
+
+    # Points are only recorded when a points budget is set
+    stores = {f'store_{i}_{name}': column
+              for i, parameter in enumerate(parameters) if parameter.points_store is not None
+              for name, column in parameter.points_store.to_columns().items()}
+
+    with path.open(mode='wb') as f:
+        np.savez(
+            f,
+            **stores,
+            metadata=np.array(json.dumps(metadata)),
+            names=np.array([point.name for point in points], dtype=str),
+            index=np.array([point.index for point in points], dtype=np.int64),
+            parameter=np.array([parameters_indices[point._param_agent] for point in points], dtype=np.int32),
+            value=np.array([point.parameter_value for point in points], dtype=np.float64),
+            criticalities=np.array([point.objective_criticalities for point in points],
+                                   dtype=np.float64).reshape((len(points), len(objective_names))),
+            criticality=np.array([point.criticality for point in points], dtype=np.float64),
+            step=np.array([point._step for point in points], dtype=np.float64),
+            last_direction=np.array([point._last_direction for point in points], dtype=np.int8),
+            last_checked_direction=np.array([point._last_checked_direction for point in points], dtype=np.int8),
+            steps_mult=np.array([point.steps_mult for point in points], dtype=np.int64),
+            previous=np.array([index_of(point.previous_point) for point in points], dtype=np.int64),
+            next=np.array([index_of(point.next_point) for point in points], dtype=np.int64),
+            flags=flags,
+            revisit_parameters=np.array([[p[name] for name in parameter_names] for p, _ in revisits],
+                                        dtype=np.float64).reshape((len(revisits), len(parameter_names))),
+            revisit_objectives=np.array([[o[name] for name in objective_names] for _, o in revisits],
+                                        dtype=np.float64).reshape((len(revisits), len(objective_names))),
+        )
+
+
+def load(path: pathlib.Path, system_factory: typ.Callable[[CalicobaConfig], Calicoba],
+         config: CalicobaConfig = None) -> Calicoba:
+    """Restore a system from a checkpoint file.
+
+    :param path: Path of the checkpoint file.
+    :param system_factory: A function that creates an empty system from a config.
+    :param config: The config of the restored system. If None, the one saved in the checkpoint is used.
+    :return: The restored system.
+    :raise ValueError: If the file is not a checkpoint or its version is not supported.
+    """
+    from . import Candidate, CalicobaConfig
+
+    with np.load(path, allow_pickle=False) as data:
+        metadata = json.loads(str(data['metadata']))
+        if metadata.get('format') != FORMAT_NAME:
+            raise ValueError(f'"{path}" is not a Calicoba checkpoint')
+        if metadata.get('version') != FORMAT_VERSION:
+            raise ValueError(f'unsupported checkpoint version {metadata.get("version")}')
+        columns = {k: data[k] for k in data.files if k != 'metadata'}
+
+    if config is None:
+        saved_config = metadata['config']
+        config = CalicobaConfig(
+            dump_directory=pathlib.Path(saved_config['dump_directory']) if saved_config['dump_directory'] else None,
+            seed=saved_config['seed'],
+            logging_level=saved_config['logging_level'],
+            points_budget=saved_config['points_budget'],
+            freeze_after_minima=saved_config['freeze_after_minima'],
+            wake_threshold=saved_config['wake_threshold'],
+            deterministic=saved_config['deterministic'],
+            revisit_tolerance=saved_config['revisit_tolerance'],
+            surrogate=saved_config['surrogate'],
+            step_controller=saved_config['step_controller'],
+            step_growth=saved_config['step_growth'],
+            step_shrink=saved_config['step_shrink'],
+            step_patience=saved_config['step_patience'],
+            min_steps_number=saved_config['min_steps_number'],
+            max_steps_number=saved_config['max_steps_number'],
+            aggregator=saved_config['aggregator'],
+            objective_weights=saved_config['objective_weights'],
+        )
+    system = system_factory(config)
+    logger = system._logger
+
+    parameters = [system._create_parameter(p['name'], p['inf'], p['sup']) for p in metadata['parameters']]
+    objectives = [agents.ObjectiveAgent(o['name'], o['inf'], o['sup']) for o in metadata['objectives']]
+    objective_names = [o['name'] for o in metadata['objectives']]
+
+    points = []
+    names = columns['names'].tolist()
+    values = columns['value'].tolist()
+    # Rows of a read-only array are shared by points instead of being copied
+    criticalities = columns['criticalities']
+    criticalities.flags.writeable = False
+    points_criticalities = columns['criticality'].tolist()
+    steps = columns['step'].tolist()
+    indices = columns['index'].tolist()
+    for i, parameter_index in enumerate(columns['parameter'].tolist()):
+        point = agents.PointAgent(names[i], parameters[parameter_index], None, steps[i], criticalities[i],
+                                  points_criticalities[i], index=indices[i], logger=logger)
+        point._param_value = values[i]
+        points.append(point)
+
+    def point_at(index: int) -> typ.Optional[agents.PointAgent]:
+        return points[index] if index != _NONE else None
+
+    last_directions = columns['last_direction'].tolist()
+    last_checked_directions = columns['last_checked_direction'].tolist()
+    steps_mults = columns['steps_mult'].tolist()
+    previous = columns['previous'].tolist()
+    next_ = columns['next'].tolist()
+    flags = columns['flags'].tolist()
+    for i, point in enumerate(points):
+        point._last_direction = last_directions[i]
+        point._last_checked_direction = last_checked_directions[i]
+        point.steps_mult = steps_mults[i]
+        point.previous_point = point_at(previous[i])
+        point.next_point = point_at(next_[i])
+        for bit, attribute in enumerate(_POINT_FLAGS):
+            setattr(point, attribute, bool(flags[i] & (1 << bit)))
+        if flags[i] & _FLAG_DEAD:
+            point.die()
+
+    for i, (parameter, state) in enumerate(zip(parameters, metadata['parameters'])):
+        parameter._value = state['value']
+        parameter._last_point_id = state['last_point_id']
+        parameter._compacted_chains_number = state['compacted_chains_number']
+        parameter.local_min_found = state['local_min_found']
+        parameter._chains = [agents.Chain(_walk_chain(points[j]), step_state=agents.StepState(**step_state))
+                             for j, step_state in zip(state['chains'], state['step_states'])]
+        for j, chain in enumerate(parameter._chains):
+            chain.compacted = j < parameter._compacted_chains_number or j in state['compacted_chains']
+        prefix = f'store_{i}_'
+        store_columns = {k[len(prefix):]: v for k, v in columns.items() if k.startswith(prefix)}
+        parameter._store = agents.PointStore.from_columns(store_columns) if store_columns else None
+        for j in state['minima']:
+            parameter.add_minimum(points[j])
+        parameter._similar_minima_number = state['similar_minima_number']
+        if state['frozen_criticalities'] is not None:
+            parameter._frozen_criticalities = np.array(state['frozen_criticalities'], dtype=np.float64)
+    for objective, state in zip(objectives, metadata['objectives']):
+        objective._criticality[0] = state['criticality']
+
+    for kind, index in metadata['registry']:
+        if kind == 'point':
+            if flags[index] & _FLAG_REGISTERED:
+                system.add_agent(points[index])
+        else:
+            system.add_agent((parameters if kind == 'parameter' else objectives)[index])
+    system._setup(resume=True)
+
+    system._cycle = metadata['cycle']
+    system._rng.setstate(_from_json(metadata['rng_state']))
+    system._create_new_chain_for_params = set(metadata['create_new_chain_for_params'])
+    system._candidates.extend(Candidate(i, p, sources) for i, p, sources in metadata['candidates'])
+    system._pending_candidates = {i: Candidate(i, p, sources) for i, p, sources in metadata['pending_candidates']}
+    system._next_candidate_id = metadata['next_candidate_id']
+    system._told_points_number = metadata['told_points_number']
+    system._solution = metadata['solution']
+    if system._revisits is not None:
+        parameter_names = [p['name'] for p in metadata['parameters']]
+        for parameter_values, objective_values in zip(columns['revisit_parameters'].tolist(),
+                                                      columns['revisit_objectives'].tolist()):
+            system._revisits.add(dict(zip(parameter_names, parameter_values)),
+                                 dict(zip(objective_names, objective_values)))
+
+    return system
+
+
+def _walk_chain(last_point: agents.PointAgent) -> typ.List[agents.PointAgent]:
+    """Return the points of the chain ending with the given point, in order."""
+    points = []
+    point = last_point
+    while point:
+        points.append(point)
+        point = point.previous_point
+    points.reverse()
+    return points
+
+
+def _to_json(o):
+    """Convert nested tuples into lists."""
+    return [_to_json(e) for e in o] if isinstance(o, tuple) else o
+
+
+def _from_json(o):
+    """Convert nested lists into tuples."""
+    return tuple(_from_json(e) for e in o) if isinstance(o, list) else o
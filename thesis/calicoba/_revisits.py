@@ -0,0 +1,90 @@
+"""Memory of the objective values of already evaluated parameter vectors."""
+import itertools
+import math
+import typing as typ
+
+# Parameter values sorted by parameter name
+Vector = typ.Tuple[typ.Tuple[str, float], ...]
+
+
+class RevisitCache:
+    def __init__(self, tolerance: float = 0):
+        """Objective values of evaluated parameter vectors, indexed on a grid whose cells are twice the tolerance.
+
+        A vector is known if one evaluated vector has all its parameters within the tolerance of it.
+        With a null tolerance, only identical vectors match. The values of the first evaluation are kept.
+
+        :param tolerance: The maximum difference between two values of a parameter for them to be the same.
+        :raise ValueError: If the tolerance is negative.
+        """
+        if tolerance < 0:
+            raise ValueError('tolerance should be positive')
+        self._tolerance = tolerance
+        self._cell_size = 2 * tolerance
+        self._cells: typ.Dict[tuple, typ.List[typ.Tuple[Vector, typ.Dict[str, float]]]] = {}
+        self._size = 0
+        self._hits = 0
+
+    @property
+    def tolerance(self) -> float:
+        return self._tolerance
+
+    @property
+    def hits(self) -> int:
+        """Number of successful lookups."""
+        return self._hits
+
+    def add(self, parameter_values: typ.Mapping[str, float], objective_values: typ.Mapping[str, float]):
+        """Remember the objective values of the given parameter vector, unless it is already known."""
+        if self._find(parameter_values) is not None:
+            return
+        vector = self._vector(parameter_values)
+        self._cells.setdefault(self._cell(vector), []).append((vector, dict(objective_values)))
+        self._size += 1
+
+    def get(self, parameter_values: typ.Mapping[str, float]) -> typ.Optional[typ.Dict[str, float]]:
+        """Return a copy of the objective values of the given parameter vector, None if it is not known."""
+        objective_values = self._find(parameter_values)
+        if objective_values is None:
+            return None
+        self._hits += 1
+        return dict(objective_values)
+
+    def items(self) -> typ.Iterator[typ.Tuple[typ.Dict[str, float], typ.Dict[str, float]]]:
+        """Iterate over the known (parameter values, objective values) pairs, parameters sorted by name."""
+        for cell in self._cells.values():
+            for vector, objective_values in cell:
+                yield dict(vector), objective_values
+
+    def _find(self, parameter_values: typ.Mapping[str, float]) -> typ.Optional[typ.Dict[str, float]]:
+        vector = self._vector(parameter_values)
+        if not self._tolerance:
+            cell = self._cells.get(vector)
+            return cell[0][1] if cell else None
+        # A cell spans twice the tolerance: only cells next to a close boundary may contain a match
+        candidates = []
+        for name, value in vector:
+            index = math.floor(value / self._cell_size)
+            indices = [index]
+            if value - self._tolerance < index * self._cell_size:
+                indices.append(index - 1)
+            if value + self._tolerance >= (index + 1) * self._cell_size:
+                indices.append(index + 1)
+            candidates.append([(name, i) for i in indices])
+        for key in itertools.product(*candidates):
+            for other, objective_values in self._cells.get(key, ()):
+                if all(abs(v1 - v2) <= self._tolerance for (_, v1), (_, v2) in zip(vector, other)):
+                    return objective_values
+        return None
+
+    def _cell(self, vector: Vector) -> tuple:
+        if not self._tolerance:
+            return vector
+        return tuple((name, math.floor(value / self._cell_size)) for name, value in vector)
+
+    @staticmethod
+    def _vector(parameter_values: typ.Mapping[str, float]) -> Vector:
+        return tuple(sorted((name, float(value)) for name, value in parameter_values.items()))
+
+    def __len__(self) -> int:
+        return self._size
@@ -1,2 +1,9 @@
+from ._aggregators import *
 from ._agents import *
+from ._chains import *
 from ._normalizers import *
+from ._point_store import *
+from ._points_index import *
+from ._registry import *
+from ._step_controllers import *
+from ._surrogates import *
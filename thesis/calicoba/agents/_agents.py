@@ -7,15 +7,35 @@ import math
 import pathlib
 import typing as typ
 
-from . import _normalizers
-from .. import utils
+import numpy as np
+
+from . import _chains, _normalizers, _point_store, _points_index, _step_controllers, _surrogates
+from .. import dumping, utils
+
+# Criticality of each objective, either by name or following the order of objectives
+Criticalities = typ.Union[np.ndarray, typ.Mapping[str, float]]
 
 DIR_INCREASE = 1
 DIR_DECREASE = -1
 DIR_NONE = 0
 
 
+def as_criticalities_array(criticalities: Criticalities) -> np.ndarray:
+    """Return the given criticalities as a read-only array. Read-only arrays are returned as is,
+    mappings are converted following the order of their values."""
+    if isinstance(criticalities, np.ndarray) and not criticalities.flags.writeable:
+        return criticalities
+    if isinstance(criticalities, typ.Mapping):
+        criticalities = np.fromiter(criticalities.values(), dtype=np.float64, count=len(criticalities))
+    else:
+        criticalities = np.array(criticalities, dtype=np.float64)
+    criticalities.flags.writeable = False
+    return criticalities
+
+
 class Agent(abc.ABC):
+    __slots__ = ('__name', '__dead', '_logger')
+
     def __init__(self, name: str, *, logger: logging.Logger = None):
         self.__name = name
         self.__dead = False
@@ -36,69 +56,140 @@ class Agent(abc.ABC):
         if self._logger:
             self._logger.exception(exception)
 
-    def log_error(self, message):
-        if self._logger:
-            self._logger.error(self.name + ': ' + str(message))
+    def log_error(self, message, *args):
+        self._log(logging.ERROR, message, args)
 
-    def log_critical(self, message):
-        if self._logger:
-            self._logger.critical(self.name + ': ' + str(message))
+    def log_critical(self, message, *args):
+        self._log(logging.CRITICAL, message, args)
 
-    def log_warning(self, message):
-        if self._logger:
-            self._logger.warning(self.name + ': ' + str(message))
+    def log_warning(self, message, *args):
+        self._log(logging.WARNING, message, args)
 
-    def log_info(self, message):
-        if self._logger:
-            self._logger.info(self.name + ': ' + str(message))
+    def log_info(self, message, *args):
+        self._log(logging.INFO, message, args)
 
-    def log_debug(self, message):
-        if self._logger:
-            self._logger.debug(self.name + ': ' + str(message))
+    def log_debug(self, message, *args):
+        self._log(logging.DEBUG, message, args)
+
+    def _log(self, level: int, message, args: tuple):
+        """Log a message prefixed by this agent’s name. The message is only formatted,
+        with the given %-style arguments, if the logger is enabled for the given level."""
+        if self._logger and self._logger.isEnabledFor(level):
+            if args:
+                self._logger.log(level, '%s: ' + str(message), self.name, *args)
+            else:
+                self._logger.log(level, '%s: %s', self.name, message)
 
     def __repr__(self):
         return f'{self.name}'
 
 
 class ObjectiveAgent(Agent):
+    __slots__ = ('_inf', '_sup', '_criticality', '_normalizer', '_dump_file')
+
     def __init__(self, name: str, inf: float, sup: float):
         super().__init__(name)
-        self._criticality = 0
+        self._inf = inf
+        self._sup = sup
+        # Single cell array, may be a view on the criticalities of all objectives (see bind())
+        self._criticality = np.zeros(1)
         self._normalizer = _normalizers.BoundNormalizer(inf, sup)
-        self._file = None
+        self._dump_file: typ.Optional[dumping.DumpFile] = None
+
+    @property
+    def inf(self) -> float:
+        return self._inf
+
+    @property
+    def sup(self) -> float:
+        return self._sup
 
     @property
     def criticality(self) -> float:
-        return self._criticality
+        return float(self._criticality[0])
+
+    def bind(self, criticality: np.ndarray):
+        """Store the criticality of this objective in the given single cell array from now on.
+        The current criticality is copied into it.
+
+        :param criticality: A view on the cell of this objective in an array of criticalities that is updated
+            as a whole, without calling perceive().
+        """
+        criticality[0] = self._criticality[0]
+        self._criticality = criticality
+
+    def open_dump(self, writer: dumping.DumpWriter, dump_dir: pathlib.Path, append: bool = False):
+        """Dump the values perceived from now on into this objective’s file in the given directory.
 
-    def perceive(self, cycle: int, objective_value: float, *, dump_dir: pathlib.Path = None):
-        self._criticality = self._normalizer(objective_value)
+        :param append: Whether values are appended to an existing file instead of overwriting it.
+        """
+        self._dump_file = writer.open(dump_dir / (self.name + '.csv'), ('cycle', 'raw value', 'criticality'),
+                                      append=append)
+
+    def close_dump(self):
+        """Stop dumping perceived values."""
+        self._dump_file = None
 
-        if dump_dir:
-            if not self._file:
-                self._file = (dump_dir / (self.name + '.csv')).open(mode='w', encoding='UTF-8')
-                self._file.write('cycle,raw value,criticality\n')
-            self._file.write(f'{cycle},{objective_value},{self._criticality}\n')
-            self._file.flush()
+    def perceive(self, cycle: int, objective_value: float):
+        self._criticality[0] = self._normalizer(objective_value)
+        self.dump(cycle, objective_value)
 
-    def __del__(self):
-        if self._file:
-            self._file.close()
+    def dump(self, cycle: int, objective_value: float):
+        """Write the given value and the current criticality to this objective’s dump file, if opened."""
+        if self._dump_file:
+            self._dump_file.write(cycle, objective_value, self.criticality)
 
 
 class ParameterAgent(Agent):
-    def __init__(self, name: str, inf: float, sup: float, *, logger: logging.Logger = None):
+    __slots__ = (
+        '_inf',
+        '_sup',
+        '_step_controller',
+        '_surrogate',
+        '_chains',
+        '_updated_chains',
+        '_minima',
+        '_minima_index',
+        '_store',
+        '_last_point_id',
+        '_compacted_chains_number',
+        '_similar_minima_number',
+        '_global_minima_number',
+        '_frozen_criticalities',
+        '_value',
+        '_current_point',
+        'local_min_found',
+    )
+
+    def __init__(self, name: str, inf: float, sup: float, *, surrogate: _surrogates.Surrogate = None,
+                 step_controller: _step_controllers.StepController = None, record_points: bool = False,
+                 logger: logging.Logger = None):
+        """Create a parameter.
+
+        :param surrogate: An optional surrogate used by points to predict the minimum around them during local search.
+        :param step_controller: The controller of the initial step and jump lengths of points,
+            a FixedStepController if None.
+        :param record_points: Whether to record all points in a PointStore, required to compact chains.
+        """
         super().__init__(name, logger=logger)
         self._inf = inf
         self._sup = sup
-        self._max_step_number = 2
-        self._init_step = (sup - inf) / 100
+        self._step_controller = step_controller or _step_controllers.FixedStepController(inf, sup)
+        self._surrogate = surrogate
 
-        self._chains: typ.List[PointAgent] = []
+        self._chains: typ.List[_chains.Chain] = []
+        self._updated_chains: typ.List[_chains.Chain] = []
         self._minima = []
+        self._minima_index = _points_index.PointsIndex(threshold=PointAgent.SAME_POINT_THRESHOLD)
+        self._store = _point_store.PointStore() if record_points else None
         self._last_point_id = 0
+        self._compacted_chains_number = 0
+        self._similar_minima_number = 0
+        self._global_minima_number = 0
+        self._frozen_criticalities: typ.Optional[np.ndarray] = None
 
         self._value = math.nan
+        self._current_point: typ.Optional[PointAgent] = None
 
         self.local_min_found = False
 
@@ -114,51 +205,261 @@ class ParameterAgent(Agent):
     def value(self) -> float:
         return self._value
 
+    @property
+    def current_point(self) -> typ.Optional[PointAgent]:
+        """The point perceived during the last cycle this parameter was not frozen, None if there is none."""
+        return self._current_point
+
     @property
     def start_init_step(self) -> float:
-        return self._init_step
+        return self._step_controller.init_step
+
+    @property
+    def step_controller(self) -> _step_controllers.StepController:
+        return self._step_controller
 
     @property
-    def step_max(self) -> int:
-        return self._max_step_number
+    def surrogate(self) -> typ.Optional[_surrogates.Surrogate]:
+        return self._surrogate
 
     @property
     def minima(self) -> typ.Sequence[PointAgent]:
         return self._minima
 
+    @property
+    def points_store(self) -> typ.Optional[_point_store.PointStore]:
+        """The record of all points created by this parameter, including those evicted from their chain,
+        None if points are not recorded. Rows are indexed by PointAgent.index."""
+        return self._store
+
+    @property
+    def similar_minima_number(self) -> int:
+        """Number of consecutive local minima found by this parameter at the same value, the last one included."""
+        return self._similar_minima_number
+
+    @property
+    def global_minima_number(self) -> int:
+        """Number of minima of this parameter that are global minima."""
+        return self._global_minima_number
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen_criticalities is not None
+
     def add_minimum(self, point: PointAgent):
+        if self._minima and abs(
+                self._minima[-1].parameter_value - point.parameter_value) <= PointAgent.SAME_POINT_THRESHOLD:
+            self._similar_minima_number += 1
+        else:
+            self._similar_minima_number = 1
         self._minima.append(point)
+        self._minima_index.add(point)
+        if point.is_global_minimum:
+            self._global_minima_number += 1
+        if self._store is not None:
+            flags = _point_store.FLAG_LOCAL_MINIMUM
+            if point.is_global_minimum:
+                flags |= _point_store.FLAG_GLOBAL_MINIMUM
+            self._store.set_flags(point.index, flags)
+
+    def get_similar_minima(self, value: float) -> typ.List[PointAgent]:
+        """Return the minima within PointAgent.SAME_POINT_THRESHOLD of the given value, in the order they were
+        found."""
+        return self._minima_index.get_in_range(value, PointAgent.SAME_POINT_THRESHOLD)
+
+    def is_closest_minimum(self, point: PointAgent, value: float) -> bool:
+        """Tell whether the given minimum is the closest to the given value among itself and the minima farther than
+        PointAgent.SAME_POINT_THRESHOLD from it, and at least one such other minimum exists. Ties go to the first
+        minimum found."""
+        threshold = PointAgent.SAME_POINT_THRESHOLD
+        return (self._minima_index.has_outside_range(point.parameter_value, threshold)
+                and self._minima_index.is_closest(point, value, threshold))
+
+    def get_minima_neighbors(self, point: PointAgent) \
+            -> typ.Tuple[typ.Optional[PointAgent], typ.Optional[PointAgent]]:
+        """Return the closest minima on each side of the given minimum, minima closer than
+        PointAgent.SAME_POINT_THRESHOLD to the last non-duplicate one being ignored."""
+        return self._minima_index.neighbors(point)
+
+    def freeze(self, criticalities: np.ndarray):
+        """Pin this parameter to its last local minimum. Its points will not be updated until it is woken.
+
+        :param criticalities: The current objective criticalities, used to detect when to wake up.
+        """
+        self._frozen_criticalities = np.array(criticalities)
+        self.log_debug('frozen at %s', self._minima[-1].parameter_value)
+
+    def should_wake(self, criticalities: np.ndarray, threshold: float) -> bool:
+        """Tell whether any objective criticality moved by more than the given threshold since this parameter
+        was frozen."""
+        return bool((np.abs(criticalities - self._frozen_criticalities) > threshold).any())
 
-    def perceive(self, value: float, new_chain: bool, criticalities: typ.Dict[str, float]) -> PointAgent:
+    def wake(self, value: float):
+        """Unpin this parameter. Its value is reset to the current one, so that the direction of its first move
+        is not computed from the value it had before being pinned to its minimum.
+
+        :param value: The current value of the parameter.
+        """
         self._value = value
-        prev_point = self._chains[-1] if self._chains else None
+        self._frozen_criticalities = None
+        self._similar_minima_number = 0
+        self.log_debug('woken')
+
+    def get_frozen_suggestion(self, criticality: float) -> Suggestion:
+        """Return the suggestion that keeps this frozen parameter on its last local minimum."""
+        minimum = self._minima[-1]
+        return Suggestion(
+            agent=minimum,
+            next_point=minimum.parameter_value,
+            decision='frozen -> stay',
+            selected_objective='',
+            criticality=criticality,
+            local_min_found=False,
+            direction=DIR_NONE,
+            step=minimum.step,
+            steps_number=0,
+        )
+
+    def get_points_to_update(self) -> typ.List[PointAgent]:
+        """Return the points that have to perceive and decide during the current cycle, in creation order.
+
+        These are the points of the chain that contains the current point, those of the chain
+        that has just been finished if a new chain was started during the last perception, and all local minima.
+        Any other point belongs to a chain that was already finished during a previous cycle and perceived once
+        after that. Such a point is neither in the current chain nor a minimum, so its perception cannot change
+        anymore and its decision is always None.
+        """
+        points = dict.fromkeys(self._minima)
+        for chain in self._updated_chains:
+            points.update(dict.fromkeys(chain.points))
+        return sorted(points, key=lambda p: p.index)
+
+    def get_chain_end(self, index: int) -> typ.Optional[PointAgent]:
+        """Return the point with the given index if it is the last point of a chain that has not been compacted,
+        so that this chain may be continued. The most recent chains are searched first.
+
+        :param index: The index of a point, see PointAgent.index.
+        :return: The point, None if it is not the last point of a chain anymore or its chain was compacted.
+        """
+        for i in range(len(self._chains) - 1, self._compacted_chains_number - 1, -1):
+            chain = self._chains[i]
+            if not chain.compacted and chain.points and chain.last.index == index:
+                return chain.last
+        return None
 
-        if not prev_point or prev_point.parameter_value != value or prev_point.objective_criticalities != criticalities:
+    def compact_chains(self, open_chain_ends: typ.Collection[int] = ()) -> typ.List[PointAgent]:
+        """Compact all finished chains that have not been compacted yet.
+
+        A chain is finished once a newer chain has been started, unless it may still be continued.
+        Only its points of minimum criticality and extreme values, and the local minima it contains are kept
+        and linked back together, all others are evicted. As compacted chains are never continued
+        (see get_chain_end), the remaining points of a finished chain never act again and this does not change
+        any decision.
+
+        :param open_chain_ends: The indices of the points whose chains may still be continued, these chains
+            are left untouched.
+        :return: The list of evicted points.
+        :raise ValueError: If this parameter does not record its points.
+        """
+        if self._store is None:
+            raise ValueError(f'parameter {self.name} does not record its points')
+        evicted = []
+        store = self._store
+        for i in range(self._compacted_chains_number, len(self._chains) - 1):
+            chain = self._chains[i]
+            if chain.compacted or chain.points and chain.last.index in open_chain_ends:
+                continue
+            chain.compacted = True
+            if not chain.points:
+                continue
+            # Points of a chain are created in order, its rows are thus sorted in the chain’s order
+            rows = store.get_chain_rows(i, chain.first.index, chain.last.index + 1)
+            values = store.values[rows]
+            points = {p.index: p for p in chain}
+            kept = {
+                chain.minimum,
+                points[rows[values.argmin()]],
+                points[rows[values.argmax()]],
+            }
+            for point in chain.retain(lambda p: p in kept or p.is_local_minimum or p.is_extremum):
+                point.die()
+                store.set_flags(point.index, _point_store.FLAG_EVICTED)
+                evicted.append(point)
+        while (self._compacted_chains_number < len(self._chains) - 1
+               and self._chains[self._compacted_chains_number].compacted):
+            self._compacted_chains_number += 1
+        return evicted
+
+    def perceive(self, value: float, new_chain: bool, criticalities: Criticalities, criticality: float = None, *,
+                 chain_end: PointAgent = None) -> PointAgent:
+        """Perceive the current value of this parameter and the resulting criticalities.
+
+        :param criticalities: The criticality of each objective, see PointAgent.
+        :param criticality: The aggregated criticality, see PointAgent.
+        :param chain_end: The last point of the chain to continue, see get_chain_end.
+            The last point of the most recent chain if None.
+        :return: The point for this value, a new one unless the previous point has the same value
+            and criticalities.
+        """
+        criticalities = as_criticalities_array(criticalities)
+        self._value = value
+        prev_point = chain_end or (self._chains[-1].last if self._chains else None)
+        chain = prev_point.chain if prev_point else None
+        chains_number_before = len(self._chains)
+
+        if (not prev_point or prev_point.parameter_value != value
+                or not np.array_equal(prev_point.objective_criticalities, criticalities)):
             new_point = PointAgent(
                 f'point_{self._last_point_id}',
                 self,
                 prev_point if not new_chain else None,
-                self.start_init_step,
+                self._step_controller.get_step(chain.step_state) if prev_point and not new_chain
+                else self.start_init_step,
                 criticalities,
+                criticality,
+                index=self._last_point_id,
                 logger=self._logger
             )
             self._last_point_id += 1
+            previous_row = -1
             if self._chains and not new_chain:
-                prev_point.next_point = new_point
                 if prev_point.create_new_chain_from_me:
-                    self._chains[-1] = prev_point.previous_point
-                    prev_point.previous_point.next_point = None
-                    prev_point.previous_point = None
+                    # Move the previous point to the head of a new chain
                     prev_point.create_new_chain_from_me = False
-                    self._chains.append(new_point)
+                    self._chains.append(self._new_chain([chain.pop(), new_point]))
+                    if self._store is not None:
+                        self._store.move_to_chain(prev_point.index, len(self._chains) - 1)
                 else:
-                    self._chains[-1] = new_point
+                    chain.append(new_point)
+                self._step_controller.update(new_point.chain.step_state, prev_point.criticality,
+                                             new_point.criticality)
+                previous_row = prev_point.index
+            else:
+                self._chains.append(self._new_chain([new_point]))
+            if self._store is not None:
+                self._store.add(value, new_point.criticality, self._get_chain_index(new_point.chain), previous_row)
+            if len(self._chains) > chains_number_before:
+                # A chain that has just been finished must perceive one last time
+                self._updated_chains = [chain, self._chains[-1]] if chain else self._chains[-1:]
             else:
-                self._chains.append(new_point)
+                self._updated_chains = [chain]
+            self._current_point = new_point
             return new_point
 
+        self._updated_chains = [chain]
+        self._current_point = prev_point
         return prev_point
 
+    def _get_chain_index(self, chain: _chains.Chain) -> int:
+        """Return the position of the given chain, the most recent chains being searched first."""
+        for i in range(len(self._chains) - 1, -1, -1):
+            if self._chains[i] is chain:
+                return i
+        raise ValueError(f'chain not owned by parameter {self.name}')
+
+    def _new_chain(self, points: typ.Iterable[PointAgent]) -> _chains.Chain:
+        return _chains.Chain(points, step_state=self._step_controller.new_state())
+
     def __repr__(self):
         return f'{self.name}={self.value}'
 
@@ -168,14 +469,63 @@ class PointAgent(Agent):
     STUCK_THRESHOLD = 1e-4
     SAME_POINT_THRESHOLD = 0.01
     NULL_THRESHOLD = 0.005
+    # Maximum distance of an extrapolated surrogate minimum, relative to the span of the points it was fitted on
+    SURROGATE_MAX_JUMP = 10
+
+    __slots__ = (
+        '_index',
+        '_param_agent',
+        '_param_value',
+        '_criticalities',
+        '_criticality',
+        '_step',
+        '_last_direction',
+        '_last_checked_direction',
+        'steps_mult',
+        'local_min_already_visited',
+        'prev_suggestion_out_of_bounds',
+        'previous_point',
+        'next_point',
+        'chain',
+        '_is_current',
+        '_current_point',
+        '_is_current_in_chain',
+        '_left_point',
+        '_left_value',
+        '_left_crit',
+        '_right_point',
+        '_right_value',
+        '_right_crit',
+        '_min_of_chain',
+        '_is_current_min_of_chain',
+        'is_local_minimum',
+        'is_global_minimum',
+        'is_extremum',
+        'go_up_mode',
+        'already_went_up',
+        'first_point',
+        'best_local_minimum',
+        'create_new_chain_from_me',
+    )
 
     def __init__(self, name: str, parameter_agent: ParameterAgent, previous_point: typ.Optional[PointAgent],
-                 init_step: float, objective_criticalities: typ.Dict[str, float], *, logger: logging.Logger = None):
+                 init_step: float, objective_criticalities: Criticalities, criticality: float = None, *,
+                 index: int = 0, logger: logging.Logger = None):
+        """Create a point.
+
+        :param objective_criticalities: The criticality of each objective at this point, following the order
+            of objectives. Points created during the same cycle may share the same read-only array,
+            anything else is copied into a new one.
+        :param criticality: The aggregated criticality of this point, the highest objective criticality if None.
+        """
         super().__init__(name, logger=logger)
+        self._index = index
         self._param_agent = parameter_agent
         self._param_value = parameter_agent.value
 
+        objective_criticalities = as_criticalities_array(objective_criticalities)
         self._criticalities = objective_criticalities
+        self._criticality = float(objective_criticalities.max()) if criticality is None else criticality
 
         self._step = init_step
         self._last_direction = DIR_NONE
@@ -187,6 +537,8 @@ class PointAgent(Agent):
 
         self.previous_point = previous_point
         self.next_point: typ.Optional[PointAgent] = None
+        # Set by the chain this point is appended to
+        self.chain: typ.Optional[_chains.Chain] = None
 
         self._is_current = False
         self._current_point = None
@@ -200,7 +552,6 @@ class PointAgent(Agent):
         self._right_value = None
         self._right_crit = None
 
-        self._sorted_minima = []
         self._min_of_chain: typ.Optional[PointAgent] = None
         self._is_current_min_of_chain = False
         self.is_local_minimum = False
@@ -214,40 +565,18 @@ class PointAgent(Agent):
 
         self.create_new_chain_from_me = False
 
-        self._all_points: typ.List[PointAgent] = []
-
-    def update_neighbors(self, points: typ.Iterable[PointAgent], threshold: float = 0):
-        def value_in_list(v, vs):
-            return any(abs(v - e) <= threshold for e in vs)
-
-        sorted_points = sorted(points, key=lambda p: p.parameter_value)
-        # Remove duplicates
-        values = set()
-        sorted_points_ = []
-        for point in sorted_points:
-            if not value_in_list(point.parameter_value, values) or point is self:  # Keep self in list
-                # If another point with the same value as self is in the list, remove it and append self instead
-                if (point is self and sorted_points_
-                        and abs(sorted_points_[-1].parameter_value - self.parameter_value) <= threshold):
-                    del sorted_points_[-1]
-                sorted_points_.append(point)
-                values.add(point.parameter_value)
-        sorted_points = sorted_points_
-        i = sorted_points.index(self)
-        if i > 0:
-            self._left_point = sorted_points[i - 1]
+    def update_neighbors(self, neighbors: typ.Tuple[typ.Optional[PointAgent], typ.Optional[PointAgent]]):
+        self._left_point, self._right_point = neighbors
+        if self._left_point is not None:
             self._left_value = self._left_point.parameter_value
             self._left_crit = self._left_point.criticality
         else:
-            self._left_point = None
             self._left_value = None
             self._left_crit = None
-        if i < len(sorted_points) - 1:
-            self._right_point = sorted_points[i + 1]
+        if self._right_point is not None:
             self._right_value = self._right_point.parameter_value
             self._right_crit = self._right_point.criticality
         else:
-            self._right_point = None
             self._right_value = None
             self._right_crit = None
 
@@ -255,17 +584,16 @@ class PointAgent(Agent):
         self._is_current = self is current_point
         self._current_point = current_point
         self._last_direction = last_direction
-        self._all_points = self._get_all_points_in_chain()
+        chain = self.chain
         if not self.is_local_minimum:
-            self._min_of_chain = min(self._all_points, key=lambda p: p.criticality)
+            self._min_of_chain = chain.minimum
         else:
             self._min_of_chain = self
         self._is_current_min_of_chain = self._min_of_chain is self
-        in_chain = current_point in self._all_points
-        self._is_current_in_chain = in_chain
+        self._is_current_in_chain = current_point in chain
         wait = False
 
-        self.update_neighbors(self._all_points)
+        self.update_neighbors(chain.neighbors(self))
 
         if (self._is_current_min_of_chain and not self.is_local_minimum and (self._left_point or self._right_point)
                 and (not self._left_point
@@ -278,11 +606,10 @@ class PointAgent(Agent):
             self.is_local_minimum = True
             if self.criticality < self.NULL_THRESHOLD:
                 self.is_global_minimum = True
-            similar_minima = [mini for mini in self._param_agent.minima
-                              if abs(mini.parameter_value - self.parameter_value) <= self.SAME_POINT_THRESHOLD]
+            similar_minima = self._param_agent.get_similar_minima(self.parameter_value)
             already_went_up = any(mini.already_went_up for mini in similar_minima)
             max_steps_mult = max((mini.steps_mult for mini in similar_minima), default=1)
-            other_minima = set(self._param_agent.minima) - set(similar_minima)
+            other_minima = len(self._param_agent.minima) > len(similar_minima)
 
             if similar_minima:
                 self.log_debug('local min already visited')
@@ -307,33 +634,15 @@ class PointAgent(Agent):
                 wait = True
 
         if self.is_local_minimum and not self.go_up_mode:
-            self.update_neighbors(self._param_agent.minima, threshold=self.SAME_POINT_THRESHOLD)
-            if self._param_agent.minima:
-                filtered = filter(lambda mini: mini is self or abs(
-                    mini.parameter_value - self.parameter_value) > self.SAME_POINT_THRESHOLD, self._param_agent.minima)
-                self._sorted_minima: typ.List[PointAgent] = sorted(filtered, key=lambda mini: abs(
-                    mini.parameter_value - self._current_point.parameter_value))
-            else:
-                self._sorted_minima = []
-            if self._is_current_in_chain and len(self._sorted_minima) > 1 and self is self._sorted_minima[0]:
+            self.update_neighbors(self._param_agent.get_minima_neighbors(self))
+            if (self._is_current_in_chain
+                    and self._param_agent.is_closest_minimum(self, self._current_point.parameter_value)):
                 self.best_local_minimum = True
 
         if self.go_up_mode:
             if not wait:
                 self.first_point = False
-            extremum_min = None
-            extremum_max = None
-            for point in self._all_points:
-                if not extremum_min or point.parameter_value < extremum_min.parameter_value:
-                    if extremum_min:
-                        extremum_min.is_extremum = False
-                    point.is_extremum = True
-                    extremum_min = point
-                elif not extremum_max or point.parameter_value > extremum_max.parameter_value:
-                    if extremum_max:
-                        extremum_max.is_extremum = False
-                    point.is_extremum = True
-                    extremum_max = point
+            chain.update_extrema()
 
     def decide(self) -> typ.Optional[typ.Optional[Suggestion, GlobalMinimumFound]]:
         if self.is_global_minimum:
@@ -359,10 +668,10 @@ class PointAgent(Agent):
                  new_chain_next, suggested_point, suggested_steps_number) = self._semi_local_search()
 
         if decision:
-            self.log_debug('Decision: ' + decision)
+            self.log_debug('Decision: %s', decision)
 
         if suggested_steps_number is not None:  # Cap jump length
-            suggested_steps_number = min(self._param_agent.step_max, suggested_steps_number)
+            suggested_steps_number = min(self.chain.step_state.max_steps_number, suggested_steps_number)
             suggested_point = from_value + self._step * suggested_steps_number * direction
             if (check_for_out_of_bounds
                     and (suggested_point < self._param_agent.inf or suggested_point > self._param_agent.sup)):
@@ -411,39 +720,92 @@ class PointAgent(Agent):
             suggested_point = (self_value + other_value) / 2
 
         elif (self._left_point is not None) != (self._right_point is not None):
-            decision = '1 neighbor -> follow slope'
-            if self._left_point:
-                top_point = (self._left_value, self._left_crit)
-            else:
-                top_point = (self._right_value, self._right_crit)
-            self._step = abs(self_value - top_point[0])
-            x = utils.get_xc(top_point, intermediate_point=(self_value, self_crit), yc=0)
-            direction = DIR_INCREASE if x > self_value else DIR_DECREASE
-            if abs(x - self_value) < self.STUCK_THRESHOLD:
-                suggested_point = self_value + self._step * direction
+            surrogate_point = self._get_surrogate_point()
+            if surrogate_point is not None:
+                decision = '1 neighbor -> go to surrogate minimum'
+                direction = DIR_INCREASE if surrogate_point > self_value else DIR_DECREASE
+                suggested_point = surrogate_point
             else:
-                suggested_steps_number = abs(x - self_value) / self._step
+                decision = '1 neighbor -> follow slope'
+                if self._left_point:
+                    top_point = (self._left_value, self._left_crit)
+                else:
+                    top_point = (self._right_value, self._right_crit)
+                self._step = abs(self_value - top_point[0])
+                x = utils.get_xc(top_point, intermediate_point=(self_value, self_crit), yc=0)
+                direction = DIR_INCREASE if x > self_value else DIR_DECREASE
+                if abs(x - self_value) < self.STUCK_THRESHOLD:
+                    suggested_point = self_value + self._step * direction
+                else:
+                    suggested_steps_number = abs(x - self_value) / self._step
 
         else:
-            decision = '2 neighbors -> go to middle point'
-            if self._last_checked_direction == DIR_INCREASE and self._right_crit > self_crit:
-                other_value = self._left_value
-                self._last_checked_direction = DIR_DECREASE
-            elif self._last_checked_direction == DIR_DECREASE and self._left_crit > self_crit:
-                other_value = self._right_value
-                self._last_checked_direction = DIR_INCREASE
-            elif self.next_point and self.next_point.is_current:
-                other_value = self.previous_point.parameter_value
-            elif self._right_crit < self._left_crit:
-                other_value = self._right_value
-                self._last_checked_direction = DIR_INCREASE
+            surrogate_point = self._get_surrogate_point()
+            if surrogate_point is not None:
+                decision = '2 neighbors -> go to surrogate minimum'
+                direction = DIR_INCREASE if surrogate_point > self_value else DIR_DECREASE
+                suggested_point = surrogate_point
             else:
-                other_value = self._left_value
-                self._last_checked_direction = DIR_DECREASE
-            suggested_point = (self_value + other_value) / 2
+                decision = '2 neighbors -> go to middle point'
+                if self._last_checked_direction == DIR_INCREASE and self._right_crit > self_crit:
+                    other_value = self._left_value
+                    self._last_checked_direction = DIR_DECREASE
+                elif self._last_checked_direction == DIR_DECREASE and self._left_crit > self_crit:
+                    other_value = self._right_value
+                    self._last_checked_direction = DIR_INCREASE
+                elif self.next_point and self.next_point.is_current:
+                    other_value = self.previous_point.parameter_value
+                elif self._right_crit < self._left_crit:
+                    other_value = self._right_value
+                    self._last_checked_direction = DIR_INCREASE
+                else:
+                    other_value = self._left_value
+                    self._last_checked_direction = DIR_DECREASE
+                suggested_point = (self_value + other_value) / 2
 
         return decision, direction, suggested_point, suggested_steps_number
 
+    def _get_surrogate_point(self) -> typ.Optional[float]:
+        """Return the minimum predicted by the parameter’s surrogate from this point and its closest points
+        in the chain, None if the parameter has no surrogate or no prediction can be made.
+
+        With two neighbors, the prediction is interpolated between them. As this point is the minimum of its chain,
+        it is lower than both and the prediction lies between them. With a single neighbor, the prediction is
+        extrapolated from this point, its neighbor and the next point in the same direction. It is then discarded
+        if it lies on an already found local minimum, or too close to this point.
+        """
+        surrogate = self._param_agent.surrogate
+        if surrogate is None:
+            return None
+        self_value = self.parameter_value
+        probe = self.LOCAL_MIN_THRESHOLD / 2
+
+        if self._left_point is not None and self._right_point is not None:
+            x = surrogate.predict_minimum([(self._left_value, self._left_crit), (self_value, self.criticality),
+                                           (self._right_value, self._right_crit)])
+            if x is None or not self._left_value <= x <= self._right_value:
+                return None
+            if abs(x - self_value) < probe:
+                # The minimum is predicted on this point, probe right next to it to confirm it is a local minimum
+                direction = DIR_INCREASE if x > self_value else DIR_DECREASE
+                gap = self._right_value - self_value if direction == DIR_INCREASE else self_value - self._left_value
+                if gap < self.LOCAL_MIN_THRESHOLD:
+                    direction = -direction
+                x = self_value + probe * direction
+            return x
+
+        neighbor = self._left_point or self._right_point
+        farther = self.chain.neighbors(neighbor)[0 if neighbor is self._left_point else 1]
+        if farther is None:
+            return None
+        x = surrogate.predict_minimum([(p.parameter_value, p.criticality) for p in (farther, neighbor, self)])
+        # Going back to an already found minimum would undo the exploration
+        if x is None or abs(x - self_value) < probe or self._param_agent.get_similar_minima(x):
+            return None
+        max_jump = self.SURROGATE_MAX_JUMP * abs(farther.parameter_value - self_value)
+        self._step = abs(self_value - neighbor.parameter_value)
+        return min(self_value + max_jump, max(self_value - max_jump, x))
+
     def _semi_local_search(self):
         self.best_local_minimum = False
         self_value = self.parameter_value
@@ -562,7 +924,7 @@ class PointAgent(Agent):
         suggested_steps_number = None
         direction = DIR_NONE
 
-        other_extremum = [p for p in self._all_points if p.is_extremum and p is not self][0]
+        other_extremum = [p for p in self.chain if p.is_extremum and p is not self][0]
         other_extremum_value = other_extremum.parameter_value
         other_extremum_crit = other_extremum.criticality
         self_on_bound = self_value in [self._param_agent.inf, self._param_agent.sup]
@@ -619,12 +981,16 @@ class PointAgent(Agent):
         return decision, direction, new_chain_next, suggested_point, suggested_steps_number
 
     def get_minimum(self) -> typ.Optional[PointAgent]:
-        if self.is_local_minimum:
-            return self
-        elif self.previous_point:
-            return self.previous_point.get_minimum()
-        else:
-            return None
+        """Return the closest local minimum among this point and the previous ones in its chain."""
+        point = self
+        while point and not point.is_local_minimum:
+            point = point.previous_point
+        return point
+
+    @property
+    def index(self) -> int:
+        """Creation index of this point within its parameter."""
+        return self._index
 
     @property
     def parameter_name(self) -> str:
@@ -635,12 +1001,16 @@ class PointAgent(Agent):
         return self._param_value
 
     @property
-    def objective_criticalities(self) -> typ.Dict[str, float]:
-        return dict(self._criticalities)
+    def objective_criticalities(self) -> np.ndarray:
+        return self._criticalities
 
     @property
     def criticality(self) -> float:
-        return max(self._criticalities.values())
+        return self._criticality
+
+    @property
+    def step(self) -> float:
+        return self._step
 
     @property
     def is_current(self) -> bool:
@@ -648,18 +1018,7 @@ class PointAgent(Agent):
 
     def _get_all_points_in_chain(self) -> typ.List[PointAgent]:
         """Return all points in this point’s chain, including itself."""
-        points = [self]
-        p = self.previous_point
-        while p:
-            points.insert(0, p)
-            p = p.previous_point
-
-        p = self.next_point
-        while p:
-            points.append(p)
-            p = p.next_point
-
-        return points
+        return list(self.chain) if self.chain else [self]
 
     @staticmethod
     def _get_extrema(*points: PointAgent) -> typ.Tuple[PointAgent, PointAgent]:
@@ -679,7 +1038,7 @@ class PointAgent(Agent):
         )
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Suggestion:
     agent: PointAgent
     next_point: float
@@ -694,7 +1053,7 @@ class Suggestion:
 
 
 class GlobalMinimumFound:
-    pass
+    __slots__ = ()
 
 
 class ObjectiveFunction(abc.ABC):
@@ -0,0 +1,124 @@
+import abc
+import typing as typ
+
+import numpy as np
+
+AGGREGATOR_MAX = 'max'
+AGGREGATOR_WEIGHTED_SUM = 'weighted_sum'
+AGGREGATOR_CHEBYSHEV = 'chebyshev'
+
+
+class Aggregator(abc.ABC):
+    """An aggregator reduces the criticalities of all objectives to a single criticality."""
+
+    @abc.abstractmethod
+    def __call__(self, criticalities: np.ndarray) -> typ.Union[float, np.ndarray]:
+        """Aggregate criticality vectors.
+
+        :param criticalities: A (objectives,) vector or a (vectors, objectives) array of criticalities,
+            columns following the order of objectives.
+        :return: The aggregated criticality of the vector, or an array of those of each vector.
+        """
+        pass
+
+
+class _WeightedAggregator(Aggregator, abc.ABC):
+    def __init__(self, weights: typ.Optional[typ.Sequence[float]], scale: typ.Callable[[np.ndarray], float]):
+        if weights is None:
+            self._weights = None
+        else:
+            weights = np.array(weights, dtype=np.float64)
+            if weights.ndim != 1 or not weights.size or (weights < 0).any() or not weights.any():
+                raise ValueError('weights should be a non-empty vector of positive values, not all null')
+            self._weights = weights / scale(weights)
+            self._weights.flags.writeable = False
+
+    @property
+    def weights(self) -> typ.Optional[np.ndarray]:
+        """The normalized weight of each objective, None if all objectives weigh the same."""
+        return self._weights
+
+    def _weigh(self, criticalities: np.ndarray) -> np.ndarray:
+        if self._weights is None:
+            return criticalities
+        return criticalities * self._weights
+
+
+class MaxAggregator(Aggregator):
+    def __init__(self):
+        """An aggregator that returns the highest criticality."""
+
+    def __call__(self, criticalities):
+        if criticalities.ndim == 1:
+            return float(criticalities.max())
+        return criticalities.max(axis=-1)
+
+
+class WeightedSumAggregator(_WeightedAggregator):
+    def __init__(self, weights: typ.Sequence[float] = None):
+        """An aggregator that returns the weighted mean of criticalities.
+
+        :param weights: The weight of each objective, scaled so that they sum to 1. All objectives weigh the same
+            if None.
+        :raise ValueError: If a weight is negative or all are null.
+        """
+        super().__init__(weights, np.sum)
+
+    def __call__(self, criticalities):
+        if self._weights is None:
+            aggregated = criticalities.mean(axis=-1)
+        else:
+            aggregated = criticalities @ self._weights
+        return float(aggregated) if criticalities.ndim == 1 else aggregated
+
+
+class ChebyshevAggregator(_WeightedAggregator):
+    def __init__(self, weights: typ.Sequence[float] = None, *, rho: float = 0):
+        """An aggregator that returns the highest weighted criticality, i.e. the weighted Chebyshev distance
+        to the ideal point where all criticalities are null.
+        An augmentation term proportional to the sum of weighted criticalities may be added to break ties.
+
+        :param weights: The weight of each objective, scaled so that the highest is 1. All objectives weigh the same
+            if None, the aggregator is then equivalent to MaxAggregator if rho is 0.
+        :param rho: The factor of the augmentation term.
+        :raise ValueError: If a weight or rho is negative or all weights are null.
+        """
+        super().__init__(weights, np.max)
+        if rho < 0:
+            raise ValueError('rho should be positive')
+        self._rho = rho
+
+    def __call__(self, criticalities):
+        weighted = self._weigh(criticalities)
+        aggregated = weighted.max(axis=-1)
+        if self._rho:
+            aggregated = aggregated + self._rho * weighted.sum(axis=-1)
+        return float(aggregated) if criticalities.ndim == 1 else aggregated
+
+
+def get_aggregator(name: str, weights: typ.Sequence[float] = None) -> Aggregator:
+    """Return a new aggregator of the given type.
+
+    :param name: The name of the aggregator, one of the AGGREGATOR_* constants.
+    :param weights: The weight of each objective, ignored by the max aggregator.
+    :raise ValueError: If the name is unknown.
+    """
+    if name == AGGREGATOR_MAX:
+        return MaxAggregator()
+    if name == AGGREGATOR_WEIGHTED_SUM:
+        return WeightedSumAggregator(weights)
+    if name == AGGREGATOR_CHEBYSHEV:
+        return ChebyshevAggregator(weights)
+    raise ValueError(f'unknown aggregator "{name}"')
+
+
+__all__ = [
+    'AGGREGATOR_MAX',
+    'AGGREGATOR_WEIGHTED_SUM',
+    'AGGREGATOR_CHEBYSHEV',
+    'Aggregator',
+    'MaxAggregator',
+    'WeightedSumAggregator',
+    'ChebyshevAggregator',
+    'get_aggregator',
+]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import typing as typ
+
+from . import _points_index, _step_controllers
+
+if typ.TYPE_CHECKING:
+    from ._agents import PointAgent
+
+
+class Chain:
+    def __init__(self, points: typ.Iterable[PointAgent] = (), *, step_state: _step_controllers.StepState = None):
+        """A chain of points owned by a parameter agent.
+
+        Points are kept in the order they were appended and indexed by parameter value.
+        The point of minimum criticality and the extrema used when climbing up a slope are maintained
+        incrementally as points are appended, so that points can query them without walking the chain.
+
+        :param points: The initial points of the chain, in order.
+        :param step_state: The state of the step controller of the parameter for this chain.
+        """
+        self.step_state = step_state
+        # Set by the parameter agent once this chain has been compacted, it is then never continued
+        self.compacted = False
+        self._points: typ.List[PointAgent] = []
+        self._sorted_points = _points_index.PointsIndex()
+        self._minimum: typ.Optional[PointAgent] = None
+        self._extremum_min: typ.Optional[PointAgent] = None
+        self._extremum_max: typ.Optional[PointAgent] = None
+        # Flags to set on points the next time extrema are updated
+        self._pending_extrema: typ.Dict[PointAgent, bool] = {}
+        for point in points:
+            self.append(point)
+
+    @property
+    def points(self) -> typ.Sequence[PointAgent]:
+        """Points of this chain, in order. The returned list must not be modified."""
+        return self._points
+
+    @property
+    def sorted_points(self) -> typ.Sequence[PointAgent]:
+        """Points of this chain sorted by parameter value, points with the same value following the chain’s order.
+        The returned list must not be modified."""
+        return self._sorted_points.points
+
+    @property
+    def first(self) -> PointAgent:
+        return self._points[0]
+
+    @property
+    def last(self) -> PointAgent:
+        return self._points[-1]
+
+    @property
+    def minimum(self) -> typ.Optional[PointAgent]:
+        """The first point of this chain with the lowest criticality."""
+        return self._minimum
+
+    def append(self, point: PointAgent):
+        """Append a point at the end of this chain and link it to the previous last point."""
+        last = self._points[-1] if self._points else None
+        if last:
+            last.next_point = point
+        point.previous_point = last
+        point.next_point = None
+        point.chain = self
+        self._index(point)
+
+    def pop(self) -> PointAgent:
+        """Remove the last point of this chain and unlink it.
+
+        :return: The removed point.
+        """
+        point = self._points.pop()
+        if self._points:
+            self._points[-1].next_point = None
+        point.previous_point = None
+        point.chain = None
+        self._reindex()
+        return point
+
+    def retain(self, predicate: typ.Callable[[PointAgent], bool]) -> typ.List[PointAgent]:
+        """Only keep the points that match the given predicate and link them back together.
+
+        :param predicate: A function that tells whether to keep a point.
+        :return: The removed points, unlinked.
+        """
+        kept = []
+        removed = []
+        for point in self._points:
+            if predicate(point):
+                point.previous_point = kept[-1] if kept else None
+                if kept:
+                    kept[-1].next_point = point
+                kept.append(point)
+            else:
+                point.previous_point = None
+                point.next_point = None
+                point.chain = None
+                removed.append(point)
+        if kept:
+            kept[-1].next_point = None
+        self._points = kept
+        self._reindex()
+        return removed
+
+    def neighbors(self, point: PointAgent) -> typ.Tuple[typ.Optional[PointAgent], typ.Optional[PointAgent]]:
+        """Return the closest points with a different value on each side of the given point of this chain.
+        Among points with the same value, the first one in the chain’s order is returned."""
+        return self._sorted_points.neighbors(point)
+
+    def update_extrema(self):
+        """Flag the points of this chain with the lowest and highest parameter values as extrema.
+
+        The lowest and highest values are searched for in the chain’s order, a point that is not a new lowest
+        value being compared to the highest one only. Points that lost their status since the last update
+        are unflagged, other points are left untouched.
+        """
+        for point, is_extremum in self._pending_extrema.items():
+            point.is_extremum = is_extremum
+        self._pending_extrema.clear()
+
+    def _index(self, point: PointAgent):
+        self._points.append(point)
+        value = point.parameter_value
+        self._sorted_points.add(point)
+        if self._minimum is None or point.criticality < self._minimum.criticality:
+            self._minimum = point
+
+        if self._extremum_min is None or value < self._extremum_min.parameter_value:
+            if self._extremum_min is not None:
+                self._pending_extrema[self._extremum_min] = False
+            self._pending_extrema[point] = True
+            self._extremum_min = point
+        elif self._extremum_max is None or value > self._extremum_max.parameter_value:
+            if self._extremum_max is not None:
+                self._pending_extrema[self._extremum_max] = False
+            self._pending_extrema[point] = True
+            self._extremum_max = point
+
+    def _reindex(self):
+        points = self._points
+        self._points = []
+        self._sorted_points.clear()
+        self._minimum = None
+        self._extremum_min = None
+        self._extremum_max = None
+        self._pending_extrema = {}
+        for point in points:
+            self._index(point)
+
+    def __contains__(self, point: PointAgent) -> bool:
+        return point.chain is self
+
+    def __iter__(self) -> typ.Iterator[PointAgent]:
+        return iter(self._points)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+
+__all__ = [
+    'Chain',
+]
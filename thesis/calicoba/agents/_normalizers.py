@@ -1,4 +1,8 @@
 import abc
+import collections
+import typing as typ
+
+import numpy as np
 
 
 class Normalizer(abc.ABC):
@@ -23,30 +27,115 @@ class AllTimeAbsoluteNormalizer(Normalizer):
 class SlidingNormalizer(Normalizer):
     def __init__(self, window_size: int):
         """A normalizer that uses the maximum and minimum of the last n values.
+        Values are normalized to 0 while the window is constant.
 
         :param window_size: The number of values to keep in memory.
+        :raise ValueError: If the window size is not positive.
         """
+        if window_size < 1:
+            raise ValueError('window_size should be ≥ 1')
         self.__window_size = window_size
-        self.__previous_values = []
+        # Last values, the value with index i being stored in cell i % window_size
+        self.__values = np.zeros(window_size)
+        # Total number of values passed so far
+        self.__count = 0
+        # (index, value) pairs of the values that may still become the maximum/minimum of the window,
+        # values being strictly decreasing/increasing from the front, the front being the current maximum/minimum
+        self.__maxima = collections.deque()
+        self.__minima = collections.deque()
+
+    @property
+    def window_size(self) -> int:
+        return self.__window_size
 
     def __call__(self, value):
-        self.__previous_values.append(value)
-        if len(self.__previous_values) > self.__window_size:
-            self.__previous_values.pop(0)
-        maxi = max(self.__previous_values)
-        mini = min(self.__previous_values)
-        return (value - mini) / (maxi - mini)
+        index = self.__count
+        self.__count += 1
+        self.__values[index % self.__window_size] = value
+        oldest_index = index - self.__window_size + 1
+        maxima = self.__maxima
+        while maxima and maxima[-1][1] <= value:
+            maxima.pop()
+        maxima.append((index, value))
+        if maxima[0][0] < oldest_index:
+            maxima.popleft()
+        minima = self.__minima
+        while minima and minima[-1][1] >= value:
+            minima.pop()
+        minima.append((index, value))
+        if minima[0][0] < oldest_index:
+            minima.popleft()
+        maxi = maxima[0][1]
+        mini = minima[0][1]
+        return 0 if maxi == mini else (value - mini) / (maxi - mini)
+
+    def normalize_many(self, values: np.ndarray) -> np.ndarray:
+        """Normalize a sequence of values, the result being the same as passing them one by one to this normalizer.
+
+        :param values: A 1-D array of values, in the order they were received.
+        :return: The array of the normalized values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 1:
+            raise ValueError('values should be a 1-D array')
+        size = self.__window_size
+        if values.size < size:
+            # Not worth rebuilding the deques
+            return np.array([self(value) for value in values.tolist()], dtype=np.float64)
+
+        start = self.__count
+        previous = self.__last_values(min(start, size - 1))
+        all_values = np.concatenate((previous, values))
+        maxi = _sliding_max(all_values, size)[previous.size:]
+        mini = -_sliding_max(-all_values, size)[previous.size:]
+        span = maxi - mini
+        normalized = np.zeros_like(values)
+        np.divide(values - mini, span, out=normalized, where=span != 0)
+
+        self.__count += values.size
+        window = values[-size:]
+        indices = np.arange(self.__count - size, self.__count)
+        self.__values[indices % size] = window
+        # A value stays in the deques as long as no later value of the window is greater/lower or equal
+        later_max = np.append(np.maximum.accumulate(window[::-1])[::-1][1:], -np.inf)
+        later_min = np.append(np.minimum.accumulate(window[::-1])[::-1][1:], np.inf)
+        kept_max = window > later_max
+        kept_min = window < later_min
+        self.__maxima = collections.deque(zip(indices[kept_max].tolist(), window[kept_max].tolist()))
+        self.__minima = collections.deque(zip(indices[kept_min].tolist(), window[kept_min].tolist()))
+        return normalized
+
+    def __last_values(self, number: int) -> np.ndarray:
+        indices = np.arange(self.__count - number, self.__count) % self.__window_size
+        return self.__values[indices]
+
+
+def _sliding_max(values: np.ndarray, window_size: int) -> np.ndarray:
+    """Compute the maximum of each window of the given size ending at each value,
+    windows being truncated at the start of the array (van Herk/Gil-Werman algorithm).
+
+    :return: An array whose value i is the maximum of values[max(0, i - window_size + 1):i + 1].
+    """
+    size = values.size
+    padded_size = -(-(size + window_size - 1) // window_size) * window_size
+    padded = np.full(padded_size, -np.inf)
+    padded[window_size - 1:window_size - 1 + size] = values
+    blocks = padded.reshape(-1, window_size)
+    prefix_max = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix_max = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.maximum(suffix_max[:size], prefix_max[window_size - 1:window_size - 1 + size])
 
 
 class BoundNormalizer(Normalizer):
-    def __init__(self, inf: float, sup: float):
+    def __init__(self, inf: typ.Union[float, np.ndarray], sup: typ.Union[float, np.ndarray]):
         """A normalizer that uses the given lower and upper bounds.
+        Bounds may be arrays to normalize arrays of values whose last axis follows them in a single call.
 
         :param inf: The lower bound.
         :param sup: The upper bound.
         """
         self.__inf = inf
-        self.__sup = sup
+        self.__range = abs(sup - inf)
 
     def __call__(self, value):
-        return abs(value - self.__inf) / abs(self.__sup - self.__inf)
+        return abs(value - self.__inf) / self.__range
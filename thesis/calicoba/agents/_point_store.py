@@ -0,0 +1,144 @@
+import typing as typ
+
+import numpy as np
+
+FLAG_LOCAL_MINIMUM = 1
+FLAG_GLOBAL_MINIMUM = 1 << 1
+FLAG_EVICTED = 1 << 2
+
+_NONE = -1
+_COLUMNS = ('values', 'criticalities', 'chains', 'previous', 'next', 'flags')
+
+
+class PointStore:
+    def __init__(self, capacity: int = 1024):
+        """A compact record of all points created by a parameter agent, stored as NumPy columns.
+
+        Row i holds the point whose index is i. Points evicted from their chain stay in the store,
+        flagged as such, so that the whole history of a parameter only costs a few dozen bytes per point.
+        Links point to the previous and next rows in the same chain, -1 meaning none.
+
+        :param capacity: The initial number of rows to allocate, the store grows as needed.
+        """
+        capacity = max(1, capacity)
+        self._size = 0
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._criticalities = np.empty(capacity, dtype=np.float64)
+        self._chains = np.empty(capacity, dtype=np.int32)
+        self._previous = np.empty(capacity, dtype=np.int64)
+        self._next = np.empty(capacity, dtype=np.int64)
+        self._flags = np.empty(capacity, dtype=np.uint8)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._view(self._values)
+
+    @property
+    def criticalities(self) -> np.ndarray:
+        return self._view(self._criticalities)
+
+    @property
+    def chains(self) -> np.ndarray:
+        """Index of the chain of each point in its parameter’s chains."""
+        return self._view(self._chains)
+
+    @property
+    def previous(self) -> np.ndarray:
+        return self._view(self._previous)
+
+    @property
+    def next(self) -> np.ndarray:
+        return self._view(self._next)
+
+    @property
+    def flags(self) -> np.ndarray:
+        return self._view(self._flags)
+
+    def add(self, value: float, criticality: float, chain: int, previous: int = _NONE) -> int:
+        """Add a point at the end of a chain.
+
+        :param value: The point’s parameter value.
+        :param criticality: The point’s criticality.
+        :param chain: The index of the point’s chain.
+        :param previous: The row of the previous point in the chain, -1 if none.
+        :return: The row of the new point.
+        """
+        if self._size == len(self._values):
+            self._grow()
+        row = self._size
+        self._values[row] = value
+        self._criticalities[row] = criticality
+        self._chains[row] = chain
+        self._previous[row] = previous
+        self._next[row] = _NONE
+        self._flags[row] = 0
+        if previous != _NONE:
+            self._next[previous] = row
+        self._size += 1
+        return row
+
+    def move_to_chain(self, row: int, chain: int):
+        """Detach a point from its chain and make it the head of another chain."""
+        previous = self._previous[row]
+        if previous != _NONE:
+            self._next[previous] = _NONE
+        self._previous[row] = _NONE
+        self._chains[row] = chain
+
+    def set_flags(self, row: int, flags: int):
+        """Set the given flag bits on a point, other bits are left untouched."""
+        self._flags[row] |= flags
+
+    def get_chain_rows(self, chain: int, start: int = 0, stop: int = None) -> np.ndarray:
+        """Return the rows of the points of a chain that have not been evicted, in chain order.
+
+        :param chain: The index of the chain.
+        :param start: The first row to look at.
+        :param stop: The row after the last one to look at, defaults to the end of the store.
+        """
+        stop = self._size if stop is None else min(stop, self._size)
+        mask = (self._chains[start:stop] == chain) & (self._flags[start:stop] & FLAG_EVICTED == 0)
+        return np.flatnonzero(mask) + start
+
+    def to_columns(self) -> typ.Dict[str, np.ndarray]:
+        """Return a copy of all columns, keyed by name."""
+        return {name: getattr(self, name).copy() for name in _COLUMNS}
+
+    @classmethod
+    def from_columns(cls, columns: typ.Dict[str, np.ndarray]) -> 'PointStore':
+        """Create a store from columns returned by to_columns()."""
+        size = len(columns['values'])
+        store = cls(capacity=size)
+        for name in _COLUMNS:
+            getattr(store, '_' + name)[:size] = columns[name]
+        store._size = size
+        return store
+
+    def _view(self, column: np.ndarray) -> np.ndarray:
+        view = column[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def _grow(self):
+        capacity = 2 * len(self._values)
+        for name in _COLUMNS:
+            column = getattr(self, '_' + name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, '_' + name, grown)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the rows of this store."""
+        return sum(getattr(self, name).nbytes for name in _COLUMNS)
+
+
+__all__ = [
+    'FLAG_LOCAL_MINIMUM',
+    'FLAG_GLOBAL_MINIMUM',
+    'FLAG_EVICTED',
+    'PointStore',
+]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import bisect
+import typing as typ
+
+if typ.TYPE_CHECKING:
+    from ._agents import PointAgent
+
+
+class PointsIndex:
+    def __init__(self, points: typ.Iterable[PointAgent] = (), threshold: float = 0):
+        """A set of points sorted by parameter value, points with the same value being kept in insertion order.
+
+        Neighbor queries treat points whose values are within the threshold of each other as duplicates.
+        Walking the sorted points, a point is a duplicate if its value is within the threshold of the last point
+        that was not a duplicate. The queried point is never a duplicate: it replaces the point before it
+        if they are within the threshold.
+
+        :param points: The initial points.
+        :param threshold: The maximum difference between the values of two duplicate points.
+        """
+        self._threshold = threshold
+        self._points: typ.List[PointAgent] = []
+        self._values: typ.List[float] = []
+        self._insertion_orders: typ.Dict[PointAgent, int] = {}
+        self._next_insertion_order = 0
+        # Index of the last non-duplicate point before each position, -1 if none, None when outdated
+        self._last_kept_before: typ.Optional[typ.List[int]] = None
+        for point in points:
+            self.add(point)
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @property
+    def points(self) -> typ.Sequence[PointAgent]:
+        """The points sorted by value. The returned list must not be modified."""
+        return self._points
+
+    def add(self, point: PointAgent):
+        """Add a point after all points with the same value."""
+        value = point.parameter_value
+        i = bisect.bisect_right(self._values, value)
+        self._values.insert(i, value)
+        self._points.insert(i, point)
+        self._insertion_orders[point] = self._next_insertion_order
+        self._next_insertion_order += 1
+        self._last_kept_before = None
+
+    def remove(self, point: PointAgent):
+        """Remove a point.
+
+        :raise ValueError: If the point is not in this index.
+        """
+        i = self._position(point)
+        del self._values[i]
+        del self._points[i]
+        del self._insertion_orders[point]
+        self._last_kept_before = None
+
+    def clear(self):
+        self._points.clear()
+        self._values.clear()
+        self._insertion_orders.clear()
+        self._last_kept_before = None
+
+    def neighbors(self, point: PointAgent) -> typ.Tuple[typ.Optional[PointAgent], typ.Optional[PointAgent]]:
+        """Return the closest non-duplicate points on each side of the given one.
+
+        :param point: A point of this index.
+        :return: The left and right neighbors, None if there is none on a side.
+        :raise ValueError: If the point is not in this index.
+        """
+        k = self._position(point)
+        value = self._values[k]
+        threshold = self._threshold
+        last_kept_before = self._get_last_kept_before()
+
+        left = last_kept_before[k]
+        if left != -1 and abs(self._values[left] - value) <= threshold:
+            left = last_kept_before[left]
+
+        # The first point after the given one that is not its duplicate, differences increase with values
+        lo, hi = k + 1, len(self._values)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._values[mid] - value > threshold:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        return (self._points[left] if left != -1 else None,
+                self._points[lo] if lo < len(self._points) else None)
+
+    def get_in_range(self, value: float, radius: float) -> typ.List[PointAgent]:
+        """Return the points whose value is within the given radius of the given value, in insertion order."""
+        lo, hi = self._range(value, radius)
+        return sorted(self._points[lo:hi], key=self._insertion_orders.__getitem__)
+
+    def has_outside_range(self, value: float, radius: float) -> bool:
+        """Tell whether any point is farther than the given radius from the given value."""
+        # Distances only increase towards both ends
+        return bool(self._values) and (abs(self._values[0] - value) > radius or abs(self._values[-1] - value) > radius)
+
+    def is_closest(self, point: PointAgent, value: float, radius: float) -> bool:
+        """Tell whether the given point is the closest to the given value among itself and the points farther than
+        the given radius from it, ties going to the first inserted point.
+
+        :param point: A point of this index.
+        :param value: The value to compare distances to.
+        :param radius: Points within this radius of the given point are ignored.
+        :raise KeyError: If the point is not in this index.
+        """
+        order = self._insertion_orders[point]
+        point_value = point.parameter_value
+        distance = abs(point_value - value)
+        lo, hi = self._range(value, distance)
+        for i in range(lo, hi):
+            other = self._points[i]
+            if other is point or abs(self._values[i] - point_value) <= radius:
+                continue
+            if abs(self._values[i] - value) < distance or self._insertion_orders[other] < order:
+                return False
+        return True
+
+    def _range(self, value: float, radius: float) -> typ.Tuple[int, int]:
+        """Return the bounds of the slice of points whose value is within the given radius of the given value."""
+        values = self._values
+        lo, hi = 0, len(values)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if values[mid] >= value or abs(values[mid] - value) <= radius:
+                hi = mid
+            else:
+                lo = mid + 1
+        start = lo
+        hi = len(values)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if values[mid] > value and abs(values[mid] - value) > radius:
+                hi = mid
+            else:
+                lo = mid + 1
+        return start, lo
+
+    def _position(self, point: PointAgent) -> int:
+        value = point.parameter_value
+        for i in range(bisect.bisect_left(self._values, value), bisect.bisect_right(self._values, value)):
+            if self._points[i] is point:
+                return i
+        raise ValueError(f'{point} is not in index')
+
+    def _get_last_kept_before(self) -> typ.List[int]:
+        if self._last_kept_before is None:
+            values = self._values
+            threshold = self._threshold
+            last_kept_before = [-1] * len(values)
+            last = -1
+            for i, value in enumerate(values):
+                last_kept_before[i] = last
+                if last == -1 or value - values[last] > threshold:
+                    last = i
+            self._last_kept_before = last_kept_before
+        return self._last_kept_before
+
+    def __contains__(self, point: PointAgent) -> bool:
+        try:
+            self._position(point)
+        except ValueError:
+            return False
+        return True
+
+    def __iter__(self) -> typ.Iterator[PointAgent]:
+        return iter(self._points)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+
+__all__ = [
+    'PointsIndex',
+]
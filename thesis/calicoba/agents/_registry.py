@@ -0,0 +1,67 @@
+import typing as typ
+
+from . import _agents
+
+_T = typ.TypeVar('_T', bound=_agents.Agent)
+
+
+class AgentsRegistry:
+    def __init__(self):
+        """A registry of agents that keeps one bucket per concrete agent type.
+
+        Buckets are insertion-ordered dicts keyed by the agents themselves (hashed by identity),
+        so that adding, removing and testing membership are all O(1) while iteration order
+        stays the same as the order in which agents were added.
+        """
+        self.__agents: typ.Dict[_agents.Agent, None] = {}
+        self.__buckets: typ.Dict[type, typ.Dict[_agents.Agent, None]] = {}
+        self.__types_cache: typ.Dict[type, typ.Tuple[type, ...]] = {}
+
+    def add(self, agent: _agents.Agent):
+        """Add an agent to this registry. Does nothing if the agent is already registered."""
+        if agent in self.__agents:
+            return
+        self.__agents[agent] = None
+        type_ = type(agent)
+        if type_ not in self.__buckets:
+            self.__buckets[type_] = {}
+            self.__types_cache.clear()
+        self.__buckets[type_][agent] = None
+
+    def remove(self, agent: _agents.Agent):
+        """Remove an agent from this registry.
+
+        :raise KeyError: If the agent is not in this registry.
+        """
+        del self.__agents[agent]
+        del self.__buckets[type(agent)][agent]
+
+    def get_for_type(self, type_: typ.Type[_T]) -> typ.List[_T]:
+        """Return all agents that are instances of the given type, in insertion order."""
+        if type_ not in self.__types_cache:
+            self.__types_cache[type_] = tuple(t for t in self.__buckets if issubclass(t, type_))
+        types = self.__types_cache[type_]
+        if not types:
+            return []
+        if len(types) == 1:
+            return list(self.__buckets[types[0]])
+        # Several buckets match, fall back to the global ordering to keep the insertion order across types
+        return [agent for agent in self.__agents if isinstance(agent, type_)]
+
+    def count_for_type(self, type_: typ.Type[_agents.Agent]) -> int:
+        """Return the number of agents that are instances of the given type."""
+        return sum(len(bucket) for t, bucket in self.__buckets.items() if issubclass(t, type_))
+
+    def __contains__(self, agent: _agents.Agent) -> bool:
+        return agent in self.__agents
+
+    def __iter__(self) -> typ.Iterator[_agents.Agent]:
+        return iter(self.__agents)
+
+    def __len__(self) -> int:
+        return len(self.__agents)
+
+
+__all__ = [
+    'AgentsRegistry',
+]
@@ -0,0 +1,143 @@
+import abc
+import dataclasses
+
+STEP_CONTROLLER_FIXED = 'fixed'
+STEP_CONTROLLER_ADAPTIVE = 'adaptive'
+
+
+@dataclasses.dataclass(slots=True)
+class StepState:
+    """Step state of a chain."""
+    # Maximum number of steps a point of the chain may jump at once
+    max_steps_number: float
+    # Number of consecutive improvements since the maximum number of steps last changed
+    improvements_number: int = 0
+
+
+class StepController(abc.ABC):
+    def __init__(self, inf: float, sup: float):
+        """A step controller sets the initial step of new points and limits the length of the jumps
+        of the points of each chain.
+
+        :param inf: Lower bound of the parameter’s domain.
+        :param sup: Upper bound of the parameter’s domain.
+        """
+        self._init_step = (sup - inf) / 100
+
+    @property
+    def init_step(self) -> float:
+        """The initial step of the first point of new chains."""
+        return self._init_step
+
+    def get_step(self, state: StepState) -> float:
+        """Return the initial step of new points of a chain.
+
+        :param state: The step state of the chain.
+        """
+        return self._init_step
+
+    @abc.abstractmethod
+    def new_state(self) -> StepState:
+        """Return the step state of a new chain."""
+        pass
+
+    @abc.abstractmethod
+    def update(self, state: StepState, previous_criticality: float, criticality: float):
+        """Update the step state of a chain after a point has been appended to it.
+
+        :param state: The state to update.
+        :param previous_criticality: Criticality of the previous last point of the chain.
+        :param criticality: Criticality of the new point.
+        """
+        pass
+
+
+class FixedStepController(StepController):
+    MAX_STEPS_NUMBER = 2
+
+    def __init__(self, inf: float, sup: float):
+        """A step controller that always allows the same maximum number of steps."""
+        super().__init__(inf, sup)
+
+    def new_state(self):
+        return StepState(max_steps_number=self.MAX_STEPS_NUMBER)
+
+    def update(self, state, previous_criticality, criticality):
+        pass
+
+
+class AdaptiveStepController(StepController):
+    def __init__(self, inf: float, sup: float, *, growth: float = 1.5, shrink: float = 0.5, patience: int = 3,
+                 min_steps_number: float = 2, max_steps_number: float = 8):
+        """A step controller that multiplies the maximum number of steps of a chain by the growth factor
+        after a number of consecutive decreases of the criticality and by the shrink factor
+        as soon as the criticality increases, i.e. when the last jump went past a minimum.
+        An unchanged criticality only resets the count of decreases. Chains start with the same limit
+        as FixedStepController. The initial step of new points of a chain is scaled along with its limit.
+
+        :param growth: Factor applied after enough consecutive decreases.
+        :param shrink: Factor applied after an overshoot.
+        :param patience: Number of consecutive decreases before the limit grows.
+        :param min_steps_number: Lower bound of the limit.
+        :param max_steps_number: Upper bound of the limit.
+        :raise ValueError: If a factor or bound is inconsistent.
+        """
+        super().__init__(inf, sup)
+        if growth < 1 or not 0 < shrink <= 1:
+            raise ValueError('growth should be ≥ 1 and shrink in ]0, 1]')
+        if patience < 1:
+            raise ValueError('patience should be ≥ 1')
+        if not 0 < min_steps_number <= FixedStepController.MAX_STEPS_NUMBER <= max_steps_number:
+            raise ValueError(f'steps number bounds should surround {FixedStepController.MAX_STEPS_NUMBER}')
+        self._growth = growth
+        self._shrink = shrink
+        self._patience = patience
+        self._min_steps_number = min_steps_number
+        self._max_steps_number = max_steps_number
+
+    def new_state(self):
+        return StepState(max_steps_number=FixedStepController.MAX_STEPS_NUMBER)
+
+    def get_step(self, state):
+        return self._init_step * state.max_steps_number / FixedStepController.MAX_STEPS_NUMBER
+
+    def update(self, state, previous_criticality, criticality):
+        if criticality < previous_criticality:
+            state.improvements_number += 1
+            if state.improvements_number >= self._patience:
+                state.max_steps_number = min(self._max_steps_number, state.max_steps_number * self._growth)
+                state.improvements_number = 0
+        elif criticality > previous_criticality:
+            state.max_steps_number = max(self._min_steps_number, state.max_steps_number * self._shrink)
+            state.improvements_number = 0
+        else:
+            state.improvements_number = 0
+
+
+def get_step_controller(name: str, inf: float, sup: float, **options) -> StepController:
+    """Return a new step controller of the given type.
+
+    :param name: The name of the controller, one of the STEP_CONTROLLER_* constants.
+    :param inf: Lower bound of the parameter’s domain.
+    :param sup: Upper bound of the parameter’s domain.
+    :param options: Keyword arguments of the adaptive controller, ignored by the fixed one.
+    :raise ValueError: If the name is unknown or an option is inconsistent.
+    """
+    controllers = {
+        STEP_CONTROLLER_FIXED: lambda: FixedStepController(inf, sup),
+        STEP_CONTROLLER_ADAPTIVE: lambda: AdaptiveStepController(inf, sup, **options),
+    }
+    if name not in controllers:
+        raise ValueError(f'unknown step controller "{name}"')
+    return controllers[name]()
+
+
+__all__ = [
+    'STEP_CONTROLLER_FIXED',
+    'STEP_CONTROLLER_ADAPTIVE',
+    'StepState',
+    'StepController',
+    'FixedStepController',
+    'AdaptiveStepController',
+    'get_step_controller',
+]
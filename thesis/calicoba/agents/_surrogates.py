@@ -0,0 +1,69 @@
+import abc
+import typing as typ
+
+import numpy as np
+
+SURROGATE_QUADRATIC = 'quadratic'
+
+
+class Surrogate(abc.ABC):
+    """A surrogate is a cheap local model of the criticality that predicts where its minimum is."""
+
+    @abc.abstractmethod
+    def predict_minimum(self, points: typ.Sequence[typ.Tuple[float, float]]) -> typ.Optional[float]:
+        """Predict the parameter value of the minimum of the criticality around the given points.
+
+        :param points: (parameter value, criticality) pairs.
+        :return: The predicted value, None if no minimum can be predicted from these points.
+        """
+        pass
+
+
+class QuadraticSurrogate(Surrogate):
+    def __init__(self):
+        """A surrogate that fits a parabola through the given points and predicts its vertex.
+        Three points are interpolated exactly, more points are fitted by least squares.
+        No prediction is made if the parabola is not convex."""
+
+    def predict_minimum(self, points):
+        if len(points) < 3:
+            return None
+        if len(points) == 3:
+            (x1, y1), (x2, y2), (x3, y3) = points
+            if x1 == x2 or x2 == x3 or x1 == x3:
+                return None
+            # Newton’s divided differences
+            d12 = (y2 - y1) / (x2 - x1)
+            d23 = (y3 - y2) / (x3 - x2)
+            a = (d23 - d12) / (x3 - x1)
+            b = d12 - a * (x1 + x2)
+        else:
+            xs, ys = np.array(points, dtype=np.float64).T
+            if np.ptp(xs) == 0:
+                return None
+            a, b, _ = np.polyfit(xs, ys, 2)
+        if not a > 0:
+            return None
+        return float(-b / (2 * a))
+
+
+def get_surrogate(name: str) -> Surrogate:
+    """Return a new surrogate of the given type.
+
+    :param name: The name of the surrogate, one of the SURROGATE_* constants.
+    :raise ValueError: If the name is unknown.
+    """
+    surrogates = {
+        SURROGATE_QUADRATIC: QuadraticSurrogate,
+    }
+    if name not in surrogates:
+        raise ValueError(f'unknown surrogate "{name}"')
+    return surrogates[name]()
+
+
+__all__ = [
+    'SURROGATE_QUADRATIC',
+    'Surrogate',
+    'QuadraticSurrogate',
+    'get_surrogate',
+]
@@ -1,4 +1,15 @@
+from __future__ import annotations
+
 import abc
+import dataclasses
+import multiprocessing
+import multiprocessing.context
+import multiprocessing.synchronize
+import time
+import typing as typ
+from multiprocessing import shared_memory
+
+import numpy as np
 
 
 class DataOutput(abc.ABC):
@@ -28,3 +39,249 @@ class DataInput(DataOutput, abc.ABC):
     @abc.abstractmethod
     def set_data(self, value: float):
         pass
+
+
+@dataclasses.dataclass(frozen=True)
+class BridgeHandle:
+    """What a simulator’s process needs to attach to a shared memory bridge. It may only be passed to processes
+    started through multiprocessing, e.g. as an argument of multiprocessing.Process, as semaphores are."""
+    name: str
+    requests: multiprocessing.synchronize.Semaphore
+    responses: multiprocessing.synchronize.Semaphore
+
+
+class SharedMemoryBridge:
+    # Header cells, each an int64
+    _REQUEST = 0
+    _RESPONSE = 1
+    _STOPPED = 2
+    _INPUTS_NUMBER = 3
+    _OUTPUTS_NUMBER = 4
+    _HEADER_SIZE = 5
+    # Values of the stop cell
+    _STOP_REQUESTED = 1
+    _SIMULATOR_STOPPED = 2
+
+    def __init__(self, memory: shared_memory.SharedMemory, handle: BridgeHandle,
+                 context: typ.Optional[multiprocessing.context.BaseContext], owner: bool):
+        """A block of shared memory through which an optimizer and a simulator running in another process exchange
+        all parameter values and all outputs once per cycle, as arrays that are views on the shared memory.
+        Use create() or attach() to get instances.
+
+        The block starts with a header of int64 values: the sequence numbers of the last request and of the last
+        response, a stop cell, then the numbers of inputs and outputs. It is followed by the float64 values
+        of the inputs then those of the outputs. To run a cycle, the optimizer writes the inputs, increments
+        the request sequence number, then releases the requests semaphore. The simulator acquires it, reads
+        the inputs, writes the outputs, sets the response sequence number to the request’s, then releases
+        the responses semaphore. The optimizer acquires it before reading the outputs. Releasing and acquiring
+        a semaphore synchronize memory, so values written before a release are seen after the matching acquire
+        whatever the platform’s memory ordering. To stop the simulator, the optimizer sets the stop cell to 1
+        and releases the requests semaphore. The simulator serves the pending request if any, then sets the cell
+        to 2 and releases the responses semaphore before stopping, so that no request waits for it in vain.
+
+        :param memory: The shared memory block.
+        :param handle: The name of the block and the semaphores of the bridge.
+        :param context: The context of the semaphores, None on the simulator side.
+        :param owner: Whether this bridge created the block and unlinks it when closed.
+        """
+        self._memory = memory
+        self._handle = handle
+        self._context = context
+        self._owner = owner
+        self._header = np.ndarray((self._HEADER_SIZE,), dtype=np.int64, buffer=memory.buf)
+        inputs_number = int(self._header[self._INPUTS_NUMBER])
+        outputs_number = int(self._header[self._OUTPUTS_NUMBER])
+        values = np.ndarray((inputs_number + outputs_number,), dtype=np.float64, buffer=memory.buf,
+                            offset=self._header.nbytes)
+        self._inputs = values[:inputs_number]
+        self._outputs = values[inputs_number:]
+        # Sequence number of the last request served by the simulator side
+        self._served_request = int(self._header[self._RESPONSE])
+
+    @classmethod
+    def create(cls, inputs_number: int, outputs_number: int, name: str = None,
+               context: multiprocessing.context.BaseContext = None) -> SharedMemoryBridge:
+        """Create a new shared memory block, to be called from the optimizer’s process.
+
+        :param inputs_number: Number of values sent to the simulator each cycle.
+        :param outputs_number: Number of values sent back by the simulator each cycle.
+        :param name: Name of the block, a unique name is generated if None.
+        :param context: The multiprocessing context the simulator’s process is started with, the default one
+            if None.
+        """
+        context = context or multiprocessing.get_context()
+        size = (cls._HEADER_SIZE + inputs_number + outputs_number) * 8
+        memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((cls._HEADER_SIZE,), dtype=np.int64, buffer=memory.buf)
+        header[:] = (0, 0, 0, inputs_number, outputs_number)
+        del header
+        handle = BridgeHandle(memory.name, context.Semaphore(0), context.Semaphore(0))
+        return cls(memory, handle, context, owner=True)
+
+    @classmethod
+    def attach(cls, handle: BridgeHandle) -> SharedMemoryBridge:
+        """Attach to a shared memory block created by create(), to be called from the simulator’s process.
+
+        The simulator’s process shares the resource tracker of the process it was started from, through which
+        the creator of the block already tracks it. Attaching thus does not track the block a second time.
+
+        :param handle: The handle of the bridge that created the block.
+        :raise FileNotFoundError: If the block does not exist anymore.
+        """
+        return cls(shared_memory.SharedMemory(name=handle.name), handle, None, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def handle(self) -> BridgeHandle:
+        """The handle to pass to the simulator’s process so that it can attach to this bridge."""
+        return self._handle
+
+    @property
+    def inputs(self) -> np.ndarray:
+        """The values sent to the simulator, as a view on the shared memory."""
+        return self._inputs
+
+    @property
+    def outputs(self) -> np.ndarray:
+        """The values sent back by the simulator, as a view on the shared memory."""
+        return self._outputs
+
+    @property
+    def sequence_number(self) -> int:
+        """Sequence number of the last request."""
+        return int(self._header[self._REQUEST])
+
+    @property
+    def stopped(self) -> bool:
+        """Whether the simulator has been told to stop."""
+        return bool(self._header[self._STOPPED])
+
+    def exchange(self, timeout: float = None) -> np.ndarray:
+        """Send the current inputs to the simulator and wait for its outputs. Optimizer side.
+
+        :param timeout: Maximum time to wait for the simulator in seconds, None to wait forever.
+        :return: The outputs, as a view on the shared memory.
+        :raise ValueError: If the simulator has been told to stop.
+        :raise TimeoutError: If the simulator did not respond in time.
+        """
+        if self.stopped:
+            raise ValueError('simulator has been told to stop')
+        header = self._header
+        sequence_number = int(header[self._REQUEST]) + 1
+        header[self._REQUEST] = sequence_number
+        self._handle.requests.release()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Responses to requests that timed out are skipped
+        while header[self._RESPONSE] != sequence_number:
+            remaining = None if deadline is None else max(0., deadline - time.monotonic())
+            if not self._handle.responses.acquire(timeout=remaining):
+                raise TimeoutError(f'simulator did not respond to request {sequence_number}')
+            # The simulator may stop before seeing the request if stop() is called concurrently
+            if header[self._RESPONSE] != sequence_number and header[self._STOPPED] == self._SIMULATOR_STOPPED:
+                raise ValueError(f'simulator stopped before responding to request {sequence_number}')
+        return self._outputs
+
+    def stop(self):
+        """Tell the simulator to stop once it has served the pending request, if any. Optimizer side."""
+        self._header[self._STOPPED] = self._STOP_REQUESTED
+        self._handle.requests.release()
+
+    def wait_request(self, timeout: float = None) -> bool:
+        """Wait for the optimizer to send new inputs. Simulator side.
+
+        :param timeout: Maximum time to wait in seconds, None to wait forever.
+        :return: True if new inputs are available, False if the simulator should stop.
+        :raise TimeoutError: If no request was received in time.
+        """
+        header = self._header
+        if not self._handle.requests.acquire(timeout=timeout):
+            raise TimeoutError('no request received')
+        # The stop cell may have been set while a request was pending, which is served first
+        if header[self._REQUEST] != self._served_request:
+            return True
+        header[self._STOPPED] = self._SIMULATOR_STOPPED
+        self._handle.responses.release()
+        return False
+
+    def respond(self):
+        """Tell the optimizer that the outputs of the last request have been written. Simulator side."""
+        self._served_request = int(self._header[self._REQUEST])
+        self._header[self._RESPONSE] = self._served_request
+        self._handle.responses.release()
+
+    def close(self):
+        """Release the shared memory, destroying it if this bridge created it.
+        Arrays returned by this bridge must not be used anymore.
+        """
+        if self._memory is None:
+            return
+        # Views must be released before the memory can be closed
+        self._header = self._inputs = self._outputs = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SharedMemoryDataOutput(DataOutput):
+    def __init__(self, bridge: SharedMemoryBridge, index: int, inf: float, sup: float, name: str):
+        """An output whose value is read from a cell of the outputs of a shared memory bridge."""
+        super().__init__(inf, sup, name)
+        self._bridge = bridge
+        self._index = index
+
+    def get_data(self) -> float:
+        return float(self._bridge.outputs[self._index])
+
+
+class SharedMemoryDataInput(DataInput):
+    def __init__(self, bridge: SharedMemoryBridge, index: int, inf: float, sup: float, name: str):
+        """An input whose value is written into a cell of the inputs of a shared memory bridge.
+        The value is sent to the simulator along with all others by the bridge’s exchange().
+        """
+        super().__init__(inf, sup, name)
+        self._bridge = bridge
+        self._index = index
+
+    def get_data(self) -> float:
+        return float(self._bridge.inputs[self._index])
+
+    def set_data(self, value: float):
+        self._bridge.inputs[self._index] = value
+
+
+def run_stand_in_simulator(handle: BridgeHandle, function: typ.Callable[[np.ndarray], np.ndarray],
+                           timeout: float = None):
+    """Serve the requests of a shared memory bridge until the optimizer stops it, standing in for a real simulator.
+
+    :param handle: The handle of the bridge.
+    :param function: The function that computes the outputs from the inputs.
+    :param timeout: Maximum time to wait for each request in seconds, None to wait forever.
+    """
+    with SharedMemoryBridge.attach(handle) as bridge:
+        while bridge.wait_request(timeout):
+            bridge.outputs[:] = function(bridge.inputs)
+            bridge.respond()
+
+
+def start_stand_in_simulator(bridge: SharedMemoryBridge, function: typ.Callable[[np.ndarray], np.ndarray],
+                             timeout: float = None) -> multiprocessing.Process:
+    """Run a stand-in simulator for the given bridge in a new process, started with the bridge’s context.
+    The function must be picklable.
+
+    :param bridge: A bridge returned by create().
+    :return: The simulator’s process, that ends once the bridge has been stopped.
+    """
+    process = bridge._context.Process(target=run_stand_in_simulator, args=(bridge.handle, function, timeout),
+                                      daemon=True)
+    process.start()
+    return process
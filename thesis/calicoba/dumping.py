@@ -0,0 +1,200 @@
+"""Buffered writing of the CSV files dumped during optimizations.
+
+Rows are kept in memory and written in large batches by a background thread, so that dumping data
+does not slow cycles down. Each batch opens, appends to, and closes the files it concerns,
+hence the number of files being dumped into is not limited by the number of available file descriptors.
+"""
+from __future__ import annotations
+
+import atexit
+import pathlib
+import queue
+import threading
+import typing as typ
+
+
+class DumpFile:
+    __slots__ = ('_writer', '_path', '_header', '_rows', '_created', '_dirty')
+
+    def __init__(self, writer: DumpWriter, path: pathlib.Path, header: str):
+        """A CSV file whose rows are buffered by a dump writer. Instances are created by DumpWriter.open()."""
+        self._writer = writer
+        self._path = path
+        self._header = header
+        self._rows: typ.List[typ.Tuple[typ.Any, ...]] = []
+        # Whether the file has been truncated and its header written
+        self._created = False
+        # Whether the file is in the writer’s list of files to write in the next batch
+        self._dirty = False
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._path
+
+    def write(self, *values):
+        """Append a row to this file. Values are converted with str().
+
+        :raise ValueError: If the writer is closed.
+        """
+        self._writer._check_open()
+        self._rows.append(values)
+        self._writer._row_added(self)
+
+
+class DumpWriter:
+    def __init__(self, batch_size: int = 10_000, max_pending_batches: int = 4):
+        """Create a writer that buffers the rows of its files and writes them from a background thread,
+        started on the first batch. Writers that are not closed are closed when the interpreter exits,
+        they are kept alive until then.
+
+        :param batch_size: Number of buffered rows, all files combined, above which they are handed
+            to the background thread.
+        :param max_pending_batches: Number of batches waiting to be written above which writing a row blocks
+            until the background thread catches up.
+        """
+        self._batch_size = batch_size
+        self._queue: queue.Queue[typ.Optional[list]] = queue.Queue(maxsize=max_pending_batches)
+        self._thread: typ.Optional[threading.Thread] = None
+        # Files with rows or a header to write in the next batch
+        self._dirty_files: typ.List[DumpFile] = []
+        self._pending_rows_number = 0
+        self._error: typ.Optional[Exception] = None
+        self._closed = False
+        # Daemon threads still run while exit handlers are called, the thread is thus stopped by close()
+        atexit.register(self.close)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def open(self, path: pathlib.Path, header: typ.Sequence[str], append: bool = False) -> DumpFile:
+        """Declare a CSV file to dump rows into. The file is truncated and its header written with the next batch.
+
+        :param path: Path of the file, missing directories are created.
+        :param header: Names of the columns.
+        :param append: If true and the file exists, rows are appended to it instead and the header is not written.
+        :return: The file to write rows into.
+        :raise ValueError: If the writer is closed.
+        """
+        self._check_open()
+        file = DumpFile(self, path, ','.join(header))
+        if append and self._exists(path):
+            file._created = True
+        else:
+            self._mark_dirty(file)
+        return file
+
+    def flush(self):
+        """Write all buffered rows and wait until they are written.
+
+        :raise ValueError: If the writer is closed.
+        :raise OSError: If a file could not be written.
+        """
+        self._check_open()
+        self._submit()
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Write all buffered rows then stop the background thread. Closing a closed writer does nothing.
+
+        :raise OSError: If a file could not be written.
+        """
+        if self._closed:
+            return
+        atexit.unregister(self.close)
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            if self._thread:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _exists(self, path: pathlib.Path) -> bool:
+        """Tell whether rows have already been dumped into the given file."""
+        return path.exists()
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError('dump writer is closed')
+
+    def _raise_error(self):
+        if self._error:
+            raise self._error
+
+    def _mark_dirty(self, file: DumpFile):
+        if not file._dirty:
+            file._dirty = True
+            self._dirty_files.append(file)
+
+    def _row_added(self, file: DumpFile):
+        self._mark_dirty(file)
+        self._pending_rows_number += 1
+        if self._pending_rows_number >= self._batch_size:
+            self._submit()
+
+    def _submit(self):
+        """Hand the buffered rows of all files to the background thread."""
+        if not self._dirty_files:
+            return
+        self._raise_error()
+        batch = []
+        for file in self._dirty_files:
+            batch.append((file._path, None if file._created else file._header, file._rows))
+            file._rows = []
+            file._created = True
+            file._dirty = False
+        self._dirty_files = []
+        self._pending_rows_number = 0
+        if self._thread is None:
+            thread = threading.Thread(target=self._run, name='calicoba-dump-writer', daemon=True)
+            try:
+                thread.start()
+            except RuntimeError:
+                # Threads may not be started while the interpreter exits, the batch is written right away
+                self._write_batch(batch)
+                return
+            self._thread = thread
+        self._queue.put(batch)
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    return
+                # Batches following a failed one are dropped, the error is raised in the main thread
+                if self._error is None:
+                    self._write_batch(batch)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _write_batch(self, batch: typ.List[typ.Tuple[pathlib.Path, typ.Optional[str], typ.List[tuple]]]):
+        """Write a batch of rows. Called from the background thread.
+
+        :param batch: The path of each file with rows to write, along with its header if the file
+            has to be created, None otherwise.
+        """
+        for path, header, rows in batch:
+            if header is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open(mode='a' if header is None else 'w', encoding='UTF-8') as f:
+                if header is not None:
+                    f.write(header + '\n')
+                f.write(format_rows(rows))
+
+
+def format_rows(rows: typ.Iterable[typ.Sequence[typ.Any]]) -> str:
+    """Format rows as CSV lines, values being converted with str()."""
+    return ''.join(','.join(map(str, row)) + '\n' for row in rows)
+
@@ -0,0 +1,224 @@
+"""Lockstep execution of several independent Calicoba optimizations.
+
+Every run keeps its own agents but all runs advance cycle by cycle together. The agents of each run still decide
+one after the other in Python, what is shared between runs is the rest of each cycle: the model is evaluated once
+for all active runs, with a single call that may process them all at once, and the objective values of all runs
+are normalized and aggregated in one go before being handed to their system. Runs are thus faster in lockstep
+than one after the other when evaluating the model costs more than the agents’ decisions,
+or has a per-call overhead, e.g. a simulator.
+"""
+import dataclasses
+import typing as typ
+
+import numpy as np
+
+from . import Calicoba, CalicobaConfig, agents, dumping
+
+BatchEvaluator = typ.Callable[[np.ndarray], np.ndarray]
+
+
+@dataclasses.dataclass(frozen=True)
+class MultiStartResult:
+    starting_point: typ.Dict[str, float]
+    final_point: typ.Dict[str, float]
+    solution_found: bool
+    cycles_number: int
+    solution_cycle: int
+    points_number: int
+    unique_points_number: int
+    error_message: str = ''
+    evaluations_number: int = 0
+
+
+class MultiStartEngine:
+    def __init__(self, config: CalicobaConfig, parameters: typ.Dict[str, typ.Tuple[float, float]],
+                 objectives: typ.Dict[str, typ.Tuple[float, float]], starting_points: np.ndarray):
+        """Create an engine that runs one optimization per starting point.
+
+        :param config: The config shared by all runs. If a dump directory is set,
+            each run dumps its data into a sub-directory named after its index, through a single writer
+            that is closed by close().
+        :param parameters: The domain of each parameter.
+        :param objectives: The domain of each objective.
+        :param starting_points: A (runs, parameters) array of starting values, columns following parameters’ order.
+        """
+        self._parameters_names = list(parameters)
+        self._objectives_names = list(objectives)
+        starting_points = np.array(starting_points, dtype=np.float64, ndmin=2)
+        if starting_points.shape[1] != len(self._parameters_names):
+            raise ValueError(f'expected {len(self._parameters_names)} values per starting point, '
+                             f'got {starting_points.shape[1]}')
+        runs_number = len(starting_points)
+
+        self._dump_writer = dumping.DumpWriter() if config.dump_directory else None
+        self._systems = []
+        for k in range(runs_number):
+            run_config = config
+            if config.dump_directory:
+                run_config = dataclasses.replace(config, dump_directory=config.dump_directory / f'run_{k}')
+            system = Calicoba(run_config, dump_writer=self._dump_writer)
+            for name, (inf, sup) in parameters.items():
+                system.add_parameter(name, inf, sup)
+            for name, (inf, sup) in objectives.items():
+                system.add_objective(name, inf, sup)
+            system.setup()
+            self._systems.append(system)
+
+        bounds = np.array(list(objectives.values()), dtype=np.float64).reshape((-1, 2))
+        self._normalizer = agents.BoundNormalizer(bounds[:, 0], bounds[:, 1])
+        weights = config.objective_weights
+        if weights is not None:
+            weights = [weights.get(name, 1) for name in self._objectives_names]
+        self._aggregator = agents.get_aggregator(config.aggregator, weights)
+
+        self._starting_points = starting_points
+        self._values = starting_points.copy()
+        self._criticalities = np.full(runs_number, np.nan)
+        self._directions = np.zeros((runs_number, len(self._parameters_names)), dtype=np.int8)
+        self._steps = np.full((runs_number, len(self._parameters_names)), np.nan)
+        self._active = np.ones(runs_number, dtype=bool)
+        self._solution_found = np.zeros(runs_number, dtype=bool)
+        self._cycles = np.zeros(runs_number, dtype=np.int64)
+        self._solution_cycles = np.full(runs_number, -1, dtype=np.int64)
+        self._evaluations = np.zeros(runs_number, dtype=np.int64)
+        self._unique_points: typ.List[typ.Set[typ.Tuple[float, ...]]] = [set() for _ in range(runs_number)]
+        self._errors = [''] * runs_number
+
+    @property
+    def runs_number(self) -> int:
+        return len(self._systems)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Current parameter values of each run."""
+        return self._values
+
+    @property
+    def criticalities(self) -> np.ndarray:
+        """Criticality of the last point perceived by each run."""
+        return self._criticalities
+
+    @property
+    def directions(self) -> np.ndarray:
+        """Direction of the last suggestion for each run and parameter."""
+        return self._directions
+
+    @property
+    def steps(self) -> np.ndarray:
+        """Step of the last suggestion for each run and parameter."""
+        return self._steps
+
+    @property
+    def active(self) -> np.ndarray:
+        """Which runs are still going."""
+        return self._active
+
+    def step(self, evaluate: BatchEvaluator,
+             is_solution: typ.Callable[[typ.Dict[str, float]], bool] = None) -> int:
+        """Advance all active runs by one cycle.
+
+        :param evaluate: A function that takes a (runs, parameters) array of values and returns
+            the corresponding (runs, objectives) array of objective values. If objectives are deterministic,
+            only the runs whose current point has not already been evaluated are passed.
+        :param is_solution: An optional function that tells whether a point where a local minimum
+            has been found is an acceptable solution. The run stops if it is.
+        :return: The number of runs that are still active.
+        """
+        indices = np.flatnonzero(self._active)
+        if not indices.size:
+            return 0
+        values = self._values[indices]
+        outputs = np.empty((len(indices), len(self._objectives_names)), dtype=np.float64)
+        to_evaluate = []
+        for row, k in enumerate(indices.tolist()):
+            known = self._systems[k].lookup(dict(zip(self._parameters_names, values[row].tolist())))
+            if known is None:
+                to_evaluate.append(row)
+            else:
+                outputs[row] = [known[name] for name in self._objectives_names]
+        if to_evaluate:
+            outputs[to_evaluate] = np.asarray(evaluate(values[to_evaluate]), dtype=np.float64) \
+                .reshape((len(to_evaluate), -1))
+            self._evaluations[indices[to_evaluate]] += 1
+        # Objectives are normalized once for all runs, systems are given the results
+        objectives_criticalities = self._normalizer(outputs)
+        criticalities = self._aggregator(objectives_criticalities)
+        self._criticalities[indices] = criticalities
+        self._cycles[indices] += 1
+
+        for row, k in enumerate(indices.tolist()):
+            point = self._values[k].tolist()
+            self._unique_points[k].add(tuple(point))
+            parameters_values = dict(zip(self._parameters_names, point))
+            # noinspection PyBroadException
+            try:
+                # Objectives of each system follow the engine’s order
+                suggestions = self._systems[k].suggest_new_point(
+                    parameters_values, outputs[row], objective_criticalities=objectives_criticalities[row],
+                    criticality=criticalities[row])
+            except Exception as e:
+                self._stop(k, error_message=str(e))
+                continue
+
+            for j, name in enumerate(self._parameters_names):
+                if not suggestions[name]:
+                    self._stop(k, error_message='no suggestions for parameter ' + name)
+                    break
+                suggestion = suggestions[name][0]
+                if isinstance(suggestion, agents.GlobalMinimumFound):
+                    self._stop(k, solution_found=True)
+                    break
+                self._values[k, j] = suggestion.next_point
+                self._steps[k, j] = suggestion.step
+                self._directions[k, j] = suggestion.direction or agents.DIR_NONE
+                if suggestion.local_min_found and is_solution and is_solution(parameters_values):
+                    self._stop(k, solution_found=True)
+                    break
+
+        return int(self._active.sum())
+
+    def run(self, evaluate: BatchEvaluator, max_steps: int,
+            is_solution: typ.Callable[[typ.Dict[str, float]], bool] = None) -> typ.List[MultiStartResult]:
+        """Advance all runs until they all stop or the maximum number of cycles is reached.
+
+        :param evaluate: A function that takes a (runs, parameters) array of values and returns
+            the corresponding (runs, objectives) array of objective values.
+        :param max_steps: The maximum number of cycles.
+        :param is_solution: An optional function that tells whether a point where a local minimum
+            has been found is an acceptable solution. The run stops if it is.
+        :return: The result of each run, in the order of the starting points.
+        """
+        for _ in range(max_steps):
+            if not self.step(evaluate, is_solution):
+                break
+        return self.results()
+
+    def results(self) -> typ.List[MultiStartResult]:
+        return [
+            MultiStartResult(
+                starting_point=dict(zip(self._parameters_names, self._starting_points[k].tolist())),
+                final_point=dict(zip(self._parameters_names, self._values[k].tolist())),
+                solution_found=bool(self._solution_found[k]),
+                cycles_number=int(self._cycles[k]),
+                solution_cycle=int(self._solution_cycles[k]),
+                points_number=int(self._cycles[k]),
+                unique_points_number=len(self._unique_points[k]),
+                error_message=self._errors[k],
+                evaluations_number=int(self._evaluations[k]),
+            )
+            for k in range(self.runs_number)
+        ]
+
+    def close(self):
+        """Write all buffered dumped data of all runs to disk and close their dump writer."""
+        for system in self._systems:
+            system.close()
+        if self._dump_writer:
+            self._dump_writer.close()
+
+    def _stop(self, k: int, solution_found: bool = False, error_message: str = ''):
+        self._active[k] = False
+        if solution_found:
+            self._solution_found[k] = True
+            self._solution_cycles[k] = self._cycles[k]
+        self._errors[k] = error_message
@@ -0,0 +1,115 @@
+"""Per-phase timing of Calicoba cycles.
+
+Attach a Profiler to a Calicoba instance to get, for each cycle, the wall time spent in each phase
+and the number of agents processed by it. When no profiler is attached, the cycle only pays for
+one None check per phase.
+"""
+import dataclasses
+import time
+import typing as typ
+
+PHASE_OBJECTIVES = 'objectives'
+PHASE_PARAMETERS = 'parameters'
+PHASE_POINTS_PERCEIVE = 'points_perceive'
+PHASE_POINTS_DECIDE = 'points_decide'
+PHASE_MAINTENANCE = 'maintenance'
+
+PHASES = (
+    PHASE_OBJECTIVES,
+    PHASE_PARAMETERS,
+    PHASE_POINTS_PERCEIVE,
+    PHASE_POINTS_DECIDE,
+    PHASE_MAINTENANCE,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class PhaseStats:
+    time: float
+    calls: int
+
+
+@dataclasses.dataclass(frozen=True)
+class CycleProfile:
+    cycle: int
+    phases: typ.Dict[str, PhaseStats]
+
+    @property
+    def total_time(self) -> float:
+        return sum(stats.time for stats in self.phases.values())
+
+
+class Profiler:
+    def __init__(self, callback: typ.Callable[[CycleProfile], None] = None, keep_profiles: bool = True):
+        """Create a profiler.
+
+        :param callback: An optional function called with the profile of each cycle once it is finished.
+        :param keep_profiles: Whether to keep the profiles of all cycles in memory.
+            Totals are always kept.
+        """
+        self._callback = callback
+        self._keep_profiles = keep_profiles
+        self._profiles: typ.List[CycleProfile] = []
+        self._total_times = dict.fromkeys(PHASES, 0.0)
+        self._total_calls = dict.fromkeys(PHASES, 0)
+        self._cycle = None
+        self._phases = {}
+
+    @staticmethod
+    def clock() -> float:
+        return time.perf_counter()
+
+    def start_cycle(self, cycle: int) -> float:
+        """Start profiling a new cycle.
+
+        :return: The current time, to be passed to the first record() call.
+        """
+        self._cycle = cycle
+        self._phases = {}
+        return self.clock()
+
+    def record(self, phase: str, start: float, calls: int) -> float:
+        """Record the end of a phase.
+
+        :param phase: Name of the phase.
+        :param start: Time at which the phase started.
+        :param calls: Number of agents processed by the phase.
+        :return: The current time, to be passed to the next record() call.
+        """
+        now = self.clock()
+        self._phases[phase] = PhaseStats(time=now - start, calls=calls)
+        self._total_times[phase] = self._total_times.get(phase, 0.0) + now - start
+        self._total_calls[phase] = self._total_calls.get(phase, 0) + calls
+        return self.clock()
+
+    def end_cycle(self):
+        profile = CycleProfile(cycle=self._cycle, phases=self._phases)
+        if self._keep_profiles:
+            self._profiles.append(profile)
+        if self._callback:
+            self._callback(profile)
+
+    @property
+    def profiles(self) -> typ.Sequence[CycleProfile]:
+        """Profiles of all finished cycles, if they are kept."""
+        return self._profiles
+
+    @property
+    def last_profile(self) -> typ.Optional[CycleProfile]:
+        return self._profiles[-1] if self._profiles else None
+
+    def totals(self) -> typ.Dict[str, PhaseStats]:
+        """Return the total time and number of calls of each phase over all profiled cycles."""
+        return {phase: PhaseStats(time=self._total_times[phase], calls=self._total_calls[phase])
+                for phase in self._total_times}
+
+    def reset(self):
+        self._profiles.clear()
+        self._total_times = dict.fromkeys(PHASES, 0.0)
+        self._total_calls = dict.fromkeys(PHASES, 0)
+
+    def __str__(self):
+        totals = self.totals()
+        total_time = sum(stats.time for stats in totals.values()) or 1
+        return '\n'.join(f'{phase}: {stats.time:.4f} s ({stats.time / total_time * 100:.1f} %), {stats.calls} calls'
+                         for phase, stats in totals.items())
@@ -0,0 +1,93 @@
+"""Structured traces of the decisions taken by Calicoba’s agents.
+
+Events are only built when a Tracer with at least one sink is attached to a Calicoba instance,
+otherwise tracing costs a single None check per decision.
+"""
+import abc
+import dataclasses
+import json
+import pathlib
+import typing as typ
+
+EVENT_DECISION = 'decision'
+EVENT_LOCAL_MINIMUM = 'local_minimum'
+EVENT_GLOBAL_MINIMUM = 'global_minimum'
+
+
+@dataclasses.dataclass(frozen=True)
+class TraceEvent:
+    cycle: int
+    type: str
+    parameter: str
+    point: str
+    value: float
+    criticality: float
+    next_value: typ.Optional[float] = None
+    step: typ.Optional[float] = None
+    steps_number: typ.Optional[float] = None
+    direction: typ.Optional[int] = None
+    decision: str = ''
+
+
+class TraceSink(abc.ABC):
+    """A sink receives the events emitted by a tracer."""
+
+    @abc.abstractmethod
+    def emit(self, event: TraceEvent):
+        pass
+
+    def close(self):
+        pass
+
+
+class ListSink(TraceSink):
+    def __init__(self):
+        """A sink that keeps all events in memory."""
+        self.events: typ.List[TraceEvent] = []
+
+    def emit(self, event: TraceEvent):
+        self.events.append(event)
+
+
+class CallbackSink(TraceSink):
+    def __init__(self, callback: typ.Callable[[TraceEvent], None]):
+        """A sink that passes each event to a function."""
+        self._callback = callback
+
+    def emit(self, event: TraceEvent):
+        self._callback(event)
+
+
+class JsonLinesSink(TraceSink):
+    def __init__(self, path: pathlib.Path):
+        """A sink that writes each event as one JSON object per line in the given file."""
+        self._file = path.open(mode='w', encoding='UTF-8')
+
+    def emit(self, event: TraceEvent):
+        self._file.write(json.dumps(dataclasses.asdict(event)) + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+class Tracer:
+    def __init__(self, *sinks: TraceSink):
+        """Dispatch events to the given sinks. A tracer without sinks is falsy."""
+        self._sinks = list(sinks)
+
+    def add_sink(self, sink: TraceSink):
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: TraceSink):
+        self._sinks.remove(sink)
+
+    def emit(self, event: TraceEvent):
+        for sink in self._sinks:
+            sink.emit(event)
+
+    def close(self):
+        for sink in self._sinks:
+            sink.close()
+
+    def __bool__(self):
+        return bool(self._sinks)
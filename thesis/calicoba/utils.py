@@ -12,8 +12,11 @@ def get_xc(top_point: Point, intermediate_point: Point, yc: float) -> float:
     :param top_point: Point A = (xa, ya), at the base of the rectangle triangle.
     :param intermediate_point: Point E = (xe, ye) located on the hypothenus (side AC).
     :param yc: Y component of point C, at the lower point of the rectangle triangle.
-    :return: The x component of point C (xc).
+    :return: The x component of point C (xc). If A and E have the same y component, there is no such triangle
+        and the x component of the point one AE length past E is returned instead.
     """
     xa, ya = top_point
     xe, ye = intermediate_point
+    if ye == ya:
+        return xe + (xe - xa)
     return xa + (yc - ya) * (xe - xa) / (ye - ya)
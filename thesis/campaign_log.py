@@ -0,0 +1,199 @@
+"""Single-file logs of the data dumped by all runs of a campaign of experiments.
+
+A campaign log replaces the directory tree of CSV files dumped by the runs of a campaign, one directory per run
+and one file per parameter and objective. It is an append-only file of chunks, each chunk holding consecutive rows
+of one table (i.e. one of the CSV files) of one run. Each chunk starts with a line of the form
+
+    @chunk {"run": "<model>/<starting point>", "table": "<name>", "header": "<CSV header or null>", "rows": <n>}
+
+followed by its n CSV rows. An index file next to the log lists the position of each chunk
+so that runs may be read without scanning the whole log. It is rebuilt from the log if missing, and completed
+by scanning the end of the log if chunks were appended after the last indexed one.
+"""
+import argparse
+import dataclasses
+import json
+import pathlib
+import typing as typ
+
+from calicoba import dumping
+
+CHUNK_PREFIX = b'@chunk '
+INDEX_SUFFIX = '.index'
+
+
+@dataclasses.dataclass(frozen=True)
+class Chunk:
+    run: str
+    table: str
+    # CSV header of the table, only set in its first chunk
+    header: typ.Optional[str]
+    # Position of the first row in the log, in bytes
+    offset: int
+    # Length of all rows in the log, in bytes
+    size: int
+    rows_number: int
+
+
+def get_index_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+class CampaignLogWriter(dumping.DumpWriter):
+    def __init__(self, path: pathlib.Path, root: pathlib.Path, batch_size: int = 10_000,
+                 max_pending_batches: int = 4):
+        """Create a dump writer that appends the rows of all its files to a campaign log instead.
+        Files are mapped to the table named after their stem in the run named after the path of their directory
+        relative to the root. Rows are appended to an existing log.
+
+        :param path: Path of the log file.
+        :param root: Directory the dump directories of all runs are in.
+        """
+        super().__init__(batch_size=batch_size, max_pending_batches=max_pending_batches)
+        self._path = path
+        self._root = root
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._path
+
+    def _exists(self, path):
+        if not self._path.exists():
+            return False
+        run = path.parent.relative_to(self._root).as_posix()
+        log = CampaignLog(self._path)
+        return run in log.runs and path.stem in log.tables(run)
+
+    def _write_batch(self, batch):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        chunks = []
+        with self._path.open(mode='ab') as f:
+            for path, header, rows in batch:
+                if header is None and not rows:
+                    continue
+                run = path.parent.relative_to(self._root).as_posix()
+                metadata = {'run': run, 'table': path.stem, 'header': header, 'rows': len(rows)}
+                f.write(CHUNK_PREFIX + json.dumps(metadata).encode('UTF-8') + b'\n')
+                data = dumping.format_rows(rows).encode('UTF-8')
+                chunks.append(Chunk(run=run, table=path.stem, header=header, offset=f.tell(), size=len(data),
+                                    rows_number=len(rows)))
+                f.write(data)
+        # The index is written after the chunks so that it never points past the end of the log
+        with get_index_path(self._path).open(mode='a', encoding='UTF-8') as f:
+            f.writelines(json.dumps(dataclasses.asdict(chunk)) + '\n' for chunk in chunks)
+
+
+class CampaignLog:
+    def __init__(self, path: pathlib.Path):
+        """Open a campaign log for reading.
+
+        :param path: Path of the log file.
+        :raise FileNotFoundError: If the log does not exist.
+        """
+        self._path = path
+        # Chunks of each table of each run, in the order they were appended
+        self._chunks: typ.Dict[str, typ.Dict[str, typ.List[Chunk]]] = {}
+        log_size = path.stat().st_size
+        chunks = self._read_index()
+        # The index is written after the chunks it lists, it may thus lack the last ones but never point past them
+        end = chunks[-1].offset + chunks[-1].size if chunks else 0
+        if chunks is None or end > log_size or any(chunk.offset + chunk.size > end for chunk in chunks):
+            chunks = self._scan()
+        elif end < log_size:
+            chunks += self._scan(end)
+        for chunk in chunks:
+            self._chunks.setdefault(chunk.run, {}).setdefault(chunk.table, []).append(chunk)
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._path
+
+    @property
+    def runs(self) -> typ.List[str]:
+        """Names of all runs in the order they were first logged."""
+        return list(self._chunks)
+
+    def tables(self, run: str) -> typ.List[str]:
+        """Names of the tables of the given run.
+
+        :raise KeyError: If the run is not in the log.
+        """
+        return list(self._chunks[run])
+
+    def read_table(self, run: str, table: str) -> typ.List[str]:
+        """Read a table of a run.
+
+        :return: The lines of the table’s CSV file without line breaks, header first.
+        :raise KeyError: If the run or table is not in the log.
+        """
+        chunks = self._chunks[run][table]
+        lines = [chunks[0].header]
+        with self._path.open(mode='rb') as f:
+            for chunk in chunks:
+                f.seek(chunk.offset)
+                lines.extend(f.read(chunk.size).decode('UTF-8').splitlines())
+        return lines
+
+    def export_csv(self, directory: pathlib.Path, runs: typ.Iterable[str] = None):
+        """Write the tables of the given runs as the CSV files Calicoba dumps, one directory per run.
+
+        :param directory: Directory to create the runs’ directories in.
+        :param runs: Names of the runs to export, all runs if None.
+        """
+        for run in (self.runs if runs is None else runs):
+            run_directory = directory / run
+            run_directory.mkdir(parents=True, exist_ok=True)
+            for table in self.tables(run):
+                lines = self.read_table(run, table)
+                (run_directory / f'{table}.csv').write_text(''.join(line + '\n' for line in lines), encoding='UTF-8')
+
+    def _read_index(self) -> typ.Optional[typ.List[Chunk]]:
+        index_path = get_index_path(self._path)
+        if not index_path.exists():
+            return None
+        with index_path.open(encoding='UTF-8') as f:
+            # A line that was not fully written is ignored, along with the chunk it lists
+            return [Chunk(**json.loads(line)) for line in f if line.endswith('\n')]
+
+    def _scan(self, start: int = 0) -> typ.List[Chunk]:
+        """List the chunks of the log by reading it. A chunk that was not fully written is ignored.
+
+        :param start: Position in bytes of the first chunk to read.
+        """
+        chunks = []
+        with self._path.open(mode='rb') as f:
+            f.seek(start)
+            while True:
+                line = f.readline()
+                if not line.startswith(CHUNK_PREFIX) or not line.endswith(b'\n'):
+                    break
+                metadata = json.loads(line[len(CHUNK_PREFIX):])
+                offset = f.tell()
+                rows = [f.readline() for _ in range(metadata['rows'])]
+                if rows and not rows[-1].endswith(b'\n'):
+                    break
+                chunks.append(Chunk(run=metadata['run'], table=metadata['table'], header=metadata['header'],
+                                    offset=offset, size=f.tell() - offset, rows_number=metadata['rows']))
+        return chunks
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Export a campaign log to one CSV file per run and table.')
+    arg_parser.add_argument(dest='path', type=pathlib.Path, help='path to the campaign log')
+    arg_parser.add_argument('-o', '--output-dir', metavar='PATH', dest='output_dir', type=pathlib.Path,
+                            help='directory to export runs into (default: the log’s directory)')
+    arg_parser.add_argument('-r', '--run', metavar='NAME', dest='runs', nargs='+',
+                            help='names of the runs to export (default: all)')
+    arg_parser.add_argument('-l', '--list', dest='list', action='store_true', help='only list the logged runs')
+
+    args = arg_parser.parse_args()
+    log = CampaignLog(args.path)
+    if args.list:
+        for run in log.runs:
+            print(run)
+    else:
+        log.export_csv(args.output_dir or args.path.parent, args.runs)
+
+
+if __name__ == '__main__':
+    main()
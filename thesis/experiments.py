@@ -11,12 +11,17 @@ import numpy as np
 import scipy.optimize as sp_opti
 
 import calicoba
+import calicoba.multistart
+import campaign_log
 import experiments_utils as exp_utils
 import models
 import other_methods
+import results_store
 import test_utils
 
 DEFAULT_DIR = pathlib.Path('output/experiments')
+CAMPAIGN_LOG_NAME = 'campaign.log'
+RESULTS_STORE_NAME = 'results'
 DEFAULT_LOGGING_LEVEL = 'info'
 DEFAULT_RUNS_NB = 200
 DEFAULT_MAX_STEPS_NB = 1000
@@ -48,11 +53,26 @@ def get_config() -> exp_utils.ExperimentsConfig:
                             help=f'maximum number of simulation steps (default: {DEFAULT_MAX_STEPS_NB})')
     arg_parser.add_argument('--step-by-step', dest='step_by_step', action='store_true',
                             help='enable step by step for CALICOBA')
+    arg_parser.add_argument('--lockstep', dest='lockstep', action='store_true',
+                            help='run all CALICOBA runs of a model in lockstep')
+    arg_parser.add_argument('--freeze-after', metavar='NB', dest='freeze_after_minima', type=int,
+                            help='freeze a CALICOBA parameter after it found this many local minima at the same value')
+    arg_parser.add_argument('--surrogate', metavar='NAME', dest='surrogate', type=str,
+                            choices=(calicoba.agents.SURROGATE_QUADRATIC,),
+                            help='surrogate used by CALICOBA to jump to the predicted minimum during local search')
+    arg_parser.add_argument('--step-controller', metavar='NAME', dest='step_controller', type=str,
+                            choices=(calicoba.agents.STEP_CONTROLLER_FIXED, calicoba.agents.STEP_CONTROLLER_ADAPTIVE),
+                            help='controller of the jump lengths of CALICOBA points')
+    arg_parser.add_argument('--oscillation-window', metavar='NB', dest='oscillation_window', type=int,
+                            help='stop a CALICOBA run when its last NB points and criticalities are periodic')
     arg_parser.add_argument('-s', '--seed', dest='seed', type=int,
                             help='seed for the random numbers generator')
     arg_parser.add_argument('-o', '--output-dir', metavar='PATH', dest='output_dir', type=pathlib.Path,
                             help=f'output directory for dumped files (default: {DEFAULT_DIR})')
     arg_parser.add_argument('-d', '--dump', dest='dump', action='store_true', help='dump generated data to files')
+    arg_parser.add_argument('--campaign-log', dest='campaign_log', action='store_true',
+                            help=f'dump the data of all runs into a single {CAMPAIGN_LOG_NAME} file in the output '
+                                 f'directory instead of one directory per run')
     arg_parser.add_argument('-l', '--level', metavar='LEVEL', dest='logging_level', type=str,
                             choices=('debug', 'info', 'warning', 'error', 'critical'),
                             help='logging level among debug, info, warning, error and critical '
@@ -72,8 +92,14 @@ def get_config() -> exp_utils.ExperimentsConfig:
     default_runs_nb = DEFAULT_RUNS_NB
     default_max_steps = DEFAULT_MAX_STEPS_NB
     default_step_by_step = False
+    default_lockstep = False
+    default_freeze_after_minima = None
+    default_surrogate = None
+    default_step_controller = calicoba.agents.STEP_CONTROLLER_FIXED
+    default_oscillation_window = None
     default_output_dir = DEFAULT_DIR
     default_dump_data = False
+    default_campaign_log = False
     default_log_level = DEFAULT_LOGGING_LEVEL
     default_noisy = False
     default_noise_mean = DEFAULT_NOISE_MEAN
@@ -102,10 +128,18 @@ def get_config() -> exp_utils.ExperimentsConfig:
         default_runs_nb = config_parser.getint('Run', 'runs_number', fallback=default_runs_nb)
         default_max_steps = config_parser.getint('Run', 'max_steps', fallback=default_max_steps)
         default_step_by_step = config_parser.getboolean('Run', 'step_by_step', fallback=default_step_by_step)
+        default_lockstep = config_parser.getboolean('Run', 'lockstep', fallback=default_lockstep)
+        default_freeze_after_minima = config_parser.getint('Run', 'freeze_after',
+                                                           fallback=default_freeze_after_minima)
+        default_surrogate = config_parser.get('Run', 'surrogate', fallback=default_surrogate)
+        default_step_controller = config_parser.get('Run', 'step_controller', fallback=default_step_controller)
+        default_oscillation_window = config_parser.getint('Run', 'oscillation_window',
+                                                          fallback=default_oscillation_window)
         default_output_dir = config_parser.get('Output', 'output_directory', fallback=default_output_dir)
         if isinstance(default_output_dir, str):
             default_output_dir = pathlib.Path(default_output_dir)
         default_dump_data = config_parser.getboolean('Output', 'dump_data', fallback=default_dump_data)
+        default_campaign_log = config_parser.getboolean('Output', 'campaign_log', fallback=default_campaign_log)
         default_log_level = config_parser.get('Output', 'log_level', fallback=default_log_level)
         default_noisy = config_parser.getboolean('Noise', 'noisy', fallback=default_noisy)
         default_noise_mean = config_parser.getfloat('Noise', 'noise_mean', fallback=default_noise_mean)
@@ -126,8 +160,14 @@ def get_config() -> exp_utils.ExperimentsConfig:
         runs_number=get_or_default(args.runs, default_runs_nb),
         max_steps=get_or_default(args.max_steps, default_max_steps),
         step_by_step=default_step_by_step or args.step_by_step,
+        lockstep=default_lockstep or args.lockstep,
+        freeze_after_minima=get_or_default(args.freeze_after_minima, default_freeze_after_minima),
+        surrogate=get_or_default(args.surrogate, default_surrogate),
+        step_controller=get_or_default(args.step_controller, default_step_controller),
+        oscillation_window=get_or_default(args.oscillation_window, default_oscillation_window),
         output_directory=get_or_default(args.output_dir, default_output_dir).absolute() if dump_data else None,
         dump_data=dump_data,
+        campaign_log=default_campaign_log or args.campaign_log,
         log_level=vars(logging)[get_or_default(args.logging_level, default_log_level).upper()],
         noisy_functions=default_noisy or args.noisy,
         noise_mean=get_or_default(args.noise_mean, default_noise_mean),
@@ -163,6 +203,16 @@ def main():
 
         if config.dump_data and not output_dir.exists():
             output_dir.mkdir(parents=True)
+    # Results of all methods are appended to a single store
+    store = results_store.ResultsStore(config.output_directory / RESULTS_STORE_NAME) if output_dir else None
+    dump_writer = None
+    if config.dump_data and output_dir and config.campaign_log and config.method == 'calicoba':
+        log_path = output_dir / CAMPAIGN_LOG_NAME
+        # Logs are appended to, start the campaign from an empty one
+        for path in (log_path, campaign_log.get_index_path(log_path)):
+            if path.exists():
+                path.unlink()
+        dump_writer = campaign_log.CampaignLogWriter(log_path, output_dir)
     model_factory = models.get_model_factory(models.FACTORY_SIMPLE)
     models_ = {
         k: (model_factory.generate_model(k), v)
@@ -181,6 +231,28 @@ def main():
                 test_utils.sobol_to_param(v, *model.get_parameter_domain(param_names[i])) for i, v in enumerate(point))
                 for point in test_utils.SobolSequence(len(model.parameters_names), config.runs_number)
             )
+        if config.method == 'calicoba' and config.lockstep:
+            if config.free_parameter or config.step_by_step or config.oscillation_window:
+                raise ValueError('lockstep mode does not support free parameter, step by step '
+                                 'nor oscillation detection')
+            if config.dump_data:
+                logger.warning('lockstep mode only saves the results of runs, not their data')
+            p_inits = [{param_names[i]: v for i, v in enumerate(p)} for p in dict.fromkeys(params_iterator)]
+            logger.info(f'Model "{model.id}": {len(p_inits)} run(s) in lockstep')
+            results = evaluate_model_calicoba_lockstep(model, p_inits, target_parameters, max_steps=config.max_steps,
+                                                       seed=config.seed, noisy=config.noisy_functions,
+                                                       noise_mean=config.noise_mean, noise_stdev=config.noise_stdev,
+                                                       freeze_after_minima=config.freeze_after_minima,
+                                                       surrogate=config.surrogate,
+                                                       step_controller=config.step_controller,
+                                                       logging_level=config.log_level)
+            global_results[model.id] = [{'p_init': p_init, 'result': result}
+                                        for p_init, result in zip(p_inits, results)]
+            if store:
+                for p_init, result in zip(p_inits, results):
+                    store.append(config.method, model.id, test_utils.map_to_string(p_init), result,
+                                 noisy=config.noisy_functions)
+            params_iterator = []
         tested_params = []
         for run, p in enumerate(params_iterator):
             p_init = {param_names[i]: v for i, v in enumerate(p)}
@@ -196,7 +268,11 @@ def main():
                                                  noise_mean=config.noise_mean, noise_stdev=config.noise_stdev,
                                                  output_dir=output_dir / model.id / test_utils.map_to_string(
                                                      p_init) if output_dir else None, logger=logger,
-                                                 logging_level=config.log_level)
+                                                 freeze_after_minima=config.freeze_after_minima,
+                                                 surrogate=config.surrogate,
+                                                 step_controller=config.step_controller,
+                                                 oscillation_window=config.oscillation_window,
+                                                 dump_writer=dump_writer, logging_level=config.log_level)
             else:
                 result = evaluate_model_other(config.method, model, p_init, target_parameters,
                                               noisy=config.noisy_functions, noise_mean=config.noise_mean,
@@ -206,9 +282,16 @@ def main():
                 'p_init': p_init,
                 'result': result,
             })
+            if store:
+                store.append(config.method, model.id, test_utils.map_to_string(p_init), result,
+                             noisy=config.noisy_functions)
             if result.error_message:
                 logger.info(f'Error: {result.error_message}')
+            if result.stalled:
+                logger.info(f'Stalled after {result.cycles_number} cycles')
 
+        if store:
+            store.flush()
         if config.dump_data and output_dir and config.runs_number > 1:
             logger.info('Saving results')
             with (output_dir / (model.id + '.csv')).open(mode='w', encoding='utf8') as f:
@@ -220,12 +303,20 @@ def main():
                             f'{int(exp_res.error)},{exp_res.cycles_number},{exp_res.solution_cycle},{exp_res.time},'
                             f'{exp_res.points_number},{exp_res.unique_points_number},"{exp_res.error_message or ""}"\n')
 
+    if store:
+        store.close()
+    if dump_writer:
+        dump_writer.close()
+
 
 def evaluate_model_calicoba(model: models.Model, p_init: test_utils.Map, solutions: typ.Sequence[test_utils.Map], *,
                             free_param: str = None, step_by_step: bool = False, max_steps: int = DEFAULT_MAX_STEPS_NB,
                             seed: int = None, noisy: bool = False, noise_mean: float = DEFAULT_NOISE_MEAN,
                             noise_stdev: float = DEFAULT_NOISE_STDEV, output_dir: pathlib.Path = None,
-                            logger: logging.Logger = None, logging_level: int = logging.INFO) \
+                            logger: logging.Logger = None, freeze_after_minima: int = None,
+                            surrogate: str = None, step_controller: str = calicoba.agents.STEP_CONTROLLER_FIXED,
+                            oscillation_window: int = None, dump_writer: calicoba.dumping.DumpWriter = None,
+                            logging_level: int = logging.INFO) \
         -> exp_utils.ExperimentResult:
     class SimpleObjectiveFunction(calicoba.agents.ObjectiveFunction):
         def __init__(self, *outputs_names, noise=False):
@@ -243,12 +334,18 @@ def evaluate_model_calicoba(model: models.Model, p_init: test_utils.Map, solutio
         dump_directory=output_dir,
         seed=seed,
         logging_level=logging_level,
-    ))
+        freeze_after_minima=freeze_after_minima,
+        deterministic=not noisy,
+        surrogate=surrogate,
+        step_controller=step_controller,
+    ), dump_writer=dump_writer)
 
     param_files = {}
     for param_name in model.parameters_names:
-        param_files[param_name] = (output_dir / (param_name + '.csv')).open(mode='w', encoding='utf8')
-        param_files[param_name].write('cycle,value,objective,criticality,decider,is min,step,steps,decision\n')
+        if system.dump_writer:
+            param_files[param_name] = system.dump_writer.open(
+                output_dir / (param_name + '.csv'),
+                ('cycle', 'value', 'objective', 'criticality', 'decider', 'is min', 'step', 'steps', 'decision'))
         model.set_parameter(param_name, p_init[param_name])
         inf, sup = model.get_parameter_domain(param_name)
         if not free_param or free_param == param_name:
@@ -267,23 +364,31 @@ def evaluate_model_calicoba(model: models.Model, p_init: test_utils.Map, solutio
     start_time = time.time()
     points = []
     unique_points = []
+    evaluations_number = 0
     error_message = ''
     solution_cycle = -1
+    # Detects runs that keep visiting the same points
+    period_detector = test_utils.PeriodDetector(oscillation_window) if oscillation_window else None
+    stalled = False
     for i in range(max_steps):
         cycles_number = i + 1
-        model.update()
         params = {p_name: model.get_parameter(p_name) for p_name in model.parameters_names}
         p = sorted(params.items())
         points.append(p)
         if p not in unique_points:
             unique_points.append(p)
-        objs = {
-            obj_name: obj_function(**{
-                out_name: model.get_output(out_name)
-                for out_name in obj_function.outputs_names
-            })
-            for obj_name, obj_function in obj_functions.items()
-        }
+        # Known points are not evaluated again if objectives are not noisy
+        objs = system.lookup(params)
+        if objs is None:
+            model.update()
+            evaluations_number += 1
+            objs = {
+                obj_name: obj_function(**{
+                    out_name: model.get_output(out_name)
+                    for out_name in obj_function.outputs_names
+                })
+                for obj_name, obj_function in obj_functions.items()
+            }
 
         logger.debug('Objectives: ' + str(objs.items()))
 
@@ -296,6 +401,9 @@ def evaluate_model_calicoba(model: models.Model, p_init: test_utils.Map, solutio
             error_message = str(e)
             break
         logger.debug(suggestions)
+        if period_detector:
+            # Criticalities lie in [0, 1] whatever the objectives’ scales, unlike raw objective values
+            period_detector.append([v for _, v in p] + [system.criticality])
 
         for param_name, suggestion in suggestions.items():
             if not suggestion:
@@ -306,11 +414,10 @@ def evaluate_model_calicoba(model: models.Model, p_init: test_utils.Map, solutio
                 solution_found = True
                 solution_cycle = i + 1
             else:
-                param_files[param_name].write(
-                    f'{i},{model.get_parameter(param_name)},{s.selected_objective},'
-                    f'{s.criticality},{s.agent.parameter_value},{int(s.agent.is_local_minimum)},'
-                    f'{s.step},{s.steps_number},{s.decision}\n'
-                )
+                if param_files:
+                    param_files[param_name].write(i, model.get_parameter(param_name), s.selected_objective,
+                                                  s.criticality, s.agent.parameter_value,
+                                                  int(s.agent.is_local_minimum), s.step, s.steps_number, s.decision)
                 model.set_parameter(param_name, s.next_point)
                 if s.local_min_found:
                     threshold = 0.1
@@ -321,14 +428,18 @@ def evaluate_model_calicoba(model: models.Model, p_init: test_utils.Map, solutio
         if solution_found or error_message:
             break
 
+        if period_detector and period_detector.is_full and period_detector.has_converged:
+            stalled = True
+            break
+
         if step_by_step:
             input('Paused')
 
     total_time = time.time() - start_time
 
-    for param_name in model.parameters_names:
-        param_files[param_name].write(
-            f'{cycles_number + 1},{model.get_parameter(param_name)},,,,1,,,\n')
+    for param_name, param_file in param_files.items():
+        param_file.write(cycles_number + 1, model.get_parameter(param_name), '', '', '', 1, '', '', '')
+    system.close()
 
     return exp_utils.ExperimentResult(
         solution_found=solution_found,
@@ -339,9 +450,60 @@ def evaluate_model_calicoba(model: models.Model, p_init: test_utils.Map, solutio
         points_number=len(points),
         unique_points_number=len(unique_points),
         error_message=error_message,
+        evaluations_number=evaluations_number,
+        stalled=stalled,
     )
 
 
+def evaluate_model_calicoba_lockstep(model: models.Model, p_inits: typ.Sequence[test_utils.Map],
+                                     solutions: typ.Sequence[test_utils.Map], *, max_steps: int = DEFAULT_MAX_STEPS_NB,
+                                     seed: int = None, noisy: bool = False, noise_mean: float = DEFAULT_NOISE_MEAN,
+                                     noise_stdev: float = DEFAULT_NOISE_STDEV, freeze_after_minima: int = None,
+                                     surrogate: str = None,
+                                     step_controller: str = calicoba.agents.STEP_CONTROLLER_FIXED,
+                                     logging_level: int = logging.INFO) \
+        -> typ.List[exp_utils.ExperimentResult]:
+    param_names = list(model.parameters_names)
+    output_names = sorted(model.outputs_names)
+    engine = calicoba.multistart.MultiStartEngine(
+        calicoba.CalicobaConfig(seed=seed, logging_level=logging_level, freeze_after_minima=freeze_after_minima,
+                                deterministic=not noisy, surrogate=surrogate, step_controller=step_controller),
+        parameters={param_name: model.get_parameter_domain(param_name) for param_name in param_names},
+        objectives={'obj_' + output_name: model.get_output_domain(output_name) for output_name in output_names},
+        starting_points=np.array([[p_init[param_name] for param_name in param_names] for p_init in p_inits]),
+    )
+
+    def evaluate(values: np.ndarray) -> np.ndarray:
+        outputs_values = model.evaluate_many(**dict(zip(param_names, values.T)))
+        outputs = np.stack([outputs_values[output_name] for output_name in output_names], axis=1)
+        if noisy:
+            outputs += np.random.normal(noise_mean, noise_stdev, size=outputs.shape)
+        return outputs
+
+    def is_solution(params: test_utils.Map) -> bool:
+        threshold = 0.1
+        return any(abs(solution['p1'] - params['p1']) < threshold for solution in solutions)
+
+    start_time = time.time()
+    results = engine.run(evaluate, max_steps, is_solution=is_solution)
+    run_time = (time.time() - start_time) / len(results)
+
+    return [
+        exp_utils.ExperimentResult(
+            solution_found=result.solution_found,
+            error=result.error_message != '',
+            cycles_number=result.cycles_number,
+            solution_cycle=result.solution_cycle,
+            time=run_time,
+            points_number=result.points_number,
+            unique_points_number=result.unique_points_number,
+            error_message=result.error_message,
+            evaluations_number=result.evaluations_number,
+        )
+        for result in results
+    ]
+
+
 def evaluate_model_other(method: str, model: models.Model, p_init: test_utils.Map,
                          solutions: typ.Sequence[test_utils.Map], *, noisy: bool = False,
                          noise_mean: float = DEFAULT_NOISE_MEAN, noise_stdev: float = DEFAULT_NOISE_STDEV,
@@ -432,6 +594,7 @@ def evaluate_model_other(method: str, model: models.Model, p_init: test_utils.Ma
             time=time.time() - start_time,
             points_number=res.nfev,
             unique_points_number=res.nfev,
+            evaluations_number=res.nfev,
         )
     raise ValueError(f'unknown method "{method}"')
 
@@ -20,6 +20,13 @@ class ExperimentsConfig:
     seed: typ.Optional[int] = None
     parameters_values: typ.Sequence[str] = ()
     free_parameter: typ.Optional[str] = None
+    lockstep: bool = False
+    freeze_after_minima: typ.Optional[int] = None
+    surrogate: typ.Optional[str] = None
+    step_controller: str = 'fixed'
+    oscillation_window: typ.Optional[int] = None
+    # Whether dumped data goes into a single campaign log instead of one directory per run
+    campaign_log: bool = False
 
 
 @dataclasses.dataclass(frozen=True)
@@ -32,3 +39,6 @@ class ExperimentResult:
     points_number: int = None
     unique_points_number: int = None
     error_message: str = None
+    evaluations_number: int = None
+    # Whether the run was stopped because it kept visiting the same points
+    stalled: bool = False
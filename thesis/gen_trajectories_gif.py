@@ -6,32 +6,51 @@ import matplotlib.pyplot as plt
 from PIL import Image
 
 import calicoba.agents as calicoba
+import campaign_log
 import models
 import plot
 
 FRAMES_DIR = 'frames'
 
 
-def load_data(directory: pathlib.Path, model: models.Model, param_name: str, out_names: typ.Iterable[str],
+def iter_runs(path: pathlib.Path, model: models.Model, param_name: str) \
+        -> typ.Iterator[typ.Tuple[str, typ.List[str]]]:
+    """Iterate over the runs of the given model in a directory of runs directories or a campaign log.
+
+    :return: An iterator of pairs of run names and lines of the parameter’s CSV file.
+    """
+    if path.is_file():
+        log = campaign_log.CampaignLog(path)
+        for run in log.runs:
+            model_id, run_name = run.split('/', 1)
+            if model_id == model.id and run_name.startswith('p1='):
+                yield run_name, log.read_table(run, param_name)
+    else:
+        for dir_name in path.glob('p1=*'):
+            if dir_name.is_dir():
+                with (dir_name / f'{param_name}.csv').open(encoding='utf8') as f:
+                    yield dir_name.name, f.read().splitlines()
+
+
+def load_data(path: pathlib.Path, model: models.Model, param_name: str, out_names: typ.Iterable[str],
               proportion: int, normalizers):
-    print(f'Loading data from {directory}')
+    print(f'Loading data from {path}')
     max_cycles = 0
     all_xs = {}
     all_ys = {}
 
-    for i, dir_name in enumerate(directory.glob('p1=*')):
-        if not dir_name.is_dir() or i % proportion != 0:
+    for i, (run_name, lines) in enumerate(iter_runs(path, model, param_name)):
+        if i % proportion != 0:
             continue
         xs = []
         ys = {out_name: [] for out_name in out_names}
-        with (dir_name / f'{param_name}.csv').open(encoding='utf8') as f:
-            for line in f.readlines()[1:]:
-                _, param_value, *_ = line.strip().split(',')
-                param_value = float(param_value)
-                xs.append(param_value)
-                for out_name, out_value in model.evaluate(**{param_name: param_value}).items():
-                    ys[out_name].append(normalizers[out_name](out_value))
-        k = float(dir_name.name.split('=')[1])
+        for line in lines[1:]:
+            _, param_value, *_ = line.strip().split(',')
+            param_value = float(param_value)
+            xs.append(param_value)
+            for out_name, out_value in model.evaluate(**{param_name: param_value}).items():
+                ys[out_name].append(normalizers[out_name](out_value))
+        k = float(run_name.split('=')[1])
         max_cycles = max(max_cycles, len(xs))
         all_xs[k] = xs
         all_ys[k] = ys
@@ -89,7 +108,7 @@ def main():
         description='Generate GIF image of trajectory of points for selected model and data.')
     arg_parser.add_argument('model_id', metavar='MODEL', type=str, help='ID of the model to plot')
     arg_parser.add_argument(dest='path', type=pathlib.Path,
-                            help='path to the directory containing the runs directories')
+                            help='path to the directory containing the runs directories, or to a campaign log')
     arg_parser.add_argument('-b', '--bounds', dest='bounds', metavar='BOUND', nargs=2, type=float,
                             help='the lower and upper bounds for the parameter’s domain', default=None)
     arg_parser.add_argument('-p', '--precision', dest='sampling_precision', metavar='PRECISION', type=int, default=200,
@@ -121,7 +140,7 @@ def main():
     normalizer_functions = {output_name: calicoba.BoundNormalizer(*model.get_output_domain(output_name))
                             for output_name in model.outputs_names}
 
-    out_dir = path / 'animation'
+    out_dir = (path.parent / model_id if path.is_file() else path) / 'animation'
     longest_cycles, p_xs, p_ys = load_data(path, model, param_name, out_names, proportion, normalizer_functions)
     generate_frames(model, (p_min, p_max), p_xs, p_ys, longest_cycles, sampling_precision, full, out_dir)
     generate_gif(frames_delay, out_dir)
@@ -1,6 +1,8 @@
 import abc
 import typing as typ
 
+import numpy as np
+
 
 class Model(abc.ABC):
     def __init__(self, ident: str, parameters_domains: typ.Dict[str, typ.Tuple[float, float]],
@@ -33,6 +35,29 @@ class Model(abc.ABC):
     def _evaluate(self, **kwargs: float) -> typ.Dict[str, float]:
         pass
 
+    def evaluate_many(self, **kwargs: np.ndarray) -> typ.Dict[str, np.ndarray]:
+        """Evaluate the model on several points at once.
+
+        :param kwargs: The values of each parameter, one per point.
+        :return: The values of each output, one per point. They may differ from those returned by evaluate()
+            in the last bits, NumPy and the math module not always rounding the same way. Unit tests check
+            that both agree up to a relative error of 1e-12 for all simple models.
+        """
+        if any(map(lambda k: k not in self.__parameters, kwargs)):
+            raise KeyError('Invalid parameter name')
+        for p, v in kwargs.items():
+            inf, sup = self.get_parameter_domain(p)
+            kwargs[p] = np.clip(np.asarray(v, dtype=np.float64), inf, sup)
+        return self._evaluate_many(**kwargs)
+
+    def _evaluate_many(self, **kwargs: np.ndarray) -> typ.Dict[str, np.ndarray]:
+        """Evaluate the model on each point in turn. Subclasses may override this method to evaluate all points
+        at once.
+        """
+        names = list(kwargs)
+        outputs = [self._evaluate(**dict(zip(names, values))) for values in zip(*(v.tolist() for v in kwargs.values()))]
+        return {name: np.array([o[name] for o in outputs], dtype=np.float64) for name in self.__outputs}
+
     @property
     def parameters_names(self) -> typ.List[str]:
         return list(self.__parameters.keys())
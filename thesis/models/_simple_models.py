@@ -1,5 +1,7 @@
 import math
+import typing as typ
 
+import numpy as np
 import scipy.optimize
 
 from . import _model
@@ -139,6 +141,11 @@ class ModelGramacyAndLee2012(_model.Model):
             'o1': (math.sin(10 * math.pi * p1) / (2 * p1)) + (p1 - 1) ** 4,
         }
 
+    def _evaluate_many(self, p1: np.ndarray):
+        return {
+            'o1': (np.sin(10 * np.pi * p1) / (2 * p1)) + np.float_power(p1 - 1, 4),
+        }
+
 
 class AckleyFunction(_model.Model):
     def __init__(self, dimensions: int = 1, a: float = 20, b: float = 0.2, c: float = 2 * math.pi):
@@ -159,6 +166,14 @@ class AckleyFunction(_model.Model):
             'o1': -self._a * math.exp(e1) - math.exp(e2) + self._a + math.exp(1),
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        d = len(self.parameters_names)
+        e1 = -self._b * np.sqrt(sum(p ** 2 for p in params.values()) / d)
+        e2 = sum(np.cos(self._c * p) for p in params.values()) / d
+        return {
+            'o1': -self._a * np.exp(e1) - np.exp(e2) + self._a + math.exp(1),
+        }
+
 
 class LevyFunction(_model.Model):
     def __init__(self, dimensions: int = 1):
@@ -178,6 +193,16 @@ class LevyFunction(_model.Model):
             'o1': a + b + c,
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        d = len(self.parameters_names)
+        w = [1 + (p - 1) / 4 for _, p in sorted(params.items(), key=lambda e: int(e[0][1:]))]
+        a = np.sin(np.pi * w[0]) ** 2
+        b = sum(((wi - 1) ** 2) * (1 + 10 * np.sin(np.pi * wi + 1) ** 2) for wi in w)
+        c = ((w[d - 1] - 1) ** 2) * (1 + np.sin(2 * np.pi * w[d - 1]) ** 2)
+        return {
+            'o1': a + b + c,
+        }
+
 
 class RastriginFunction(_model.Model):
     def __init__(self, dimensions: int = 1):
@@ -193,6 +218,12 @@ class RastriginFunction(_model.Model):
             'o1': 10 * d + sum(p ** 2 - 10 * math.cos(2 * math.pi * p) for p in params.values()),
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        d = len(self.parameters_names)
+        return {
+            'o1': 10 * d + sum(p ** 2 - 10 * np.cos(2 * np.pi * p) for p in params.values()),
+        }
+
 
 class LangermannFunction(_model.Model):
     def __init__(self, dimensions: int = 1):
@@ -269,6 +300,14 @@ class WeierstrassFunction(_model.Model):
             )
         }
 
+    def _evaluate_many(self, p1: np.ndarray):
+        return {
+            'o1': sum(
+                (self._a ** n) * np.cos((self._b ** n) * np.pi * p1)
+                for n in range(self._precision)
+            )
+        }
+
 
 class MultiObj(_model.Model):
     def __init__(self):
@@ -316,6 +355,29 @@ class MultiObj(_model.Model):
             # )  # Weierstrass
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        p1 = params[self.parameters_names[0]]
+        d = len(self.parameters_names)
+
+        a1 = 20
+        b1 = 0.2
+        c1 = 2 * math.pi
+
+        e1 = -b1 * np.sqrt(sum(p ** 2 for p in params.values()) / d)
+        e2 = sum(np.cos(c1 * p) for p in params.values()) / d
+
+        w = [1 + (p - 1) / 4 for _, p in sorted(params.items(), key=lambda e: int(e[0][1:]))]
+        a2 = np.sin(np.pi * w[0]) ** 2
+        b2 = sum(((wi - 1) ** 2) * (1 + 10 * np.sin(np.pi * wi + 1) ** 2) for wi in w)
+        c2 = ((w[d - 1] - 1) ** 2) * (1 + np.sin(2 * np.pi * w[d - 1]) ** 2)
+
+        return {
+            'o1': (np.sin(10 * np.pi * p1) / (2 * p1)) + np.float_power(p1 - 1, 4),  # Gramacy & Lee
+            'o2': -a1 * np.exp(e1) - np.exp(e2) + a1 + math.exp(1),  # Ackley
+            'o3': 10 * d + sum(p ** 2 - 10 * np.cos(2 * np.pi * p) for p in params.values()),  # Rastrigin
+            'o4': a2 + b2 + c2,  # Levy
+        }
+
 
 class ZitzlerFunction3(_model.Model):
     def __init__(self):
@@ -340,6 +402,17 @@ class ZitzlerFunction3(_model.Model):
             'f2': f2,
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        x1 = params['p1']
+        f1 = x1
+        g = 1 + 9 / 29 * sum(params['p' + str(i + 1)] for i in range(1, self._d))
+        h = 1 - np.sqrt(f1 / g) - (f1 / g) * np.sin(10 * np.pi * f1)
+        f2 = g * h
+        return {
+            'f1': f1,
+            'f2': f2,
+        }
+
 
 class ZitzlerFunction6(_model.Model):
     def __init__(self):
@@ -364,6 +437,17 @@ class ZitzlerFunction6(_model.Model):
             'f2': f2,
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        x1 = params['p1']
+        f1 = 1 - np.exp(-4 * x1) * np.float_power(np.sin(6 * np.pi * x1), 6)
+        g = 1 + 9 * (sum(params['p' + str(i + 1)] for i in range(1, self._d)) / 9) ** 0.25
+        h = 1 - (f1 / g) ** 2
+        f2 = g * h
+        return {
+            'f1': f1,
+            'f2': f2,
+        }
+
 
 class ViennetFunction(_model.Model):
     def __init__(self):
@@ -387,6 +471,15 @@ class ViennetFunction(_model.Model):
             'f3': 1 / (x ** 2 + y ** 2 + 1) - 1.1 * math.exp(-(x ** 2 + y ** 2)),
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        x = params['p1']
+        y = 0
+        return {
+            'f1': 0.5 * (x ** 2 + y ** 2) + np.sin(x ** 2 + y ** 2),
+            'f2': ((3 * x - 2 * y + 4) ** 2) / 8 + ((x - y + 1) ** 2) / 27 + 15,
+            'f3': 1 / (x ** 2 + y ** 2 + 1) - 1.1 * np.exp(-(x ** 2 + y ** 2)),
+        }
+
 
 class GLOffset(_model.Model):
     def __init__(self):
@@ -401,6 +494,11 @@ class GLOffset(_model.Model):
             'o1': (math.sin(10 * math.pi * p1) / (2 * p1)) + (p1 - 1) ** 4,
         }
 
+    def _evaluate_many(self, p1: np.ndarray):
+        return {
+            'o1': (np.sin(10 * np.pi * p1) / (2 * p1)) + np.float_power(p1 - 1, 4),
+        }
+
 
 class AckleyOffset(_model.Model):
     def __init__(self, dimensions: int = 1, a: float = 20, b: float = 0.2, c: float = 2 * math.pi):
@@ -421,6 +519,14 @@ class AckleyOffset(_model.Model):
             'o1': -self._a * math.exp(e1) - math.exp(e2) + self._a + math.exp(1),
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        d = len(self.parameters_names)
+        e1 = -self._b * np.sqrt(sum(p ** 2 for p in params.values()) / d)
+        e2 = sum(np.cos(self._c * p) for p in params.values()) / d
+        return {
+            'o1': -self._a * np.exp(e1) - np.exp(e2) + self._a + math.exp(1),
+        }
+
 
 class RastriginOffset(_model.Model):
     def __init__(self, dimensions: int = 1):
@@ -436,6 +542,12 @@ class RastriginOffset(_model.Model):
             'o1': 10 * d + sum(p ** 2 - 10 * math.cos(2 * math.pi * p) for p in params.values()),
         }
 
+    def _evaluate_many(self, **params: np.ndarray):
+        d = len(self.parameters_names)
+        return {
+            'o1': 10 * d + sum(p ** 2 - 10 * np.cos(2 * np.pi * p) for p in params.values()),
+        }
+
 
 class SimpleModelsFactory(_model.ModelFactory):
     __models = {
@@ -462,6 +574,10 @@ class SimpleModelsFactory(_model.ModelFactory):
         'rastrigin_offset': RastriginOffset,
     }
 
+    @property
+    def models_ids(self) -> typ.List[str]:
+        return list(self.__models)
+
     def generate_model(self, model_id: str, *args, **kwargs):
         return self.__models[model_id](*args, **kwargs)
 
@@ -5,12 +5,15 @@ import typing as typ
 import matplotlib.pyplot as plt
 
 import calicoba.agents as calicoba
+import campaign_log
 import models
 import plot
 
 arg_parser = argparse.ArgumentParser(description='Plot all visited points on a 1D function.')
 arg_parser.add_argument(dest='path', type=pathlib.Path,
-                        help='path to the directory containing the parameter’s CSV file')
+                        help='path to the directory containing the parameter’s CSV file, or to a campaign log')
+arg_parser.add_argument('-r', '--run', dest='run', type=str,
+                        help='name of the run to display if path is a campaign log, i.e. "<model ID>/<P(0)>"')
 arg_parser.add_argument('-m', '--model', dest='model_id', type=str,
                         help='ID of the model to display if it cannot be guessed from path')
 arg_parser.add_argument('-b', '--bounds', dest='bounds', metavar='BOUND', nargs=2, type=float,
@@ -21,7 +24,8 @@ arg_parser.add_argument('-p', '--precision', dest='sampling_precision', metavar=
 
 args = arg_parser.parse_args()
 path: pathlib.Path = args.path
-model_id: str = args.model_id or path.parent.name
+run: typ.Optional[str] = args.run
+model_id: str = args.model_id or (run.split('/')[0] if run else path.parent.name)
 bounds: typ.Tuple[float, float] = args.bounds
 split_figures: bool = args.split
 sampling_precision: int = args.sampling_precision
@@ -40,21 +44,27 @@ p_ys = {out_name: [] for out_name in out_names}
 normalizers = {output_name: calicoba.BoundNormalizer(*model.get_output_domain(output_name))
                for output_name in model.outputs_names}
 new_chain_indices = []
-with (path / f'{param_name}.csv').open(encoding='utf8') as f:
-    for line in f.readlines()[1:]:
-        cycle, param_value, _, _, listened_point_value, _, _, _, message = line.strip().split(',')
-        param_value = float(param_value)
-        if 'chain' in message:
-            new_chain_indices.append(int(cycle))
-        if listened_point_value != '':
-            listened_point_value = float(listened_point_value)
-            listened_points_xs.append(listened_point_value)
-        else:
-            listened_points_xs.append(None)
-        p_xs.append(param_value)
-        for out_name, out_value in model.evaluate(**{param_name: param_value}).items():
-            p_ys[out_name].append(normalizers[out_name](out_value))
-    new_chain_indices.append(len(p_xs))
+if run:
+    lines = campaign_log.CampaignLog(path).read_table(run, param_name)
+    # Figures go where the run’s directory would be
+    path = path.parent / run
+else:
+    with (path / f'{param_name}.csv').open(encoding='utf8') as f:
+        lines = f.read().splitlines()
+for line in lines[1:]:
+    cycle, param_value, _, _, listened_point_value, _, _, _, message = line.strip().split(',')
+    param_value = float(param_value)
+    if 'chain' in message:
+        new_chain_indices.append(int(cycle))
+    if listened_point_value != '':
+        listened_point_value = float(listened_point_value)
+        listened_points_xs.append(listened_point_value)
+    else:
+        listened_points_xs.append(None)
+    p_xs.append(param_value)
+    for out_name, out_value in model.evaluate(**{param_name: param_value}).items():
+        p_ys[out_name].append(normalizers[out_name](out_value))
+new_chain_indices.append(len(p_xs))
 
 if p_xs:
     colors = []
@@ -65,7 +75,7 @@ if p_xs:
     if split_figures:
         dest_path = path / 'figures'
         if not dest_path.exists():
-            dest_path.mkdir()
+            dest_path.mkdir(parents=True)
         else:
             for file in dest_path.glob('*.png'):
                 if file.is_file():
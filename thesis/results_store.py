@@ -0,0 +1,254 @@
+"""Columnar storage of the results of experiment runs.
+
+A results store is a directory holding one file per column, each being the raw array of the column’s values
+for all runs, so that runs may be appended and columns loaded as NumPy arrays without parsing any text.
+String columns hold integer codes, the strings being listed in a separate file, one JSON string per line,
+in the order of their codes. A schema file lists the columns and their types, along with the number of rows
+and the size of each strings file written by the last complete flush. Data written past these by a flush
+that did not complete is ignored when loading and overwritten by the next flush.
+"""
+import json
+import os
+import pathlib
+import typing as typ
+
+import numpy as np
+
+import experiments_utils as exp_utils
+
+SCHEMA_FILE_NAME = 'schema.json'
+FORMAT_VERSION = 1
+
+# Type of each column, None for string columns
+COLUMNS: typ.Dict[str, typ.Optional[np.dtype]] = {
+    'method': None,
+    'model': None,
+    'noisy': np.dtype('<u1'),
+    'p_init': None,
+    'solution_found': np.dtype('<u1'),
+    'error': np.dtype('<u1'),
+    'stalled': np.dtype('<u1'),
+    'cycles_number': np.dtype('<i8'),
+    'solution_cycle': np.dtype('<i8'),
+    'time': np.dtype('<f8'),
+    # -1 if unknown
+    'points_number': np.dtype('<i8'),
+    # -1 if unknown
+    'unique_points_number': np.dtype('<i8'),
+    # -1 if unknown
+    'evaluations_number': np.dtype('<i8'),
+    'error_message': None,
+}
+_CODE_TYPE = np.dtype('<i4')
+
+
+class Results:
+    def __init__(self, columns: typ.Dict[str, np.ndarray], categories: typ.Dict[str, typ.List[str]]):
+        """Columns of results loaded from a store.
+
+        :param columns: The array of each column, codes for string columns.
+        :param categories: The strings of each string column, in the order of their codes.
+        """
+        self._columns = columns
+        self._categories = categories
+
+    def __len__(self):
+        return len(self._columns['time'])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Return the values of a column. Strings are returned as an array of objects."""
+        if column in self._categories:
+            return np.array(self._categories[column], dtype=object)[self._columns[column]]
+        return self._columns[column]
+
+    def codes(self, column: str) -> typ.Tuple[np.ndarray, typ.List[str]]:
+        """Return the codes of a string column along with the strings they stand for."""
+        return self._columns[column], self._categories[column]
+
+    def select(self, mask: np.ndarray) -> 'Results':
+        """Return the results of the rows selected by the given boolean mask or indices."""
+        return Results({name: column[mask] for name, column in self._columns.items()}, self._categories)
+
+    def where(self, column: str, values: typ.Iterable[str]) -> 'Results':
+        """Return the results whose string column holds one of the given values."""
+        wanted = set(values)
+        categories = self._categories[column]
+        wanted_codes = [code for code, value in enumerate(categories) if value in wanted]
+        return self.select(np.isin(self._columns[column], wanted_codes))
+
+    def groups(self, *columns: str) -> typ.Iterator[typ.Tuple[typ.Tuple[str, ...], 'Results']]:
+        """Iterate over the results grouped by the values of the given string columns, in order of these values."""
+        if not len(self):
+            return
+        codes = np.stack([self._columns[column] for column in columns], axis=1)
+        keys, inverse = np.unique(codes, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        groups = [(tuple(self._categories[column][code] for column, code in zip(columns, key.tolist())),
+                   order[bounds[i]:bounds[i + 1]])
+                  for i, key in enumerate(keys)]
+        for key, indices in sorted(groups, key=lambda group: group[0]):
+            yield key, self.select(indices)
+
+
+class ResultsStore:
+    def __init__(self, directory: pathlib.Path):
+        """Open a results store, creating it if the directory does not exist.
+        Appended rows are buffered until flush() or close() is called.
+
+        :param directory: The store’s directory.
+        :raise ValueError: If the directory is not a results store or its version is not supported.
+        """
+        self._directory = directory
+        if not (directory / SCHEMA_FILE_NAME).exists():
+            directory.mkdir(parents=True, exist_ok=True)
+            self._write_schema(0, {name: 0 for name, dtype in COLUMNS.items() if dtype is None})
+        schema = self._read_schema()
+        # Number of rows and size in bytes of each strings file written by the last complete flush
+        self._rows_number = schema['rows']
+        self._categories_sizes = schema['categories_sizes']
+        self._categories = {name: self._read_categories(name, size) for name, size in self._categories_sizes.items()}
+        self._codes = {name: {value: code for code, value in enumerate(categories)}
+                       for name, categories in self._categories.items()}
+        # Number of categories of each string column already written
+        self._written_categories_numbers = {name: len(categories) for name, categories in self._categories.items()}
+        self._rows: typ.Dict[str, list] = {name: [] for name in COLUMNS}
+
+    @property
+    def directory(self) -> pathlib.Path:
+        return self._directory
+
+    def append(self, method: str, model: str, p_init: str, result: exp_utils.ExperimentResult, noisy: bool = False):
+        """Buffer the result of a run."""
+        values = {
+            'method': method,
+            'model': model,
+            'noisy': noisy,
+            'p_init': p_init,
+            'solution_found': result.solution_found,
+            'error': result.error,
+            'stalled': result.stalled,
+            'cycles_number': result.cycles_number,
+            'solution_cycle': result.solution_cycle,
+            'time': result.time,
+            'points_number': result.points_number,
+            'unique_points_number': result.unique_points_number,
+            'evaluations_number': result.evaluations_number,
+            'error_message': result.error_message or '',
+        }
+        for name, value in values.items():
+            if COLUMNS[name] is None:
+                value = self._encode(name, value)
+            elif value is None:
+                value = -1
+            self._rows[name].append(value)
+
+    def flush(self):
+        """Append the buffered results to the store’s files.
+        Data left past the last complete flush by a flush that did not complete is overwritten.
+        """
+        rows_number = len(self._rows['time'])
+        if not rows_number:
+            return
+        categories_sizes = dict(self._categories_sizes)
+        for name, categories in self._categories.items():
+            written_number = self._written_categories_numbers[name]
+            if written_number < len(categories):
+                data = ''.join(json.dumps(value) + '\n' for value in categories[written_number:]).encode('UTF-8')
+                categories_sizes[name] += self._append(self._get_categories_path(name),
+                                                       self._categories_sizes[name], data)
+        for name, dtype in COLUMNS.items():
+            dtype = dtype or _CODE_TYPE
+            self._append(self._get_column_path(name), self._rows_number * dtype.itemsize,
+                         np.array(self._rows[name], dtype=dtype).tobytes())
+        # Rows are only part of the store once the schema lists them
+        self._write_schema(self._rows_number + rows_number, categories_sizes)
+        self._rows_number += rows_number
+        self._categories_sizes = categories_sizes
+        self._written_categories_numbers = {name: len(categories) for name, categories in self._categories.items()}
+        self._rows = {name: [] for name in COLUMNS}
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def load(self, methods: typ.Iterable[str] = None, models: typ.Iterable[str] = None) -> Results:
+        """Load the results written so far.
+
+        :param methods: If set, only results of these methods are returned.
+        :param models: If set, only results on these models are returned.
+        :return: The results.
+        """
+        schema = self._read_schema()
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            path = self._get_column_path(name)
+            columns[name] = np.fromfile(path, dtype=dtype or _CODE_TYPE, count=schema['rows']) if path.exists() \
+                else np.zeros(0, dtype=dtype or _CODE_TYPE)
+        categories = {name: self._read_categories(name, size) for name, size in schema['categories_sizes'].items()}
+        for name, dtype in COLUMNS.items():
+            if dtype is not None and dtype.kind == 'u':
+                columns[name] = columns[name].astype(bool)
+        results = Results(columns, categories)
+        if methods is not None:
+            results = results.where('method', methods)
+        if models is not None:
+            results = results.where('model', models)
+        return results
+
+    def _encode(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self._categories[column].append(value)
+        return code
+
+    def _read_schema(self) -> dict:
+        schema = json.loads((self._directory / SCHEMA_FILE_NAME).read_text(encoding='UTF-8'))
+        if schema.get('version') != FORMAT_VERSION:
+            raise ValueError(f'unsupported results store version {schema.get("version")}')
+        return schema
+
+    def _write_schema(self, rows_number: int, categories_sizes: typ.Dict[str, int]):
+        """Write the schema file. It is replaced at once, so that it never lists rows that were not fully written."""
+        schema = {
+            'version': FORMAT_VERSION,
+            'columns': {name: dtype.str if dtype else 'str' for name, dtype in COLUMNS.items()},
+            'rows': rows_number,
+            'categories_sizes': categories_sizes,
+        }
+        path = self._directory / SCHEMA_FILE_NAME
+        temp_path = path.with_name(path.name + '.tmp')
+        temp_path.write_text(json.dumps(schema), encoding='UTF-8')
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _append(path: pathlib.Path, size: int, data: bytes) -> int:
+        """Write data to a file after its first size bytes, dropping any byte that follows them.
+
+        :return: The number of written bytes.
+        """
+        with path.open(mode='ab') as f:
+            f.truncate(size)
+            f.write(data)
+        return len(data)
+
+    def _read_categories(self, column: str, size: int) -> typ.List[str]:
+        path = self._get_categories_path(column)
+        if not path.exists():
+            return []
+        with path.open(mode='rb') as f:
+            return [json.loads(line) for line in f.read(size).splitlines()]
+
+    def _get_column_path(self, column: str) -> pathlib.Path:
+        return self._directory / f'{column}.bin'
+
+    def _get_categories_path(self, column: str) -> pathlib.Path:
+        return self._directory / f'{column}.values'
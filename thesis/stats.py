@@ -1,12 +1,16 @@
 #!/usr/bin/python3
+from __future__ import annotations
+
+import argparse
 import dataclasses
 import math
 import pathlib
-import sys
 import typing as typ
 
 import numpy as np
 
+import results_store
+
 
 @dataclasses.dataclass(frozen=True)
 class StatsObject:
@@ -19,33 +23,41 @@ class StatsObject:
 
 
 class DataSet:
-    def __init__(self, file: pathlib.Path):
-        self.total_runs = 0
-        self.successes_number = 0
-        self.errors_number = 0
-        self.cycles_numbers = []
-        self.soluction_cycles = []
-        self.speeds = []
-        self.visited_points_numbers = []
-        self.unique_visited_points_number = []
-        self.error_messages = {}
-
+    def __init__(self, results: results_store.Results):
+        """Compute the statistics of the given results."""
+        solution_found = results['solution_found']
+        errors = results['error']
+        self.total_runs = len(results)
+        self.successes_number = int(np.count_nonzero(solution_found))
+        self.errors_number = int(np.count_nonzero(errors))
+        self.cycles_numbers = results['cycles_number']
+        self.soluction_cycles = results['solution_cycle']
+        self.speeds = results['time']
+        self.visited_points_numbers = results['points_number']
+        self.unique_visited_points_number = results['unique_points_number']
+        error_messages = results['error_message']
+        has_message = error_messages != ''
+        self.error_messages = dict(zip(results['p_init'][has_message].tolist(), error_messages[has_message].tolist()))
+
+    @classmethod
+    def from_csv(cls, file: pathlib.Path) -> DataSet:
+        """Compute the statistics of the results in a summary CSV file written by experiments.py."""
+        columns = {name: [] for name in ('p_init', 'solution_found', 'error', 'cycles_number', 'solution_cycle',
+                                         'time', 'points_number', 'unique_points_number', 'error_message')}
         with file.open(encoding='utf8') as f:
             for line in f.readlines()[1:]:
-                (p0, solution_found, error, cycles_number, solution_cycle,
-                 speed, nb_points, unique_points, error_message) = line.split(',', maxsplit=8)
-                if int(solution_found):
-                    self.successes_number += 1
-                if int(error):
-                    self.errors_number += 1
-                self.total_runs += 1
-                self.cycles_numbers.append(int(cycles_number))
-                self.soluction_cycles.append(int(solution_cycle))
-                self.speeds.append(float(speed))
-                self.visited_points_numbers.append(int(nb_points))
-                self.unique_visited_points_number.append(int(unique_points))
-                if error_message:
-                    self.error_messages[p0] = error_message
+                for name, value in zip(columns, line.rstrip('\n').split(',', maxsplit=8)):
+                    columns[name].append(value)
+        rows_number = len(columns['p_init'])
+        p_inits = columns.pop('p_init')
+        error_messages = [message.strip('"') for message in columns.pop('error_message')]
+        arrays = {name: np.array(values, dtype=np.float64 if name == 'time' else np.int64)
+                  for name, values in columns.items()}
+        for name in ('solution_found', 'error'):
+            arrays[name] = arrays[name].astype(bool)
+        arrays['p_init'] = np.arange(rows_number)
+        arrays['error_message'] = np.arange(rows_number)
+        return cls(results_store.Results(arrays, {'p_init': p_inits, 'error_message': error_messages}))
 
     @property
     def failures_number(self) -> int:
@@ -86,7 +98,7 @@ class DataSet:
         return self._get_stats(self.unique_visited_points_number)
 
     @staticmethod
-    def _get_stats(values: typ.List[typ.Union[int, float]]) -> StatsObject:
+    def _get_stats(values: np.ndarray) -> StatsObject:
         # noinspection PyTypeChecker
         return StatsObject(
             mean=np.mean(values),
@@ -108,16 +120,41 @@ Unique visited points stats: {self.unique_points_stats}
 
 
 def main():
-    path = pathlib.Path(sys.argv[1]).absolute()
-    if path.is_file():
-        print(DataSet(path))
+    arg_parser = argparse.ArgumentParser(description='Print statistics on the results of experiments.')
+    arg_parser.add_argument(dest='path', type=pathlib.Path,
+                            help='path to a results store, a summary CSV file or a directory of summary CSV files')
+    arg_parser.add_argument('--method', metavar='METHOD', dest='methods', nargs='+',
+                            help='methods to show the results of if path is a results store (default: all)')
+    arg_parser.add_argument('-m', '--model', metavar='MODEL_ID', dest='models', nargs='+',
+                            help='models to show the results of if path is a results store (default: all)')
+    args = arg_parser.parse_args()
+
+    path = args.path.absolute()
+    if (path / results_store.SCHEMA_FILE_NAME).is_file():
+        results = results_store.ResultsStore(path).load(methods=args.methods, models=args.models)
+        for (method, model, noisy), group in _group(results):
+            print(f'{method}/{model}{" (noisy)" if noisy else ""}:')
+            print(DataSet(group))
+            print()
+    elif path.is_file():
+        print(DataSet.from_csv(path))
     elif path.is_dir():
         for file in sorted(path.glob('*.csv')):
             if file.is_file():
                 print(f'{file.stem}:')
-                print(DataSet(file))
+                print(DataSet.from_csv(file))
                 print()
 
 
+def _group(results: results_store.Results) \
+        -> typ.Iterator[typ.Tuple[typ.Tuple[str, str, bool], results_store.Results]]:
+    """Group results by method, model and noisiness."""
+    for (method, model), group in results.groups('method', 'model'):
+        noisy = group['noisy']
+        for value in (False, True):
+            if (noisy == value).any():
+                yield (method, model, value), group.select(noisy == value)
+
+
 if __name__ == '__main__':
     main()
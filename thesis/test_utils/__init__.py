@@ -1,4 +1,6 @@
+import collections
 import math
+import numbers
 import typing as typ
 
 import numpy as np
@@ -154,11 +156,20 @@ class SobolSequence:
 
 
 class PeriodDetector:
-    def __init__(self, buffer_size: int):
+    def __init__(self, buffer_size: int, *, threshold: float = 1e-5):
+        """Detects periodic series among the last values of a time series.
+        Values may be numbers or vectors of numbers of the same length.
+
+        :param buffer_size: Number of values to keep.
+        :param threshold: Distance below which a series is considered periodic.
+        """
         self.__buffer_size = buffer_size
-        self.__buffer = []
-        self.__needs_updating = True
-        self.__periods_cache = []
+        self.__threshold = threshold
+        self.__buffer = collections.deque(maxlen=buffer_size)
+        # Sums of the squared distances between each value and the one a period before, indexed by period
+        self.__sums = [0.] * (buffer_size // 2 + 1)
+        self.__appends_number = 0
+        self.__periods_cache = None
 
     @property
     def is_full(self) -> bool:
@@ -166,32 +177,50 @@ class PeriodDetector:
 
     @property
     def has_converged(self) -> bool:
-        return any(d < 1e-5 for d, _ in self.get_period_distances())
-
-    def append(self, value: float):
+        return any(d < self.__threshold for d, _ in self.get_period_distances())
+
+    def append(self, value: typ.Union[float, typ.Sequence[float]]):
+        if not isinstance(value, numbers.Real):
+            value = tuple(value)
+        buffer = self.__buffer
+        sums = self.__sums
+        max_period = len(sums) - 1
         if self.is_full:
-            self.__buffer.pop(0)
-        self.__buffer.append(value)
-        self.__needs_updating = True
+            oldest = buffer[0]
+            for period in range(2, max_period + 1):
+                sums[period] -= self.__squared_distance(oldest, buffer[period])
+        for period in range(2, min(len(buffer), max_period) + 1):
+            sums[period] += self.__squared_distance(value, buffer[-period])
+        buffer.append(value)
+        self.__appends_number += 1
+        # Discard accumulated rounding errors
+        if self.__appends_number % self.__buffer_size == 0:
+            for period in range(2, max_period + 1):
+                sums[period] = sum(self.__squared_distance(buffer[i], buffer[i - period])
+                                   for i in range(period, len(buffer)))
+        self.__periods_cache = None
 
     def values(self) -> typ.List[float]:
         return list(self.__buffer)
 
     def get_period_distances(self) -> typ.Sequence[typ.Tuple[float, int]]:
         """Tries to find the period of the values in the buffer.
+        The distance of a period is the euclidian distance between the series and itself shifted by that period.
+        These distances are updated with each new value instead of being computed from scratch.
 
-        Author: Otunba, R. and Lin, J., 2014. APT: Approximate Period Detection in Time Series. In SEKE (pp. 490-494).
+        Adapted from: Otunba, R. and Lin, J., 2014. APT: Approximate Period Detection in Time Series.
+        In SEKE (pp. 490-494).
 
         :return: A list of distance/period pairs.
         """
-        if not self.__needs_updating:
+        if self.__periods_cache is not None:
             return self.__periods_cache
 
         periods = []
         period = 2
         distance = math.inf
         for i in range(2, (len(self.__buffer) // 2) + 1):
-            current_distance = self.__euclidian_distance(self.__buffer, i, distance)
+            current_distance = math.sqrt(max(0., self.__sums[i]))
             if current_distance < distance:
                 distance = current_distance
                 if i == period + 1:
@@ -200,28 +229,12 @@ class PeriodDetector:
                 periods.append((distance, period))
 
         periods.sort(key=lambda p: p[0])
-        self.__periods_cache = periods
-        self.__needs_updating = False
+        self.__periods_cache = tuple(periods)
 
-        return tuple(periods)
+        return self.__periods_cache
 
     @staticmethod
-    def __euclidian_distance(values: typ.Sequence[float], period: int, current_distance: float) -> float:
-        """Computes the euclidian distance of the given series to a
-        generated series of the given period. The second series is
-        generated using the first "period" elements of the
-        given series.
-
-        Author: Otunba, R. and Lin, J., 2014. APT: Approximate Period Detection in Time Series. In SEKE (pp. 490-494).
-
-        :param values: Series to use.
-        :param period: Period of the series to generate.
-        :param current_distance: Current minimal distance for early stopping.
-        :return: The euclidian distance.
-        """
-        d = 0
-        for i in range(len(values)):
-            d += (values[i] - values[i % period]) ** 2
-            if d >= current_distance ** 2:  # Optimization
-                return current_distance
-        return math.sqrt(d)
+    def __squared_distance(value1, value2) -> float:
+        if isinstance(value1, tuple):
+            return sum((v1 - v2) ** 2 for v1, v2 in zip(value1, value2))
+        return (value1 - value2) ** 2
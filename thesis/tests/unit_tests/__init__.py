@@ -1,3 +1,21 @@
 from ._agents import *
+from ._aggregators import *
+from ._calicoba import *
+from ._campaign_log import *
+from ._chains import *
+from ._data_sources import *
+from ._dumping import *
+from ._models import *
+from ._multistart import *
 from ._normalizers import *
+from ._point_store import *
+from ._points_index import *
+from ._profiling import *
+from ._registry import *
+from ._results_store import *
+from ._revisits import *
+from ._step_controllers import *
+from ._surrogates import *
 from ._test_utils import *
+from ._tracing import *
+from ._utils import *
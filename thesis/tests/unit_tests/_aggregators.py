@@ -0,0 +1,92 @@
+import math
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+import calicoba
+from calicoba.agents import ChebyshevAggregator, MaxAggregator, WeightedSumAggregator
+
+from . import _helpers
+
+CRITICALITIES = np.array([[0.2, 0.8, 0.4], [0.6, 0.1, 0.3]])
+
+
+def outputs(p: float) -> np.ndarray:
+    return np.array([(p - 3) ** 2, 10 * (1 - math.cos(2 * math.pi * p)), abs(p - 2.5)])
+
+
+class AggregatorsTestCase(unittest.TestCase):
+    def test_max(self):
+        aggregator = MaxAggregator()
+        self.assertEqual(0.8, aggregator(CRITICALITIES[0]))
+        np.testing.assert_array_equal([0.8, 0.6], aggregator(CRITICALITIES))
+
+    def test_weighted_sum(self):
+        self.assertAlmostEqual(1.4 / 3, WeightedSumAggregator()(CRITICALITIES[0]))
+        aggregator = WeightedSumAggregator([2, 1, 1])
+        np.testing.assert_array_equal([0.5, 0.25, 0.25], aggregator.weights)
+        np.testing.assert_allclose([0.4, 0.4], aggregator(CRITICALITIES))
+
+    def test_chebyshev(self):
+        np.testing.assert_array_equal(MaxAggregator()(CRITICALITIES), ChebyshevAggregator()(CRITICALITIES))
+        aggregator = ChebyshevAggregator([4, 1, 2])
+        np.testing.assert_array_equal([1, 0.25, 0.5], aggregator.weights)
+        np.testing.assert_allclose([0.2, 0.6], aggregator(CRITICALITIES))
+        np.testing.assert_allclose([0.2 + 0.06, 0.6 + 0.0775], ChebyshevAggregator([4, 1, 2], rho=0.1)(CRITICALITIES))
+
+    def test_invalid_weights(self):
+        for weights in ([], [0, 0], [1, -1], [[1]]):
+            with self.subTest(weights=weights), self.assertRaises(ValueError):
+                WeightedSumAggregator(weights)
+        with self.assertRaises(ValueError):
+            ChebyshevAggregator(rho=-1)
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            calicoba.agents.get_aggregator('median')
+
+
+class CalicobaAggregationTestCase(unittest.TestCase):
+    @staticmethod
+    def _new_system(**kwargs) -> calicoba.Calicoba:
+        return _helpers.new_system(objectives=(('a', 0, 169), ('b', 0, 20), ('c', 0, 12.5)), **kwargs)
+
+    def test_array_same_as_dict(self):
+        system = self._new_system()
+        reference = self._new_system()
+        self.assertEqual(['a', 'b', 'c'], list(system.objectives_names))
+        _helpers.assert_same_suggestions(self, reference, system, cycles=200,
+                                         reference_values=lambda p: dict(zip('abc', outputs(p).tolist())),
+                                         system_values=outputs)
+
+    def test_criticalities(self):
+        system = self._new_system(aggregator=calicoba.agents.AGGREGATOR_WEIGHTED_SUM, objective_weights={'a': 2})
+        suggestion = system.suggest_new_point({'p': 7.3}, outputs(7.3))['p'][0]
+        criticalities = outputs(7.3) / np.array([169, 20, 12.5])
+        point = suggestion.agent
+        np.testing.assert_allclose(criticalities, point.objective_criticalities)
+        self.assertFalse(point.objective_criticalities.flags.writeable)
+        self.assertAlmostEqual(criticalities @ [0.5, 0.25, 0.25], point.criticality)
+        objectives = system.get_agents_for_type(calicoba.agents.ObjectiveAgent)
+        np.testing.assert_allclose(criticalities, [objective.criticality for objective in objectives])
+
+    def test_checkpoint(self):
+        system = self._new_system(aggregator=calicoba.agents.AGGREGATOR_CHEBYSHEV, objective_weights={'b': 0.5})
+        p = 7.3
+        for _ in range(5):
+            p = system.suggest_new_point({'p': p}, outputs(p))['p'][0].next_point
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / 'checkpoint.npz'
+            system.save_checkpoint(path)
+            restored = calicoba.Calicoba.load_checkpoint(path)
+        self.assertEqual({'b': 0.5}, restored.config.objective_weights)
+        points = system.get_agents_for_type(calicoba.agents.PointAgent)
+        restored_points = restored.get_agents_for_type(calicoba.agents.PointAgent)
+        self.assertEqual([p.criticality for p in points], [p.criticality for p in restored_points])
+        self.assertEqual([o.criticality for o in system.get_agents_for_type(calicoba.agents.ObjectiveAgent)],
+                         [o.criticality for o in restored.get_agents_for_type(calicoba.agents.ObjectiveAgent)])
+        values = outputs(p)
+        self.assertEqual(system.suggest_new_point({'p': p}, values)['p'][0].next_point,
+                         restored.suggest_new_point({'p': p}, values)['p'][0].next_point)
@@ -0,0 +1,372 @@
+import asyncio
+import dataclasses
+import logging
+import pathlib
+import tempfile
+import typing as typ
+import unittest
+
+import numpy as np
+
+import calicoba
+import models
+import test_utils
+
+from . import _helpers
+
+
+class AskTellTestCase(unittest.TestCase):
+    def setUp(self):
+        self.system = _helpers.new_system(objectives=(('o', 0, 169),))
+
+    def test_ask_before_tell(self):
+        with self.assertRaises(RuntimeError):
+            self.system.ask()
+
+    def test_ask_after_initial_point(self):
+        self.system.tell([({'p': 5}, {'o': _helpers.square(5)})])
+        candidates = self.system.ask(4)
+        self.assertEqual(4, len(candidates))
+        self.assertEqual(4, len({c.parameters['p'] for c in candidates}))
+        self.assertTrue(all(c in self.system.pending_candidates for c in candidates))
+        # The suggestion of the initial point first, then exploration candidates
+        self.assertEqual({'p': 0}, candidates[0].sources)
+        self.assertTrue(all(not c.sources and -10 <= c.parameters['p'] <= 10 for c in candidates[1:]))
+
+    def test_exploration_starts_new_chain(self):
+        self.system.tell([({'p': 5}, {'o': _helpers.square(5)})])
+        exploration = self.system.ask(2)[1]
+        self.system.tell([(exploration, {'o': _helpers.square(exploration.parameters['p'])})])
+        param = self.system.get_agents_for_type(calicoba.agents.ParameterAgent)[0]
+        self.assertEqual(2, len(param._chains))
+
+    def test_candidate_continues_its_chain(self):
+        self.system.tell([({'p': 5}, {'o': _helpers.square(5)})])
+        first, exploration = self.system.ask(2)
+        self.system.tell([(exploration, {'o': _helpers.square(exploration.parameters['p'])})])
+        self.system.tell([(first, {'o': _helpers.square(first.parameters['p'])})])
+        param = self.system.get_agents_for_type(calicoba.agents.ParameterAgent)[0]
+        self.assertEqual([[5, first.parameters['p']], [exploration.parameters['p']]],
+                         [[p.parameter_value for p in chain] for chain in param._chains])
+
+    def test_stale_candidate_starts_new_chain(self):
+        self.system.tell([({'p': 5}, {'o': _helpers.square(5)})])
+        first = self.system.ask()[0]
+        stale = dataclasses.replace(first, id=first.id + 100, parameters={'p': first.parameters['p'] + 1})
+        self.system.tell([(first, {'o': _helpers.square(first.parameters['p'])})])
+        self.system.tell([(stale, {'o': _helpers.square(stale.parameters['p'])})])
+        param = self.system.get_agents_for_type(calicoba.agents.ParameterAgent)[0]
+        self.assertEqual([[5, first.parameters['p']], [stale.parameters['p']]],
+                         [[p.parameter_value for p in chain] for chain in param._chains])
+
+    def test_tell_removes_pending(self):
+        self.system.tell([({'p': 5}, {'o': _helpers.square(5)})])
+        candidate = self.system.ask()[0]
+        self.system.tell([(candidate, {'o': _helpers.square(candidate.parameters['p'])})])
+        self.assertNotIn(candidate, self.system.pending_candidates)
+
+    def test_same_as_suggest_new_point(self):
+        other = _helpers.new_system(objectives=(('o', 0, 169),))
+        p = 5
+        self.system.tell([({'p': p}, {'o': _helpers.square(p)})])
+        for _ in range(20):
+            suggestion = other.suggest_new_point({'p': p}, {'o': _helpers.square(p)})['p'][0]
+            candidate = self.system.ask()[0]
+            self.assertEqual(suggestion.next_point, candidate.parameters['p'])
+            p = suggestion.next_point
+            self.system.tell([(candidate, {'o': _helpers.square(p)})])
+
+    def test_criticality(self):
+        self.system.suggest_new_point({'p': 0}, {'o': 84.5})
+        self.assertEqual(0.5, self.system.criticality)
+
+    def test_tell_out_of_order(self):
+        self.system.tell([({'p': 5}, {'o': _helpers.square(5)})])
+        for _ in range(10):
+            self.system.tell([(c, {'o': _helpers.square(c.parameters['p'])}) for c in self.system.ask()])
+        candidates = self.system.ask(8)
+        self.assertTrue(candidates)
+        self.system.tell([(c, {'o': _helpers.square(c.parameters['p'])}) for c in reversed(candidates)])
+        self.assertFalse(self.system.pending_candidates)
+
+
+class OptimizeAsyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.system = _helpers.new_system(objectives=(('o', 0, 169),))
+        self.evaluations = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+
+    async def _evaluate(self, parameters):
+        self.evaluations += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        self.completed += 1
+        return {'o': _helpers.square(parameters['p'])}
+
+    def test_max_evaluations(self):
+        result = asyncio.run(self.system.optimize_async(self._evaluate, {'p': 5}, max_evaluations=10))
+        self.assertEqual(10, self.evaluations)
+        self.assertEqual(10, result.evaluations_number)
+
+    def test_concurrency(self):
+        result = asyncio.run(self.system.optimize_async(self._evaluate, {'p': 5}, max_evaluations=50, concurrency=4))
+        self.assertLessEqual(result.evaluations_number, 50)
+        self.assertLess(result.best_criticality, _helpers.square(5) / 169)
+        self.assertEqual(4, self.max_in_flight)
+
+    def test_sequential(self):
+        asyncio.run(self.system.optimize_async(self._evaluate, {'p': 5}, max_evaluations=10))
+        self.assertEqual(1, self.max_in_flight)
+
+    def test_solution_found(self):
+        result = asyncio.run(self.system.optimize_async(self._evaluate, {'p': 5}, max_evaluations=500))
+        self.assertTrue(result.solution_found)
+        self.assertAlmostEqual(3, result.best_parameters['p'], delta=1)
+
+    def test_solution_found_concurrently(self):
+        result = asyncio.run(self.system.optimize_async(self._evaluate, {'p': 5}, max_evaluations=500, concurrency=4))
+        self.assertTrue(result.solution_found)
+        self.assertEqual(self.completed, result.evaluations_number)
+
+    def test_second_run(self):
+        asyncio.run(self.system.optimize_async(self._evaluate, {'p': 5}, max_evaluations=500))
+        result = asyncio.run(self.system.optimize_async(self._evaluate, {'p': -8}, max_evaluations=3))
+        self.assertFalse(result.solution_found)
+        self.assertEqual(3, result.evaluations_number)
+
+    def test_reproducible(self):
+        results = []
+        for _ in range(2):
+            self.setUp()
+            results.append(asyncio.run(self.system.optimize_async(self._evaluate, {'p': 5}, max_evaluations=100,
+                                                                  concurrency=4)))
+        self.assertEqual(results[0], results[1])
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(self.system.optimize_async(self._evaluate, {'p': 5}, concurrency=0))
+
+
+class CheckpointTestCase(unittest.TestCase):
+    def setUp(self):
+        self.system = _helpers.new_system(objectives=(('o', 0, 169),))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / 'checkpoint.npz'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_restore_cycle(self):
+        _helpers.run(self.system, 5, 10)
+        self.system.save_checkpoint(self.path)
+        restored = calicoba.Calicoba.load_checkpoint(self.path)
+        self.assertEqual(self.system.cycle, restored.cycle)
+        self.assertEqual(len(self.system.get_agents_for_type(calicoba.agents.PointAgent)),
+                         len(restored.get_agents_for_type(calicoba.agents.PointAgent)))
+
+    def test_same_suggestions(self):
+        p, _ = _helpers.run(self.system, 5, 60)
+        self.system.save_checkpoint(self.path)
+        restored = calicoba.Calicoba.load_checkpoint(self.path)
+        _, expected = _helpers.run(self.system, p, 100)
+        _, actual = _helpers.run(restored, p, 100)
+        self.assertEqual(expected, actual)
+
+    def test_dumps_appended(self):
+        dump_directory = pathlib.Path(self.directory.name) / 'dump'
+        system = _helpers.new_system(objectives=(('o', 0, 169),), dump_directory=dump_directory)
+        p, _ = _helpers.run(system, 5, 20)
+        system.save_checkpoint(self.path)
+        system.close()
+        restored = calicoba.Calicoba.load_checkpoint(self.path)
+        _helpers.run(restored, p, 5)
+        restored.close()
+        lines = (dump_directory / 'o.csv').read_text(encoding='UTF-8').splitlines()
+        self.assertEqual('cycle,raw value,criticality', lines[0])
+        self.assertEqual(list(range(25)), [int(line.split(',')[0]) for line in lines[1:]])
+
+    def test_invalid_file(self):
+        with self.path.open(mode='wb') as f:
+            np.savez(f, metadata=np.array('{}'))
+        with self.assertRaises(ValueError):
+            calicoba.Calicoba.load_checkpoint(self.path)
+
+
+class PointsBudgetTestCase(unittest.TestCase):
+    def test_same_suggestions(self):
+        unbounded = _helpers.new_system()
+        bounded = _helpers.new_system(points_budget=0)
+        _helpers.assert_same_suggestions(self, unbounded, bounded)
+        self.assertLess(len(bounded.get_agents_for_type(calicoba.agents.PointAgent)),
+                        len(unbounded.get_agents_for_type(calicoba.agents.PointAgent)))
+
+    def test_same_candidates_out_of_order(self):
+        unbounded = _helpers.new_system()
+        bounded = _helpers.new_system(points_budget=0)
+        pending = {}
+        for system in (unbounded, bounded):
+            system.tell([({'p': 7.3}, {'o': _helpers.rugged(7.3)})])
+            pending[system] = []
+        for i in range(200):
+            told = []
+            for system in (unbounded, bounded):
+                pending[system] += system.ask(4 - len(pending[system]))
+                # Tell candidates in an order that interleaves chains
+                candidate = pending[system].pop(i % len(pending[system]))
+                told.append(candidate)
+                system.tell([(candidate, {'o': _helpers.rugged(candidate.parameters['p'])})])
+            self.assertEqual(told[0], told[1])
+        self.assertLess(len(bounded.get_agents_for_type(calicoba.agents.PointAgent)),
+                        len(unbounded.get_agents_for_type(calicoba.agents.PointAgent)))
+
+
+class SchedulingTestCase(unittest.TestCase):
+    class AllPointsParameterAgent(calicoba.agents.ParameterAgent):
+        """A parameter agent that schedules all its points, as if there were no scheduling at all."""
+
+        def __init__(self, name: str, inf: float, sup: float):
+            super().__init__(name, inf, sup)
+            self.all_points = {}
+
+        def perceive(self, value, new_chain, criticalities, criticality=None, *, chain_end=None):
+            point = super().perceive(value, new_chain, criticalities, criticality, chain_end=chain_end)
+            self.all_points[point] = None
+            return point
+
+        def get_points_to_update(self):
+            return list(self.all_points)
+
+    def setUp(self):
+        self.system = _helpers.new_system()
+
+    def test_same_suggestions_as_all_points(self):
+        reference = _helpers.new_system(parameters=(self.AllPointsParameterAgent('p', -10, 10),))
+        _helpers.assert_same_suggestions(self, reference, self.system)
+
+    def test_finished_chains_not_scheduled(self):
+        _helpers.run(self.system)
+        parameter = self.system.get_agents_for_type(calicoba.agents.ParameterAgent)[0]
+        scheduled = parameter.get_points_to_update()
+        self.assertLess(len(scheduled), len(self.system.get_agents_for_type(calicoba.agents.PointAgent)))
+        self.assertEqual(sorted(scheduled, key=lambda point: point.index), scheduled)
+
+
+class FreezeTestCase(unittest.TestCase):
+    @staticmethod
+    def _new_system(parameters_number: int = 2, **kwargs) -> calicoba.Calicoba:
+        return _helpers.new_system(parameters=[(f'p{i + 1}', -10, 10) for i in range(parameters_number)],
+                                   objectives=[(f'o{i + 1}', 0, 269) for i in range(parameters_number)], **kwargs)
+
+    @staticmethod
+    def _run_until_frozen(system: calicoba.Calicoba, max_cycles: int = 100, p1: float = 7.3, p2: float = -4.1) \
+            -> typ.Tuple[typ.Dict[str, float], typ.Optional[calicoba.agents.ParameterAgent]]:
+        values = {'p1': p1, 'p2': p2}
+        for _ in range(max_cycles):
+            suggestions = system.suggest_new_point(values, {'o1': _helpers.rugged(values['p1']),
+                                                            'o2': _helpers.rugged(values['p2'])})
+            values = {name: s[0].next_point for name, s in suggestions.items()}
+            frozen = [p for p in system.get_agents_for_type(calicoba.agents.ParameterAgent) if p.frozen]
+            if frozen:
+                return values, frozen[0]
+        return values, None
+
+    def test_disabled_by_default(self):
+        _, parameter = self._run_until_frozen(self._new_system())
+        self.assertIsNone(parameter)
+
+    def test_frozen_parameter_pinned(self):
+        system = self._new_system(freeze_after_minima=1)
+        values, parameter = self._run_until_frozen(system)
+        self.assertIsNotNone(parameter)
+        points_number = len(system.get_agents_for_type(calicoba.agents.PointAgent))
+        objectives = {'o1': _helpers.rugged(values['p1']), 'o2': _helpers.rugged(values['p2'])}
+        suggestion = system.suggest_new_point(values, objectives)[parameter.name]
+        self.assertEqual(1, len(suggestion))
+        self.assertEqual('frozen -> stay', suggestion[0].decision)
+        self.assertEqual(parameter.minima[-1].parameter_value, suggestion[0].next_point)
+        # Only the free parameter may have created a new point
+        self.assertLessEqual(len(system.get_agents_for_type(calicoba.agents.PointAgent)), points_number + 1)
+
+    def test_wake_on_criticality_shift(self):
+        system = self._new_system(freeze_after_minima=1, wake_threshold=0.1)
+        values, parameter = self._run_until_frozen(system)
+        suggestion = system.suggest_new_point(values, {'o1': 269, 'o2': 269})[parameter.name]
+        self.assertFalse(parameter.frozen)
+        self.assertNotEqual('frozen -> stay', suggestion[0].decision)
+
+    def test_first_step_after_wake(self):
+        system = self._new_system(freeze_after_minima=1, wake_threshold=0.1)
+        # From this start, p1 is frozen after perceiving a value above the minimum it is pinned to
+        values, parameter = self._run_until_frozen(system, p1=-8.3, p2=5.5)
+        self.assertEqual('p1', parameter.name)
+        self.assertGreater(parameter.value, values['p1'])
+        values['p2'] += 1
+        suggestion = system.suggest_new_point(values, {'o1': 269, 'o2': 269})['p1'][0]
+        self.assertFalse(parameter.frozen)
+        self.assertEqual(values['p1'], parameter.value)
+        # The parameter did not move while frozen, its first move thus follows the default direction
+        self.assertEqual('first point in chain -> explore', suggestion.decision)
+        self.assertEqual(calicoba.agents.DIR_INCREASE, suggestion.direction)
+        self.assertEqual(values['p1'] + suggestion.step, suggestion.next_point)
+
+    def test_last_free_parameter_never_frozen(self):
+        system = self._new_system(parameters_number=1, freeze_after_minima=1)
+        p = 7.3
+        for _ in range(100):
+            suggestion = system.suggest_new_point({'p1': p}, {'o1': _helpers.rugged(p)})['p1'][0]
+            self.assertFalse(system.get_agents_for_type(calicoba.agents.ParameterAgent)[0].frozen)
+            if isinstance(suggestion, calicoba.agents.GlobalMinimumFound):
+                break
+            p = suggestion.next_point
+
+    def test_checkpoint(self):
+        system = self._new_system(freeze_after_minima=1)
+        values, parameter = self._run_until_frozen(system)
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / 'checkpoint.npz'
+            system.save_checkpoint(path)
+            restored = calicoba.Calicoba.load_checkpoint(path)
+        self.assertEqual(1, restored.config.freeze_after_minima)
+        self.assertTrue(restored.get_agent(lambda a: a.name == parameter.name).frozen)
+
+
+class NullSlopeTestCase(unittest.TestCase):
+    def test_flat_objective(self):
+        system = _helpers.new_system(objectives=(('o', 0, 100),))
+        system.suggest_new_point({'p': 1}, {'o': 50})
+        suggestion, = system.suggest_new_point({'p': 1.2}, {'o': 50})['p']
+        # No slope to follow, the point moves one step further away from its neighbor
+        self.assertEqual('1 neighbor -> follow slope', suggestion.decision)
+        self.assertEqual(calicoba.agents.DIR_DECREASE, suggestion.direction)
+        self.assertEqual(1, suggestion.steps_number)
+        self.assertAlmostEqual(0.8, suggestion.next_point)
+
+    def test_rosenbrock(self):
+        # Points at null criticality must give finite suggestions
+        model = models.get_model_factory(models.FACTORY_SIMPLE).generate_model('rosenbrock_function')
+        inf, sup = model.get_parameter_domain('p1')
+        for point in test_utils.SobolSequence(1, 6):
+            p_init = test_utils.sobol_to_param(point[0], inf, sup)
+            with self.subTest(p_init=p_init):
+                model.reset()
+                model.set_parameter('p1', p_init)
+                system = calicoba.Calicoba(calicoba.CalicobaConfig(seed=1, logging_level=logging.WARNING))
+                system.add_parameter('p1', inf, sup)
+                for output_name in model.outputs_names:
+                    system.add_objective('obj_' + output_name, *model.get_output_domain(output_name))
+                system.setup()
+                with np.errstate(all='raise'):
+                    for _ in range(50):
+                        model.update()
+                        suggestions = system.suggest_new_point(
+                            {'p1': model.get_parameter('p1')},
+                            {'obj_' + name: model.get_output(name) for name in model.outputs_names})
+                        suggestion = suggestions['p1'][0]
+                        if isinstance(suggestion, calicoba.agents.GlobalMinimumFound):
+                            break
+                        self.assertTrue(inf <= suggestion.next_point <= sup)
+                        model.set_parameter('p1', suggestion.next_point)
@@ -0,0 +1,74 @@
+import pathlib
+import tempfile
+import unittest
+
+import campaign_log
+
+
+class CampaignLogTestCase(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = pathlib.Path(self._directory.name)
+        self.path = self.directory / 'campaign.log'
+        with campaign_log.CampaignLogWriter(self.path, self.directory, batch_size=4) as writer:
+            files = {}
+            for run in ('m/p1=1', 'm/p1=2'):
+                files[run] = writer.open(self.directory / run / 'p1.csv', ('cycle', 'value'))
+                writer.open(self.directory / run / 'obj.csv', ('cycle', 'raw value'))
+            for i in range(5):
+                for run, file in files.items():
+                    file.write(i, f'{run[-1]}.{i}')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _check(self, log: campaign_log.CampaignLog):
+        self.assertEqual(['m/p1=1', 'm/p1=2'], log.runs)
+        self.assertEqual(['p1', 'obj'], log.tables('m/p1=1'))
+        self.assertEqual(['cycle,value'] + [f'{i},2.{i}' for i in range(5)], log.read_table('m/p1=2', 'p1'))
+        self.assertEqual(['cycle,raw value'], log.read_table('m/p1=1', 'obj'))
+
+    def test_read(self):
+        self.assertFalse((self.directory / 'm').exists())
+        self._check(campaign_log.CampaignLog(self.path))
+
+    def test_missing_index(self):
+        campaign_log.get_index_path(self.path).unlink()
+        self._check(campaign_log.CampaignLog(self.path))
+
+    def test_truncated_index(self):
+        index_path = campaign_log.get_index_path(self.path)
+        lines = index_path.read_text(encoding='UTF-8').splitlines(keepends=True)
+        # The chunks of the last batch are missing, the last listed one being cut in the middle
+        index_path.write_text(''.join(lines[:-3]) + lines[-3][:10], encoding='UTF-8')
+        self._check(campaign_log.CampaignLog(self.path))
+
+    def test_index_past_log(self):
+        data = self.path.read_bytes()
+        self.path.write_bytes(data[:-3])
+        log = campaign_log.CampaignLog(self.path)
+        self.assertEqual(['cycle,value'] + [f'{i},2.{i}' for i in range(4)], log.read_table('m/p1=2', 'p1'))
+
+    def test_truncated_log(self):
+        campaign_log.get_index_path(self.path).unlink()
+        data = self.path.read_bytes()
+        self.path.write_bytes(data[:-3])
+        log = campaign_log.CampaignLog(self.path)
+        # The last chunk, holding the last row of the second run, is ignored
+        self.assertEqual(['cycle,value'] + [f'{i},1.{i}' for i in range(5)], log.read_table('m/p1=1', 'p1'))
+        self.assertEqual(['cycle,value'] + [f'{i},2.{i}' for i in range(4)], log.read_table('m/p1=2', 'p1'))
+
+    def test_append(self):
+        with campaign_log.CampaignLogWriter(self.path, self.directory) as writer:
+            writer.open(self.directory / 'm/p1=2' / 'p1.csv', ('cycle', 'value'), append=True).write(5, '2.5')
+            writer.open(self.directory / 'm/p1=3' / 'p1.csv', ('cycle', 'value'), append=True).write(0, '3.0')
+        log = campaign_log.CampaignLog(self.path)
+        self.assertEqual(['cycle,value'] + [f'{i},2.{i}' for i in range(6)], log.read_table('m/p1=2', 'p1'))
+        self.assertEqual(['cycle,value', '0,3.0'], log.read_table('m/p1=3', 'p1'))
+
+    def test_export_csv(self):
+        campaign_log.CampaignLog(self.path).export_csv(self.directory / 'csv')
+        self.assertEqual('cycle,value\n' + ''.join(f'{i},1.{i}\n' for i in range(5)),
+                         (self.directory / 'csv' / 'm' / 'p1=1' / 'p1.csv').read_text(encoding='UTF-8'))
+        self.assertEqual('cycle,raw value\n',
+                         (self.directory / 'csv' / 'm' / 'p1=2' / 'obj.csv').read_text(encoding='UTF-8'))
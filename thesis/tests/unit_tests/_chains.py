@@ -0,0 +1,88 @@
+import random
+import typing as typ
+import unittest
+
+import calicoba
+
+
+class ChainTestCase(unittest.TestCase):
+    def setUp(self):
+        self.param = calicoba.agents.ParameterAgent('p', -10, 10)
+
+    def _new_chain(self, values: typ.Sequence[float],
+                   criticalities: typ.Sequence[float] = None) -> calicoba.agents.Chain:
+        criticalities = criticalities or [0.5] * len(values)
+        chain = None
+        for value, crit in zip(values, criticalities):
+            point = self.param.perceive(value, chain is None, {'o': crit})
+            chain = point.chain
+        return chain
+
+    def test_links(self):
+        chain = self._new_chain([1, 2, 3])
+        first, second, third = chain.points
+        self.assertIsNone(first.previous_point)
+        self.assertIs(second, first.next_point)
+        self.assertIs(first, second.previous_point)
+        self.assertIsNone(third.next_point)
+        self.assertEqual([first, second, third], third._get_all_points_in_chain())
+
+    def test_sorted_points(self):
+        chain = self._new_chain([3, 1, 2, 1])
+        self.assertEqual([1, 1, 2, 3], [p.parameter_value for p in chain.sorted_points])
+        # Points with the same value keep the chain’s order
+        self.assertIs(chain.points[1], chain.sorted_points[0])
+
+    def test_minimum_first_lowest(self):
+        chain = self._new_chain([1, 2, 3, 4], [0.5, 0.2, 0.4, 0.2])
+        self.assertIs(chain.points[1], chain.minimum)
+
+    def test_pop(self):
+        chain = self._new_chain([1, 2, 3], [0.5, 0.4, 0.1])
+        last = chain.pop()
+        self.assertEqual(2, len(chain))
+        self.assertIsNone(last.previous_point)
+        self.assertIsNone(last.chain)
+        self.assertIsNone(chain.last.next_point)
+        self.assertIs(chain.points[1], chain.minimum)
+
+    def test_retain(self):
+        chain = self._new_chain([1, 2, 3, 4])
+        removed = chain.retain(lambda p: p.parameter_value % 2 == 0)
+        self.assertEqual([1, 3], [p.parameter_value for p in removed])
+        self.assertEqual([2, 4], [p.parameter_value for p in chain])
+        self.assertIs(chain.last, chain.first.next_point)
+        self.assertTrue(all(p.chain is None and p.next_point is None for p in removed))
+
+    def test_contains(self):
+        chain = self._new_chain([1, 2])
+        other = self._new_chain([3])
+        self.assertIn(chain.first, chain)
+        self.assertNotIn(other.first, chain)
+
+    def test_update_extrema_same_as_full_scan(self):
+        rng = random.Random(0)
+        chain = self._new_chain([rng.randint(0, 5) for _ in range(10)])
+        expected = {}
+        for _ in range(20):
+            self.param.perceive(rng.randint(-6, 12), False, {'o': rng.random()})
+            chain.update_extrema()
+            extremum_min = extremum_max = None
+            for point in chain:
+                if not extremum_min or point.parameter_value < extremum_min.parameter_value:
+                    if extremum_min:
+                        expected[extremum_min] = False
+                    expected[point] = True
+                    extremum_min = point
+                elif not extremum_max or point.parameter_value > extremum_max.parameter_value:
+                    if extremum_max:
+                        expected[extremum_max] = False
+                    expected[point] = True
+                    extremum_max = point
+            self.assertEqual(expected, {p: p.is_extremum for p in expected})
+            self.assertEqual(2, sum(p.is_extremum for p in chain))
+
+    def test_get_minimum_long_chain(self):
+        chain = self._new_chain([i / 1000 for i in range(5000)])
+        chain.first.is_local_minimum = True
+        self.assertIs(chain.first, chain.last.get_minimum())
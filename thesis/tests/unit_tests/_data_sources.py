@@ -0,0 +1,109 @@
+import multiprocessing
+import pathlib
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+import calicoba
+from calicoba import data_sources
+
+
+def run_python(code: str) -> subprocess.CompletedProcess:
+    """Run Python code in a new interpreter, outside of multiprocessing, and capture its output
+    along with that of the resource tracker it may start.
+    """
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, timeout=60,
+                          cwd=pathlib.Path(calicoba.__file__).parent.parent)
+
+
+class SharedMemoryBridgeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.bridge = data_sources.SharedMemoryBridge.create(3, 3)
+
+    def tearDown(self):
+        self.bridge.close()
+
+    def test_stand_in_simulator(self):
+        process = data_sources.start_stand_in_simulator(self.bridge, np.square, timeout=10)
+        inputs = [data_sources.SharedMemoryDataInput(self.bridge, i, -10, 10, f'p{i}') for i in range(3)]
+        outputs = [data_sources.SharedMemoryDataOutput(self.bridge, i, 0, 100, f'o{i}') for i in range(3)]
+        for cycle in range(1, 6):
+            for i, data_input in enumerate(inputs):
+                data_input.set_data(cycle + i)
+            np.testing.assert_array_equal([cycle ** 2, (cycle + 1) ** 2, (cycle + 2) ** 2],
+                                          self.bridge.exchange(timeout=10))
+            self.assertEqual(cycle, self.bridge.sequence_number)
+            self.assertEqual((cycle + 1) ** 2, outputs[1].get_data())
+            self.assertEqual(cycle + 2, inputs[2].get_data())
+        self.bridge.stop()
+        process.join(10)
+        self.assertEqual(0, process.exitcode)
+
+    def test_attach(self):
+        with data_sources.SharedMemoryBridge.attach(self.bridge.handle) as simulator:
+            self.bridge.inputs[:] = (1, 2, 3)
+            np.testing.assert_array_equal((1, 2, 3), simulator.inputs)
+            self.assertEqual(3, len(simulator.outputs))
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutError):
+            self.bridge.exchange(timeout=0.01)
+        with data_sources.SharedMemoryBridge.attach(self.bridge.handle) as simulator:
+            self.assertTrue(simulator.wait_request(timeout=0.01))
+            simulator.respond()
+            with self.assertRaises(TimeoutError):
+                simulator.wait_request(timeout=0.01)
+
+    def test_stop_pending_request(self):
+        with data_sources.SharedMemoryBridge.attach(self.bridge.handle) as simulator:
+            with self.assertRaises(TimeoutError):
+                self.bridge.exchange(timeout=0.01)
+            self.bridge.stop()
+            self.assertTrue(self.bridge.stopped)
+            # The request sent before stopping is still served
+            self.assertTrue(simulator.wait_request(timeout=0.01))
+            simulator.respond()
+            self.assertFalse(simulator.wait_request(timeout=0.01))
+        with self.assertRaises(ValueError):
+            self.bridge.exchange(timeout=0.01)
+
+    def test_no_resource_tracker_warnings(self):
+        result = run_python("""
+import numpy as np
+from calicoba import data_sources
+with data_sources.SharedMemoryBridge.create(1, 1) as bridge:
+    data_sources.SharedMemoryBridge.attach(bridge.handle).close()
+with data_sources.SharedMemoryBridge.create(1, 1) as bridge:
+    process = data_sources.start_stand_in_simulator(bridge, np.square, timeout=10)
+    bridge.inputs[0] = 3
+    assert bridge.exchange(timeout=10)[0] == 9
+    bridge.stop()
+    process.join(10)
+    assert process.exitcode == 0
+""")
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertEqual('', result.stderr)
+
+    def test_spawned_simulator(self):
+        # Spawned processes do not inherit the memory of the optimizer, they get the semaphores through pickling
+        self.bridge.close()
+        self.bridge = data_sources.SharedMemoryBridge.create(3, 3, context=multiprocessing.get_context('spawn'))
+        process = data_sources.start_stand_in_simulator(self.bridge, np.negative, timeout=10)
+        self.bridge.inputs[:] = (1, 2, 3)
+        np.testing.assert_array_equal((-1, -2, -3), self.bridge.exchange(timeout=30))
+        self.bridge.stop()
+        process.join(30)
+        self.assertEqual(0, process.exitcode)
+        # The block is not destroyed when the simulator’s process exits
+        with data_sources.SharedMemoryBridge.attach(self.bridge.handle) as simulator:
+            np.testing.assert_array_equal((-1, -2, -3), simulator.outputs)
+
+    def test_stop_while_waiting(self):
+        process = data_sources.start_stand_in_simulator(self.bridge, np.square, timeout=10)
+        self.bridge.stop()
+        process.join(10)
+        self.assertEqual(0, process.exitcode)
+        with self.assertRaises(ValueError):
+            self.bridge.exchange(timeout=10)
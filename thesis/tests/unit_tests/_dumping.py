@@ -0,0 +1,119 @@
+import logging
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import calicoba
+from calicoba.dumping import DumpWriter
+
+
+class DumpWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = pathlib.Path(self._directory.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_flush(self):
+        writer = DumpWriter()
+        file = writer.open(self.directory / 'a.csv', ('x', 'y'))
+        file.write(1, 0.5)
+        self.assertFalse(file.path.exists())
+        writer.flush()
+        self.assertEqual('x,y\n1,0.5\n', file.path.read_text(encoding='UTF-8'))
+        file.write(2, '')
+        writer.close()
+        self.assertEqual('x,y\n1,0.5\n2,\n', file.path.read_text(encoding='UTF-8'))
+
+    def test_batches(self):
+        with DumpWriter(batch_size=3, max_pending_batches=1) as writer:
+            files = [writer.open(self.directory / f'{name}.csv', ('i',)) for name in 'abc']
+            for i in range(10):
+                files[i % 2].write(i)
+        self.assertEqual('i\n0\n2\n4\n6\n8\n', files[0].path.read_text(encoding='UTF-8'))
+        self.assertEqual('i\n1\n3\n5\n7\n9\n', files[1].path.read_text(encoding='UTF-8'))
+        self.assertEqual('i\n', files[2].path.read_text(encoding='UTF-8'))
+
+    def test_append(self):
+        with DumpWriter() as writer:
+            writer.open(self.directory / 'a.csv', ('x',)).write(1)
+        with DumpWriter() as writer:
+            writer.open(self.directory / 'a.csv', ('x',), append=True).write(2)
+            writer.open(self.directory / 'b.csv', ('x',), append=True).write(3)
+        self.assertEqual('x\n1\n2\n', (self.directory / 'a.csv').read_text(encoding='UTF-8'))
+        self.assertEqual('x\n3\n', (self.directory / 'b.csv').read_text(encoding='UTF-8'))
+
+    def test_write_after_close(self):
+        writer = DumpWriter()
+        file = writer.open(self.directory / 'a.csv', ('x',))
+        writer.close()
+        self.assertTrue(writer.closed)
+        with self.assertRaises(ValueError):
+            file.write(1)
+        with self.assertRaises(ValueError):
+            writer.open(self.directory / 'b.csv', ('x',))
+
+    def test_flush_after_close(self):
+        writer = DumpWriter()
+        writer.close()
+        with self.assertRaises(ValueError):
+            writer.flush()
+        writer.close()
+
+    def test_not_closed(self):
+        # Rows of the first file are handed to the background thread, those of the second one are still buffered
+        code = f"""
+import pathlib
+from calicoba.dumping import DumpWriter
+writer = DumpWriter(batch_size=3)
+for name, rows_number in (('a', 3), ('b', 2)):
+    file = writer.open(pathlib.Path({str(self.directory)!r}) / (name + '.csv'), ('i',))
+    for i in range(rows_number):
+        file.write(i)
+del writer, file
+"""
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=pathlib.Path(calicoba.__file__).parent.parent)
+        self.assertEqual('i\n0\n1\n2\n', (self.directory / 'a.csv').read_text(encoding='UTF-8'))
+        self.assertEqual('i\n0\n1\n', (self.directory / 'b.csv').read_text(encoding='UTF-8'))
+
+    def test_missing_directory(self):
+        with DumpWriter() as writer:
+            writer.open(self.directory / 'a' / 'b.csv', ('x',)).write(1)
+        self.assertEqual('x\n1\n', (self.directory / 'a' / 'b.csv').read_text(encoding='UTF-8'))
+
+    def test_error(self):
+        (self.directory / 'file').touch()
+        writer = DumpWriter()
+        writer.open(self.directory / 'file' / 'a.csv', ('x',)).write(1)
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_calicoba(self):
+        system = calicoba.Calicoba(calicoba.CalicobaConfig(dump_directory=self.directory / 'run', seed=0,
+                                                           logging_level=logging.WARNING))
+        system.add_parameter('p', -10, 10)
+        system.add_objective('o', 0, 10)
+        system.setup()
+        system.suggest_new_point({'p': 2}, {'o': 2})
+        system.suggest_new_point({'p': 3}, {'o': 3})
+        system.close()
+        self.assertEqual('cycle,raw value,criticality\n0,2.0,0.2\n1,3.0,0.3\n',
+                         (self.directory / 'run' / 'o.csv').read_text(encoding='UTF-8'))
+        system.suggest_new_point({'p': 4}, {'o': 4})
+
+    def test_shared_writer(self):
+        with DumpWriter() as writer:
+            for k in range(2):
+                system = calicoba.Calicoba(calicoba.CalicobaConfig(dump_directory=self.directory / str(k)),
+                                           dump_writer=writer)
+                system.add_objective('o', 0, 10)
+                system.setup()
+                system.suggest_new_point({}, {'o': k})
+                system.close()
+            self.assertFalse(writer.closed)
+        for k in range(2):
+            self.assertEqual(f'cycle,raw value,criticality\n0,{float(k)},{k / 10}\n',
+                             (self.directory / str(k) / 'o.csv').read_text(encoding='UTF-8'))
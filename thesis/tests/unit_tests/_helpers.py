@@ -0,0 +1,93 @@
+"""Objective functions, systems and assertions shared by the test cases.
+
+This module is imported by test modules instead of being star-imported by the package, so that its names do not
+collide with those of test modules.
+"""
+import logging
+import math
+import typing as typ
+import unittest
+
+import calicoba
+
+ParameterSpec = typ.Union[typ.Tuple[str, float, float], calicoba.agents.ParameterAgent]
+ObjectiveValues = typ.Callable[[float], typ.Any]
+
+
+def square(p: float) -> float:
+    return (p - 3) ** 2
+
+
+def rugged(p: float) -> float:
+    return (p - 3) ** 2 + 10 * (1 - math.cos(2 * math.pi * p))
+
+
+def rugged_objective(p: float) -> typ.Dict[str, float]:
+    return {'o': rugged(p)}
+
+
+def new_system(parameters: typ.Sequence[ParameterSpec] = (('p', -10, 10),),
+               objectives: typ.Sequence[typ.Tuple[str, float, float]] = (('o', 0, 269),), **config) \
+        -> calicoba.Calicoba:
+    """Create a system that is set up, seeded with 0 and that only logs warnings.
+
+    :param parameters: The parameters, as (name, inf, sup) tuples or as parameter agents.
+    :param objectives: The objectives, as (name, inf, sup) tuples.
+    :param config: Other fields of the system’s config.
+    :return: The system.
+    """
+    system = calicoba.Calicoba(calicoba.CalicobaConfig(**{'seed': 0, 'logging_level': logging.WARNING, **config}))
+    for parameter in parameters:
+        if isinstance(parameter, calicoba.agents.ParameterAgent):
+            system.add_agent(parameter)
+        else:
+            system.add_parameter(*parameter)
+    for objective in objectives:
+        system.add_objective(*objective)
+    system.setup()
+    return system
+
+
+def run(system: calicoba.Calicoba, p: float = 7.3, cycles: int = 300,
+        objective_values: ObjectiveValues = rugged_objective) -> typ.Tuple[float, typ.List[typ.Tuple[float, str]]]:
+    """Follow the suggestions of a system for its parameter 'p' until it finds a global minimum.
+
+    :param system: The system to run.
+    :param p: The initial value of the parameter.
+    :param cycles: The maximum number of cycles.
+    :param objective_values: A function that returns the objective values for a parameter value.
+    :return: The last parameter value and the list of (next point, decision) pairs of the suggestions.
+    """
+    trace = []
+    for _ in range(cycles):
+        suggestion = system.suggest_new_point({'p': p}, objective_values(p))['p'][0]
+        if isinstance(suggestion, calicoba.agents.GlobalMinimumFound):
+            break
+        trace.append((suggestion.next_point, suggestion.decision))
+        p = suggestion.next_point
+    return p, trace
+
+
+def assert_same_suggestions(test_case: unittest.TestCase, reference: calicoba.Calicoba, system: calicoba.Calicoba,
+                            p: float = 7.3, cycles: int = 300, reference_values: ObjectiveValues = rugged_objective,
+                            system_values: typ.Optional[ObjectiveValues] = None):
+    """Run two systems side by side along the suggestions of the reference for its parameter 'p' and assert that both
+    make the same suggestions at each cycle.
+
+    :param test_case: The test case that makes the assertions.
+    :param reference: The system whose suggestions are followed.
+    :param system: The system to compare to the reference.
+    :param p: The initial value of the parameter.
+    :param cycles: The maximum number of cycles.
+    :param reference_values: A function that returns the objective values given to the reference.
+    :param system_values: A function that returns the objective values given to the compared system.
+        Defaults to reference_values.
+    """
+    for _ in range(cycles):
+        expected = reference.suggest_new_point({'p': p}, reference_values(p))['p']
+        actual = system.suggest_new_point({'p': p}, (system_values or reference_values)(p))['p']
+        test_case.assertEqual([(getattr(s, 'next_point', None), getattr(s, 'decision', None)) for s in expected],
+                              [(getattr(s, 'next_point', None), getattr(s, 'decision', None)) for s in actual])
+        if not expected or isinstance(expected[0], calicoba.agents.GlobalMinimumFound):
+            break
+        p = expected[0].next_point
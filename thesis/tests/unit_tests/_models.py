@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+import models
+
+# Models whose number of parameters may be set
+MULTI_DIMENSIONAL_MODELS = ('ackley_function', 'levy_function', 'rastrigin_function', 'ackley_offset',
+                            'rastrigin_offset')
+
+
+class EvaluateManyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.factory = models.get_model_factory(models.FACTORY_SIMPLE)
+
+    def _assert_same_outputs(self, model: models.Model):
+        rng = np.random.default_rng(0)
+        names = model.parameters_names
+        values = {}
+        for name in names:
+            inf, sup = model.get_parameter_domain(name)
+            # Bounds and values outside of the domain are evaluated too
+            values[name] = np.concatenate([[inf, sup, inf - 1, sup + 1], rng.uniform(inf, sup, 500)])
+        outputs = model.evaluate_many(**values)
+        for i in range(len(values[names[0]])):
+            expected = model.evaluate(**{name: float(v[i]) for name, v in values.items()})
+            for output_name in model.outputs_names:
+                self.assertAlmostEqual(expected[output_name], outputs[output_name][i], delta=1e-12 * max(1, abs(
+                    expected[output_name])), msg=f'{output_name} at point {i}')
+
+    def test_same_as_evaluate(self):
+        for model_id in self.factory.models_ids:
+            with self.subTest(model=model_id):
+                self._assert_same_outputs(self.factory.generate_model(model_id))
+
+    def test_same_as_evaluate_multi_dimensional(self):
+        for model_id in MULTI_DIMENSIONAL_MODELS:
+            with self.subTest(model=model_id):
+                self._assert_same_outputs(self.factory.generate_model(model_id, 3))
@@ -0,0 +1,49 @@
+import logging
+import unittest
+
+import numpy as np
+
+import calicoba
+import calicoba.multistart
+
+
+def evaluate(values: np.ndarray) -> np.ndarray:
+    return (values - 3) ** 2
+
+
+class MultiStartEngineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.config = calicoba.CalicobaConfig(seed=0, logging_level=logging.WARNING)
+        self.starting_points = np.array([[-8], [0.5], [9]])
+        self.engine = calicoba.multistart.MultiStartEngine(self.config, {'p': (-10, 10)}, {'o': (0, 169)},
+                                                           self.starting_points)
+
+    def test_invalid_starting_points(self):
+        with self.assertRaises(ValueError):
+            calicoba.multistart.MultiStartEngine(self.config, {'p': (-10, 10)}, {'o': (0, 169)}, np.zeros((2, 2)))
+
+    def test_step(self):
+        self.assertEqual(3, self.engine.step(evaluate))
+        np.testing.assert_allclose(evaluate(self.starting_points)[:, 0] / 169, self.engine.criticalities)
+        self.assertFalse(np.array_equal(self.starting_points, self.engine.values))
+
+    def test_same_as_independent_runs(self):
+        results = self.engine.run(evaluate, 200)
+        for start, result in zip(self.starting_points[:, 0].tolist(), results):
+            system = calicoba.Calicoba(self.config)
+            system.add_parameter('p', -10, 10)
+            system.add_objective('o', 0, 169)
+            system.setup()
+            p = start
+            cycles = 0
+            solution_found = False
+            for _ in range(200):
+                cycles += 1
+                suggestion = system.suggest_new_point({'p': p}, {'o': (p - 3) ** 2})['p'][0]
+                if isinstance(suggestion, calicoba.agents.GlobalMinimumFound):
+                    solution_found = True
+                    break
+                p = suggestion.next_point
+            self.assertEqual(solution_found, result.solution_found)
+            self.assertEqual(cycles, result.cycles_number)
+            self.assertEqual(p, result.final_point['p'])
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 import calicoba
 
 
@@ -21,3 +23,62 @@ class AllTimeAbsoluteNormalizerTestCase(unittest.TestCase):
         n = calicoba.agents.AllTimeAbsoluteNormalizer()
         self.assertEqual(-1, n(-2))
         self.assertEqual(-0.5, n(-1))
+
+
+class BoundNormalizerTestCase(unittest.TestCase):
+    def test_value(self):
+        n = calicoba.agents.BoundNormalizer(-2, 2)
+        self.assertEqual(0.25, n(-1))
+        self.assertEqual(0.75, n(1))
+
+    def test_arrays(self):
+        n = calicoba.agents.BoundNormalizer(np.array([0, -2]), np.array([10, 2]))
+        np.testing.assert_array_equal([0.5, 0.75], n(np.array([5, 1])))
+        np.testing.assert_array_equal([[0.5, 0.75], [0.1, 0]], n(np.array([[5, 1], [1, -2]])))
+
+
+class SlidingNormalizerTestCase(unittest.TestCase):
+    @staticmethod
+    def _reference(values, window_size):
+        normalized = []
+        for i, value in enumerate(values):
+            window = values[max(0, i - window_size + 1):i + 1]
+            maxi, mini = max(window), min(window)
+            normalized.append(0 if maxi == mini else (value - mini) / (maxi - mini))
+        return normalized
+
+    def test_values(self):
+        n = calicoba.agents.SlidingNormalizer(3)
+        self.assertEqual(0, n(1))
+        self.assertEqual(1, n(3))
+        self.assertEqual(0.5, n(2))
+        self.assertEqual(0, n(0))
+        self.assertEqual(0.5, n(1))
+
+    def test_constant_window(self):
+        n = calicoba.agents.SlidingNormalizer(3)
+        for value in (5, 5, 5, 1, 1, 1):
+            result = n(value)
+        self.assertEqual(0, result)
+
+    def test_random_values(self):
+        values = np.random.default_rng(0).integers(0, 10, size=200).astype(float).tolist()
+        for window_size in (1, 2, 7, 50):
+            with self.subTest(window_size=window_size):
+                n = calicoba.agents.SlidingNormalizer(window_size)
+                self.assertEqual(self._reference(values, window_size), [n(v) for v in values])
+
+    def test_normalize_many(self):
+        values = np.random.default_rng(1).normal(size=300).round(1)
+        for window_size in (1, 3, 16):
+            with self.subTest(window_size=window_size):
+                n = calicoba.agents.SlidingNormalizer(window_size)
+                results = [n(values[0])]
+                for batch in (values[1:3], values[3:40], values[40:41], values[41:200]):
+                    results.extend(n.normalize_many(batch))
+                results.extend(n(v) for v in values[200:])
+                np.testing.assert_array_equal(self._reference(values.tolist(), window_size), results)
+
+    def test_invalid_window_size(self):
+        with self.assertRaises(ValueError):
+            calicoba.agents.SlidingNormalizer(0)
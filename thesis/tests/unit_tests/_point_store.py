@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+
+import calicoba
+from calicoba.agents import FLAG_EVICTED, FLAG_LOCAL_MINIMUM, PointStore
+
+from . import _helpers
+
+
+class PointStoreTestCase(unittest.TestCase):
+    def test_add_links(self):
+        store = PointStore(capacity=1)
+        a = store.add(1, 0.5, 0)
+        b = store.add(2, 0.4, 0, previous=a)
+        c = store.add(3, 0.3, 1)
+        self.assertEqual(3, len(store))
+        self.assertEqual([1, 2, 3], store.values.tolist())
+        self.assertEqual([-1, a, -1], store.previous.tolist())
+        self.assertEqual([b, -1, -1], store.next.tolist())
+        self.assertEqual([0, 0, 1], store.chains.tolist())
+
+    def test_move_to_chain(self):
+        store = PointStore()
+        a = store.add(1, 0.5, 0)
+        b = store.add(2, 0.4, 0, previous=a)
+        store.move_to_chain(b, 1)
+        c = store.add(3, 0.3, 1, previous=b)
+        self.assertEqual([a], store.get_chain_rows(0).tolist())
+        self.assertEqual([b, c], store.get_chain_rows(1).tolist())
+        self.assertEqual(-1, store.next[a])
+        self.assertEqual(-1, store.previous[b])
+
+    def test_flags(self):
+        store = PointStore()
+        rows = [store.add(v, 0.5, 0) for v in range(4)]
+        store.set_flags(rows[1], FLAG_EVICTED)
+        store.set_flags(rows[2], FLAG_LOCAL_MINIMUM)
+        store.set_flags(rows[2], FLAG_EVICTED)
+        self.assertEqual(FLAG_LOCAL_MINIMUM | FLAG_EVICTED, store.flags[rows[2]])
+        self.assertEqual([0, 3], store.get_chain_rows(0).tolist())
+        self.assertEqual([3], store.get_chain_rows(0, start=1).tolist())
+
+    def test_read_only_views(self):
+        store = PointStore()
+        store.add(1, 0.5, 0)
+        with self.assertRaises(ValueError):
+            store.values[0] = 2
+
+    def test_columns_round_trip(self):
+        store = PointStore()
+        for v in range(5):
+            store.add(v, v / 10, 0, previous=v - 1)
+        restored = PointStore.from_columns(store.to_columns())
+        for name, column in store.to_columns().items():
+            np.testing.assert_array_equal(column, getattr(restored, name))
+        self.assertEqual(5, restored.add(5, 0.5, 0, previous=4))
+
+
+class ParameterPointStoreTestCase(unittest.TestCase):
+    def test_not_recorded_by_default(self):
+        param = calicoba.agents.ParameterAgent('p', -10, 10)
+        param.perceive(1, True, {'o': 0.1})
+        self.assertIsNone(param.points_store)
+        with self.assertRaises(ValueError):
+            param.compact_chains()
+
+    def test_not_recorded_without_budget(self):
+        system = _helpers.new_system()
+        self.assertIsNone(system.get_agents_for_type(calicoba.agents.ParameterAgent)[0].points_store)
+
+    def test_rows_match_points(self):
+        param = calicoba.agents.ParameterAgent('p', -10, 10, record_points=True)
+        points = [param.perceive(v, v == 4, {'o': v / 10}) for v in range(8)]
+        store = param.points_store
+        self.assertEqual([p.index for p in points], list(range(len(store))))
+        self.assertEqual([p.parameter_value for p in points], store.values.tolist())
+        self.assertEqual([p.criticality for p in points], store.criticalities.tolist())
+        self.assertEqual([0] * 4 + [1] * 4, store.chains.tolist())
+        self.assertEqual(-1, store.previous[4])
+
+    def test_evicted_points_recorded(self):
+        system = _helpers.new_system(points_budget=0)
+        _helpers.run(system)
+        param = system.get_agents_for_type(calicoba.agents.ParameterAgent)[0]
+        store = param.points_store
+        live = system.get_agents_for_type(calicoba.agents.PointAgent)
+        self.assertEqual(param._last_point_id, len(store))
+        self.assertEqual(len(store) - len(live), np.count_nonzero(store.flags & FLAG_EVICTED))
+        self.assertTrue(all(store.flags[p.index] & FLAG_EVICTED == 0 for p in live))
+        self.assertTrue(all(store.flags[m.index] & FLAG_LOCAL_MINIMUM for m in param.minima))
@@ -0,0 +1,86 @@
+import random
+import typing as typ
+import unittest
+
+import calicoba
+
+
+def reference_neighbors(points: typ.Sequence[calicoba.agents.PointAgent], point: calicoba.agents.PointAgent,
+                        threshold: float):
+    """Neighbors as computed by a full sort of the points followed by a greedy removal of duplicates."""
+    kept = []
+    values = set()
+    for p in sorted(points, key=lambda p_: p_.parameter_value):
+        if not any(abs(p.parameter_value - v) <= threshold for v in values) or p is point:
+            if p is point and kept and abs(kept[-1].parameter_value - point.parameter_value) <= threshold:
+                del kept[-1]
+            kept.append(p)
+            values.add(p.parameter_value)
+    i = kept.index(point)
+    return kept[i - 1] if i > 0 else None, kept[i + 1] if i < len(kept) - 1 else None
+
+
+class PointsIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.param = calicoba.agents.ParameterAgent('p', -10, 10)
+        self.rng = random.Random(0)
+
+    def _new_points(self, values: typ.Sequence[float]) -> typ.List[calicoba.agents.PointAgent]:
+        return [self.param.perceive(value, True, {'o': self.rng.random()}) for value in values]
+
+    def test_sorted(self):
+        points = self._new_points([3, 1, 2, 1])
+        index = calicoba.agents.PointsIndex(points)
+        self.assertEqual([points[1], points[3], points[2], points[0]], list(index))
+
+    def test_remove(self):
+        points = self._new_points([3, 1, 2])
+        index = calicoba.agents.PointsIndex(points)
+        index.remove(points[2])
+        self.assertNotIn(points[2], index)
+        self.assertEqual(2, len(index))
+        with self.assertRaises(ValueError):
+            index.remove(points[2])
+
+    def test_neighbors_no_threshold(self):
+        self._test_neighbors(0, [self.rng.randint(0, 5) for _ in range(50)])
+
+    def test_neighbors_threshold(self):
+        self._test_neighbors(0.01, [self.rng.randint(0, 100) / 200 for _ in range(50)])
+
+    def test_neighbors_after_add(self):
+        points = self._new_points([0.5, 0.505, 0.51])
+        index = calicoba.agents.PointsIndex(points, threshold=0.01)
+        self.assertEqual((points[0], None), index.neighbors(points[2]))
+        points += self._new_points([0.502])
+        index.add(points[-1])
+        self.assertEqual(reference_neighbors(points, points[2], 0.01), index.neighbors(points[2]))
+
+    def _test_neighbors(self, threshold: float, values: typ.Sequence[float]):
+        points = self._new_points(values)
+        index = calicoba.agents.PointsIndex(points, threshold=threshold)
+        for point in points:
+            self.assertEqual(reference_neighbors(points, point, threshold), index.neighbors(point))
+
+    def test_get_in_range(self):
+        points = self._new_points([self.rng.randint(0, 100) / 200 for _ in range(50)])
+        index = calicoba.agents.PointsIndex(points)
+        for value in (-1, 0, 0.1, 0.25, 0.5, 1):
+            self.assertEqual([p for p in points if abs(p.parameter_value - value) <= 0.01],
+                             index.get_in_range(value, 0.01))
+
+    def test_has_outside_range(self):
+        index = calicoba.agents.PointsIndex(self._new_points([0.5, 0.505]))
+        self.assertFalse(index.has_outside_range(0.5, 0.01))
+        self.assertTrue(index.has_outside_range(0.495, 0.01))
+        self.assertFalse(calicoba.agents.PointsIndex().has_outside_range(0, 0.01))
+
+    def test_is_closest(self):
+        points = self._new_points([self.rng.randint(0, 20) / 20 for _ in range(30)])
+        index = calicoba.agents.PointsIndex(points)
+        for value in (-1, 0, 0.33, 0.5, 0.52, 2):
+            for point in points:
+                filtered = [p for p in points
+                            if p is point or abs(p.parameter_value - point.parameter_value) > 0.01]
+                expected = min(filtered, key=lambda p: abs(p.parameter_value - value)) is point
+                self.assertEqual(expected, index.is_closest(point, value, 0.01))
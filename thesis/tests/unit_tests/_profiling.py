@@ -0,0 +1,49 @@
+import unittest
+
+from calicoba import profiling
+
+from . import _helpers
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.system = _helpers.new_system(objectives=(('o', 0, 169),))
+        self.received = []
+        self.profiler = profiling.Profiler(callback=self.received.append)
+
+    def _run(self, cycles: int):
+        p = 5
+        for _ in range(cycles):
+            p = self.system.suggest_new_point({'p': p}, {'o': _helpers.square(p)})['p'][0].next_point
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.system.profiler)
+
+    def test_profiles(self):
+        self.system.profiler = self.profiler
+        self._run(5)
+        self.assertEqual(5, len(self.profiler.profiles))
+        self.assertEqual(list(range(5)), [profile.cycle for profile in self.profiler.profiles])
+        self.assertEqual(set(profiling.PHASES), set(self.profiler.last_profile.phases))
+
+    def test_callback(self):
+        self.system.profiler = self.profiler
+        self._run(3)
+        self.assertEqual(list(self.profiler.profiles), self.received)
+
+    def test_totals(self):
+        self.system.profiler = self.profiler
+        self._run(4)
+        totals = self.profiler.totals()
+        self.assertEqual(4, totals[profiling.PHASE_OBJECTIVES].calls)
+        self.assertEqual(sum(profile.phases[profiling.PHASE_POINTS_PERCEIVE].calls
+                             for profile in self.profiler.profiles),
+                         totals[profiling.PHASE_POINTS_PERCEIVE].calls)
+        self.assertGreaterEqual(totals[profiling.PHASE_POINTS_DECIDE].time, 0)
+
+    def test_detach(self):
+        self.system.profiler = self.profiler
+        self._run(2)
+        self.system.profiler = None
+        self._run(2)
+        self.assertEqual(2, len(self.profiler.profiles))
@@ -0,0 +1,46 @@
+import unittest
+
+import calicoba
+
+
+class AgentsRegistryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.registry = calicoba.agents.AgentsRegistry()
+        self.param = calicoba.agents.ParameterAgent('p', 0, 1)
+        self.obj = calicoba.agents.ObjectiveAgent('o', 0, 1)
+
+    def test_add(self):
+        self.registry.add(self.param)
+        self.assertIn(self.param, self.registry)
+        self.assertEqual(1, len(self.registry))
+
+    def test_add_twice(self):
+        self.registry.add(self.param)
+        self.registry.add(self.param)
+        self.assertEqual(1, len(self.registry))
+
+    def test_remove(self):
+        self.registry.add(self.param)
+        self.registry.remove(self.param)
+        self.assertNotIn(self.param, self.registry)
+        self.assertEqual([], self.registry.get_for_type(calicoba.agents.ParameterAgent))
+
+    def test_remove_missing(self):
+        with self.assertRaises(KeyError):
+            self.registry.remove(self.param)
+
+    def test_get_for_type(self):
+        self.registry.add(self.param)
+        self.registry.add(self.obj)
+        self.assertEqual([self.param], self.registry.get_for_type(calicoba.agents.ParameterAgent))
+        self.assertEqual([self.obj], self.registry.get_for_type(calicoba.agents.ObjectiveAgent))
+
+    def test_get_for_base_type_keeps_order(self):
+        param2 = calicoba.agents.ParameterAgent('p2', 0, 1)
+        self.registry.add(self.param)
+        self.registry.add(self.obj)
+        self.registry.add(param2)
+        self.assertEqual([self.param, self.obj, param2], self.registry.get_for_type(calicoba.agents.Agent))
+
+    def test_get_for_unknown_type(self):
+        self.assertEqual([], self.registry.get_for_type(calicoba.agents.PointAgent))
@@ -0,0 +1,77 @@
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+import experiments_utils as exp_utils
+import results_store
+import stats
+
+
+def _result(i: int) -> exp_utils.ExperimentResult:
+    return exp_utils.ExperimentResult(solution_found=i % 2 == 0, error=i == 3, cycles_number=10 * i, solution_cycle=i,
+                                      time=i / 10, points_number=None, error_message='error' if i == 3 else None)
+
+
+class ResultsStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = pathlib.Path(self._directory.name) / 'results'
+        with results_store.ResultsStore(self.directory) as store:
+            for i in range(4):
+                store.append('calicoba', f'model_{i % 2}', f'p1={i}', _result(i))
+        with results_store.ResultsStore(self.directory) as store:
+            store.append('nelder-mead', 'model_1', 'p1=4', _result(4), noisy=True)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_load(self):
+        results = results_store.ResultsStore(self.directory).load()
+        self.assertEqual(5, len(results))
+        self.assertEqual(['calicoba'] * 4 + ['nelder-mead'], results['method'].tolist())
+        self.assertEqual(['model_0', 'model_1', 'model_0', 'model_1', 'model_1'], results['model'].tolist())
+        np.testing.assert_array_equal([True, False, True, False, True], results['solution_found'])
+        np.testing.assert_array_equal([0, 10, 20, 30, 40], results['cycles_number'])
+        np.testing.assert_array_equal([-1] * 5, results['points_number'])
+        self.assertEqual(['', '', '', 'error', ''], results['error_message'].tolist())
+
+    def test_filters(self):
+        store = results_store.ResultsStore(self.directory)
+        self.assertEqual(['p1=1', 'p1=3'], store.load(methods=['calicoba'], models=['model_1'])['p_init'].tolist())
+        self.assertEqual(0, len(store.load(models=['model_2'])))
+
+    def test_groups(self):
+        groups = list(results_store.ResultsStore(self.directory).load().groups('method', 'model'))
+        self.assertEqual([('calicoba', 'model_0'), ('calicoba', 'model_1'), ('nelder-mead', 'model_1')],
+                         [key for key, _ in groups])
+        self.assertEqual(['p1=1', 'p1=3'], groups[1][1]['p_init'].tolist())
+
+    def test_partial_run(self):
+        with (self.directory / 'time.bin').open(mode='ab') as f:
+            np.array([1.0]).tofile(f)
+        self.assertEqual(5, len(results_store.ResultsStore(self.directory).load()))
+
+    def test_append_after_partial_flush(self):
+        # A flush that stopped after writing some columns and part of a string
+        for name, dtype in list(results_store.COLUMNS.items())[:10]:
+            with (self.directory / f'{name}.bin').open(mode='ab') as f:
+                np.zeros(1, dtype=dtype or np.dtype('<i4')).tofile(f)
+        with (self.directory / 'p_init.values').open(mode='a', encoding='UTF-8') as f:
+            f.write('"p1=')
+        with results_store.ResultsStore(self.directory) as store:
+            self.assertEqual(5, len(store.load()))
+            store.append('calicoba', 'model_2', 'p1=5', _result(5))
+        results = results_store.ResultsStore(self.directory).load()
+        self.assertEqual(6, len(results))
+        self.assertEqual(['model_2', 'p1=5'], [results['model'][-1], results['p_init'][-1]])
+        self.assertEqual([50, 0.5], [results['cycles_number'][-1], results['time'][-1]])
+
+    def test_stats(self):
+        data_set = stats.DataSet(results_store.ResultsStore(self.directory).load(methods=['calicoba']))
+        self.assertEqual(4, data_set.total_runs)
+        self.assertEqual(2, data_set.successes_number)
+        self.assertEqual(1, data_set.errors_number)
+        self.assertEqual(15, data_set.cycles_numbers_stats.mean)
+        self.assertEqual({'p1=3': 'error'}, data_set.error_messages)
@@ -0,0 +1,79 @@
+import pathlib
+import tempfile
+import unittest
+
+import calicoba
+from calicoba import _revisits
+
+from . import _helpers
+
+
+class RevisitCacheTestCase(unittest.TestCase):
+    def test_exact(self):
+        cache = _revisits.RevisitCache()
+        cache.add({'a': 1, 'b': 2}, {'o': 3})
+        self.assertEqual({'o': 3}, cache.get({'b': 2, 'a': 1}))
+        self.assertIsNone(cache.get({'a': 1, 'b': 2.000001}))
+        self.assertEqual(1, cache.hits)
+
+    def test_first_evaluation_kept(self):
+        cache = _revisits.RevisitCache()
+        cache.add({'a': 1}, {'o': 3})
+        cache.add({'a': 1}, {'o': 4})
+        self.assertEqual(1, len(cache))
+        self.assertEqual({'o': 3}, cache.get({'a': 1}))
+
+    def test_tolerance(self):
+        cache = _revisits.RevisitCache(tolerance=0.1)
+        cache.add({'a': 0.19, 'b': -0.01}, {'o': 1})
+        # Neighbor cells on both sides of a boundary
+        self.assertEqual({'o': 1}, cache.get({'a': 0.21, 'b': 0.05}))
+        self.assertEqual({'o': 1}, cache.get({'a': 0.1, 'b': -0.1}))
+        self.assertIsNone(cache.get({'a': 0.3, 'b': 0}))
+        self.assertIsNone(cache.get({'a': 0.2, 'b': 0.1}))
+
+    def test_negative_tolerance(self):
+        with self.assertRaises(ValueError):
+            _revisits.RevisitCache(tolerance=-1)
+
+
+class CalicobaRevisitsTestCase(unittest.TestCase):
+    def test_lookup(self):
+        system = _helpers.new_system(deterministic=True)
+        system.suggest_new_point({'p': 5}, {'o': _helpers.rugged(5)})
+        self.assertEqual({'o': _helpers.rugged(5)}, system.lookup({'p': 5}))
+        self.assertIsNone(system.lookup({'p': 4}))
+
+    def test_lookup_not_deterministic(self):
+        system = _helpers.new_system(deterministic=False)
+        system.suggest_new_point({'p': 5}, {'o': _helpers.rugged(5)})
+        self.assertIsNone(system.lookup({'p': 5}))
+
+    def test_checkpoint(self):
+        system = _helpers.new_system(deterministic=True)
+        system.suggest_new_point({'p': 5}, {'o': _helpers.rugged(5)})
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / 'checkpoint.npz'
+            system.save_checkpoint(path)
+            restored = calicoba.Calicoba.load_checkpoint(path)
+        self.assertEqual({'o': _helpers.rugged(5)}, restored.lookup({'p': 5}))
+
+    def test_ask_resolves_known_points(self):
+        system = _helpers.new_system(deterministic=True)
+        reference = _helpers.new_system(deterministic=True)
+        for s in (system, reference):
+            s.tell([({'p': 7.3}, {'o': _helpers.rugged(7.3)})])
+        known = reference.ask()[0]
+        # Simulate a previous evaluation of the first candidate
+        system._revisits.add(known.parameters, {'o': _helpers.rugged(known.parameters['p'])})
+        candidate = system.ask()[0]
+        self.assertNotEqual(known.parameters, candidate.parameters)
+        self.assertEqual(2, system.cycle)
+        self.assertEqual([candidate], system.pending_candidates)
+
+    def test_same_suggestions(self):
+        system = _helpers.new_system(deterministic=True)
+        reference = _helpers.new_system(deterministic=False)
+        _helpers.assert_same_suggestions(
+            self, reference, system, cycles=200,
+            system_values=lambda p: system.lookup({'p': p}) or _helpers.rugged_objective(p))
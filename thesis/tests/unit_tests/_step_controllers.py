@@ -0,0 +1,109 @@
+import pathlib
+import tempfile
+import unittest
+
+import calicoba
+from calicoba.agents import AdaptiveStepController, FixedStepController
+
+from . import _helpers
+
+
+class FixedStepControllerTestCase(unittest.TestCase):
+    def test_update(self):
+        controller = FixedStepController(-10, 10)
+        state = controller.new_state()
+        for criticality in (5, 4, 3, 2, 3):
+            controller.update(state, criticality + 1, criticality)
+        self.assertEqual(FixedStepController.MAX_STEPS_NUMBER, state.max_steps_number)
+        self.assertEqual(0.2, controller.init_step)
+
+
+class AdaptiveStepControllerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.controller = AdaptiveStepController(-10, 10, growth=2, shrink=0.5, patience=2, min_steps_number=1,
+                                                 max_steps_number=8)
+
+    def test_growth(self):
+        state = self.controller.new_state()
+        self.controller.update(state, 1, 0.9)
+        self.assertEqual(2, state.max_steps_number)
+        self.controller.update(state, 0.9, 0.8)
+        self.assertEqual(4, state.max_steps_number)
+        for _ in range(4):
+            self.controller.update(state, 0.8, 0.7)
+        self.assertEqual(8, state.max_steps_number)
+
+    def test_shrink(self):
+        state = self.controller.new_state()
+        self.controller.update(state, 1, 0.9)
+        self.controller.update(state, 0.9, 0.95)
+        self.assertEqual(1, state.max_steps_number)
+        self.assertEqual(0, state.improvements_number)
+        self.controller.update(state, 0.95, 0.97)
+        self.assertEqual(1, state.max_steps_number)
+
+    def test_unchanged_criticality(self):
+        state = self.controller.new_state()
+        self.controller.update(state, 1, 0.9)
+        self.controller.update(state, 0.9, 0.9)
+        self.assertEqual(2, state.max_steps_number)
+        self.assertEqual(0, state.improvements_number)
+
+    def test_get_step(self):
+        state = self.controller.new_state()
+        self.assertEqual(self.controller.init_step, self.controller.get_step(state))
+        for _ in range(4):
+            self.controller.update(state, 1, 0.9)
+        self.assertEqual(4 * self.controller.init_step, self.controller.get_step(state))
+        self.assertEqual(0.2, FixedStepController(-10, 10).get_step(state))
+
+    def test_invalid_arguments(self):
+        for kwargs in ({'growth': 0.5}, {'shrink': 0}, {'patience': 0}, {'min_steps_number': 3},
+                       {'max_steps_number': 1}):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                AdaptiveStepController(-10, 10, **kwargs)
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            calicoba.agents.get_step_controller('linear', -10, 10)
+
+
+class ChainStepStateTestCase(unittest.TestCase):
+    @staticmethod
+    def _new_system() -> calicoba.Calicoba:
+        return _helpers.new_system(parameters=(('p', -1500, 1500),), objectives=(('o', 0, 3000),),
+                                   step_controller=calicoba.agents.STEP_CONTROLLER_ADAPTIVE, step_growth=2,
+                                   step_patience=1, max_steps_number=4)
+
+    def test_state_per_chain(self):
+        param = calicoba.agents.ParameterAgent('p', -10, 10, step_controller=AdaptiveStepController(
+            -10, 10, growth=2, patience=1))
+        for v in range(4):
+            param.perceive(v, False, {'o': 1 - v / 10})
+        param.perceive(5, True, {'o': 0.1})
+        first_chain, second_chain = param._chains
+        self.assertEqual(8, first_chain.step_state.max_steps_number)
+        self.assertEqual(FixedStepController.MAX_STEPS_NUMBER, second_chain.step_state.max_steps_number)
+
+    def test_config(self):
+        controller = self._new_system().get_agents_for_type(calicoba.agents.ParameterAgent)[0].step_controller
+        state = controller.new_state()
+        controller.update(state, 1, 0.9)
+        self.assertEqual(4, state.max_steps_number)
+        controller.update(state, 0.9, 0.8)
+        self.assertEqual(4, state.max_steps_number)
+
+    def test_checkpoint(self):
+        system = self._new_system()
+        p = -1389
+        for _ in range(10):
+            p = system.suggest_new_point({'p': p}, {'o': abs(p - 12)})['p'][0].next_point
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / 'checkpoint.npz'
+            system.save_checkpoint(path)
+            restored = calicoba.Calicoba.load_checkpoint(path)
+        self.assertEqual(system.config, restored.config)
+        param = system.get_agents_for_type(calicoba.agents.ParameterAgent)[0]
+        restored_param = restored.get_agents_for_type(calicoba.agents.ParameterAgent)[0]
+        self.assertIsInstance(restored_param.step_controller, AdaptiveStepController)
+        self.assertEqual([c.step_state for c in param._chains], [c.step_state for c in restored_param._chains])
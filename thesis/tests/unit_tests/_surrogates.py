@@ -0,0 +1,54 @@
+import typing as typ
+import unittest
+
+import calicoba
+from calicoba.agents import QuadraticSurrogate
+
+from . import _helpers
+
+
+class QuadraticSurrogateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.surrogate = QuadraticSurrogate()
+
+    def test_vertex(self):
+        self.assertAlmostEqual(3, self.surrogate.predict_minimum([(x, _helpers.square(x)) for x in (-1, 2, 7)]))
+
+    def test_least_squares(self):
+        self.assertAlmostEqual(3, self.surrogate.predict_minimum([(x, _helpers.square(x)) for x in (-1, 0, 2, 7, 8)]))
+
+    def test_concave(self):
+        self.assertIsNone(self.surrogate.predict_minimum([(x, -_helpers.square(x)) for x in (-1, 2, 7)]))
+
+    def test_line(self):
+        self.assertIsNone(self.surrogate.predict_minimum([(0, 0), (1, 1), (2, 2)]))
+
+    def test_degenerate(self):
+        self.assertIsNone(self.surrogate.predict_minimum([(0, 1), (0, 0), (2, 2)]))
+        self.assertIsNone(self.surrogate.predict_minimum([(0, 1), (2, 2)]))
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            calicoba.agents.get_surrogate('spline')
+
+
+class SurrogateSearchTestCase(unittest.TestCase):
+    @staticmethod
+    def _run(surrogate: typ.Optional[str]) -> typ.Tuple[int, typ.List[str]]:
+        system = _helpers.new_system(objectives=(('o', 0, 169),), surrogate=surrogate)
+        p = 7.3
+        decisions = []
+        for cycle in range(1, 500):
+            suggestion = system.suggest_new_point({'p': p}, {'o': _helpers.square(p)})['p'][0]
+            if isinstance(suggestion, calicoba.agents.GlobalMinimumFound):
+                return cycle, decisions
+            decisions.append(suggestion.decision)
+            p = suggestion.next_point
+        raise AssertionError('no global minimum found')
+
+    def test_fewer_cycles(self):
+        cycles, decisions = self._run(calicoba.agents.SURROGATE_QUADRATIC)
+        reference_cycles, reference_decisions = self._run(None)
+        self.assertLess(cycles, reference_cycles)
+        self.assertIn('2 neighbors -> go to surrogate minimum', decisions)
+        self.assertNotIn('2 neighbors -> go to surrogate minimum', reference_decisions)
@@ -1,3 +1,4 @@
+import math
 import unittest
 
 import test_utils
@@ -61,3 +62,28 @@ class PeriodDetectorTestCase(unittest.TestCase):
         for i in [1, 2, 3, 1, 2, 3, 1, 2, 3]:
             self.detector.append(i)
         self.assertEqual(((0, 3),), self.detector.get_period_distances())
+
+    def test_get_period_distances_full(self):
+        values = [math.sin(i) * 100 for i in range(45)]
+        for v in values:
+            self.detector.append(v)
+        last_values = values[-10:]
+        expected = {period: math.sqrt(sum((last_values[i] - last_values[i - period]) ** 2 for i in range(period, 10)))
+                    for period in range(2, 6)}
+        for distance, period in self.detector.get_period_distances():
+            self.assertAlmostEqual(expected[period], distance)
+
+    def test_has_converged_vectors(self):
+        for i in [1, 2, 1, 2, 1, 2, 1, 2, 1, 2]:
+            self.detector.append((i, 0.5))
+        self.assertTrue(self.detector.has_converged)
+        self.detector.append((1, 0.6))
+        self.assertFalse(self.detector.has_converged)
+
+    def test_threshold(self):
+        detector = test_utils.PeriodDetector(10, threshold=0.1)
+        for i in [1, 2, 1, 2, 1, 2.01, 1, 2, 1, 2]:
+            detector.append(i)
+            self.detector.append(i)
+        self.assertTrue(detector.has_converged)
+        self.assertFalse(self.detector.has_converged)
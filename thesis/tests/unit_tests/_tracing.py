@@ -0,0 +1,56 @@
+import json
+import pathlib
+import tempfile
+import unittest
+
+import calicoba
+from calicoba import tracing
+
+from . import _helpers
+
+
+class TracerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.system = _helpers.new_system(objectives=(('o', 0, 169),))
+        self.sink = tracing.ListSink()
+
+    def _run(self, cycles: int):
+        p = 5
+        for _ in range(cycles):
+            suggestion = self.system.suggest_new_point({'p': p}, {'o': _helpers.square(p)})['p'][0]
+            if isinstance(suggestion, calicoba.agents.GlobalMinimumFound):
+                break
+            p = suggestion.next_point
+
+    def test_empty_tracer_is_falsy(self):
+        self.assertFalse(tracing.Tracer())
+        self.assertTrue(tracing.Tracer(self.sink))
+
+    def test_decisions(self):
+        self.system.tracer = tracing.Tracer(self.sink)
+        self._run(3)
+        self.assertEqual([0, 1, 2], [event.cycle for event in self.sink.events])
+        event = self.sink.events[0]
+        self.assertEqual(tracing.EVENT_DECISION, event.type)
+        self.assertEqual('p', event.parameter)
+        self.assertEqual(5, event.value)
+        self.assertTrue(event.decision)
+
+    def test_minima(self):
+        self.system.tracer = tracing.Tracer(self.sink)
+        self._run(200)
+        types = {event.type for event in self.sink.events}
+        self.assertIn(tracing.EVENT_LOCAL_MINIMUM, types)
+        self.assertIn(tracing.EVENT_GLOBAL_MINIMUM, types)
+
+    def test_json_lines_sink(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / 'trace.jsonl'
+            tracer = tracing.Tracer(tracing.JsonLinesSink(path))
+            self.system.tracer = tracer
+            self._run(3)
+            tracer.close()
+            with path.open(encoding='UTF-8') as f:
+                events = [json.loads(line) for line in f]
+        self.assertEqual(3, len(events))
+        self.assertEqual(tracing.EVENT_DECISION, events[0]['type'])
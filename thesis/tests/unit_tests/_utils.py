@@ -15,3 +15,10 @@ class GetXCTestCase(unittest.TestCase):
         e = 0, 4
         yc = 9
         self.assertEqual(-5, utils.get_xc(a, e, yc))
+
+    def test_flat(self):
+        a = 3, 1
+        e = 5, 1
+        yc = 0
+        self.assertEqual(7, utils.get_xc(a, e, yc))
+        self.assertEqual(7, utils.get_xc(a, e, 1))